@@ -1,4 +1,6 @@
 # analysis/__init__.py
 from .performance import PerformanceAnalyzer
+from .robustness import RobustnessAnalyzer
+from .feature_importance import FeatureImportanceAnalyzer
 
-__all__ = ['PerformanceAnalyzer']
\ No newline at end of file
+__all__ = ['PerformanceAnalyzer', 'RobustnessAnalyzer', 'FeatureImportanceAnalyzer']
\ No newline at end of file
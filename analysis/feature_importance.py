@@ -0,0 +1,257 @@
+# analysis/feature_importance.py
+import pandas as pd
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import copy
+import os
+
+from src.utils.shared_memory import shared_pool, worker_state
+
+# Limite de elementos por matriz empilhada (repetições x barras x features) para conter a memória
+MAX_BATCH_ELEMENTS = 20_000_000
+
+
+def accuracy_score(y_true: np.ndarray, y_pred: np.ndarray) -> float:
+    """Fração de acertos (métrica padrão; maior é melhor)"""
+    return float(np.mean(np.asarray(y_true) == np.asarray(y_pred)))
+
+
+def _block_positions(n: int, block_size: int, size: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """
+    Permutações em blocos das posições 0..n-1, formato (size, n)
+
+    Blocos contíguos de ``block_size`` barras trocam de lugar inteiros: a
+    ordem temporal (e a autocorrelação) dentro de cada bloco é preservada.
+    """
+    n_blocks = -(-n // block_size)
+    order = rng.permuted(np.tile(np.arange(n_blocks), (size, 1)), axis=1)
+    positions = (order[:, :, np.newaxis] * block_size + np.arange(block_size)).reshape(size, -1)
+    return positions[positions < n].reshape(size, n)
+
+
+def _predict(model, X: np.ndarray, columns: List[str]) -> np.ndarray:
+    return np.asarray(model.predict(pd.DataFrame(X, columns=columns, copy=False)))
+
+
+def _permutation_scores(state: Dict, feature: int, size: int,
+                        seed: np.random.SeedSequence, block_size: int) -> np.ndarray:
+    """
+    Métricas de ``size`` permutações de uma feature
+
+    As cópias permutadas são empilhadas numa única matriz e previstas em uma
+    única chamada ao modelo.
+    """
+    X, y = state['X_test'], state['y_test']
+    n = len(X)
+    positions = _block_positions(n, block_size, size, np.random.default_rng(seed))
+    stacked = np.tile(X, (size, 1))
+    stacked[:, feature] = X[positions.ravel(), feature]
+    predictions = _predict(state['model'], stacked, state['columns']).reshape(size, n)
+    return np.array([state['scoring'](y, row) for row in predictions])
+
+
+def _drop_column_score(state: Dict, feature: int) -> float:
+    """Retreina uma cópia do modelo sem a feature (-1: com todas) e avalia no teste"""
+    keep = [j for j in range(len(state['columns'])) if j != feature]
+    columns = [state['columns'][j] for j in keep]
+    model = copy.deepcopy(state['model'])
+    model.fit(pd.DataFrame(state['X_train'][:, keep], columns=columns), state['y_train'])
+    return float(state['scoring'](state['y_test'], _predict(model, state['X_test'][:, keep], columns)))
+
+
+def _run_task(state: Dict, task: Tuple, block_size: int):
+    kind, feature, size, seed = task
+    if kind == 'permutation':
+        return _permutation_scores(state, feature, size, seed, block_size)
+    return _drop_column_score(state, feature)
+
+
+def _run_worker_task(task: Tuple, block_size: int):
+    return _run_task(worker_state(), task, block_size)
+
+
+class FeatureImportanceAnalyzer:
+    """
+    Importância das features por permutação e por remoção de coluna,
+    comparada ao custo de cálculo de cada feature.
+
+    - Permutação: o modelo já treinado é avaliado no período de teste com uma
+      feature embaralhada em blocos de barras contíguas; a importância é a
+      queda média da métrica em relação à linha de base.
+    - Remoção de coluna (opcional): o modelo é retreinado sem a feature no
+      período de treino e avaliado no teste.
+
+    O teste deve ser posterior ao treino. As permutações rodam em lotes
+    distribuídos num pool de processos; os arrays são publicados uma única
+    vez em memória compartilhada e cada lote faz uma única passada de
+    previsão. O ranking final cruza a importância com o custo medido
+    (``EnhancedWDOStrategy.feature_costs`` ou ``FeatureStore.column_costs``),
+    apontando features caras que não contribuem.
+    """
+
+    def __init__(self, model, X_test: pd.DataFrame, y_test: Union[pd.Series, np.ndarray],
+                 X_train: Optional[pd.DataFrame] = None,
+                 y_train: Optional[Union[pd.Series, np.ndarray]] = None,
+                 scoring: Callable = accuracy_score,
+                 costs: Optional[Union[Dict[str, float], pd.Series]] = None,
+                 block_size: int = 20,
+                 batch_size: int = 10,
+                 n_jobs: Optional[int] = None,
+                 seed: Optional[int] = None):
+        """
+        Parameters:
+        -----------
+        model : object
+            Modelo treinado com ``predict`` (e ``fit`` para remoção de coluna)
+        X_test, y_test : pd.DataFrame, pd.Series
+            Período de avaliação
+        X_train, y_train : pd.DataFrame, pd.Series, optional
+            Período de treino, necessário para a remoção de coluna
+        scoring : Callable
+            Métrica (y_true, y_pred) -> float, maior é melhor; deve ser uma
+            função de módulo para rodar no pool de processos
+        costs : Dict[str, float] ou pd.Series, optional
+            Custo de cálculo de cada feature em segundos
+        block_size : int
+            Tamanho dos blocos da permutação em barras
+        batch_size : int
+            Permutações por lote (uma passada de previsão por lote)
+        n_jobs : int, optional
+            Número de processos (padrão: todos os núcleos; 1 executa localmente)
+        """
+        if X_train is not None and len(X_train) and len(X_test) \
+                and X_train.index.max() >= X_test.index.min():
+            raise ValueError("O período de teste deve ser posterior ao de treino")
+
+        self.model = model
+        self.columns = [str(col) for col in X_test.columns]
+        self.scoring = scoring
+        self.costs = pd.Series(costs, dtype=np.float64) if costs is not None else pd.Series(dtype=np.float64)
+        self.block_size = max(1, block_size)
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.seed = seed
+
+        self.arrays: Dict[str, np.ndarray] = {
+            'X_test': np.ascontiguousarray(X_test.to_numpy(dtype=np.float64)),
+            'y_test': np.asarray(y_test)
+        }
+        if X_train is not None:
+            self.arrays['X_train'] = np.ascontiguousarray(X_train[X_test.columns].to_numpy(dtype=np.float64))
+            self.arrays['y_train'] = np.asarray(y_train)
+
+        self.baseline_score = None
+        self.permutation_scores: Dict[str, np.ndarray] = {}
+        self.drop_scores: Dict[str, float] = {}
+
+    def run(self, n_repeats: int = 10, drop_column: bool = False) -> pd.DataFrame:
+        """
+        Calcula as importâncias e retorna o ranking
+
+        Parameters:
+        -----------
+        n_repeats : int
+            Permutações por feature
+        drop_column : bool
+            Também retreina o modelo sem cada feature (requer X_train)
+
+        Returns:
+        --------
+        pd.DataFrame
+            Ver ``ranking``
+        """
+        if drop_column and 'X_train' not in self.arrays:
+            raise ValueError("Remoção de coluna requer X_train e y_train")
+
+        state = dict(self.arrays, model=self.model, columns=self.columns, scoring=self.scoring)
+        self.baseline_score = float(self.scoring(
+            self.arrays['y_test'], _predict(self.model, self.arrays['X_test'], self.columns)
+        ))
+
+        size = self._batch_rows()
+        tasks = []
+        seeds = np.random.SeedSequence(self.seed).spawn(len(self.columns))
+        for feature, feature_seed in enumerate(seeds):
+            n_batches = -(-n_repeats // size)
+            for i, batch_seed in enumerate(feature_seed.spawn(n_batches)):
+                tasks.append(('permutation', feature, min(size, n_repeats - i * size), batch_seed))
+        if drop_column:
+            tasks += [('drop', feature, 0, None) for feature in range(-1, len(self.columns))]
+
+        results = self._execute(tasks, state)
+
+        self.permutation_scores = {}
+        self.drop_scores = {}
+        for (kind, feature, _, _), result in zip(tasks, results):
+            if kind == 'permutation':
+                name = self.columns[feature]
+                parts = [self.permutation_scores.get(name, np.empty(0)), result]
+                self.permutation_scores[name] = np.concatenate(parts)
+            else:
+                self.drop_scores['__all__' if feature < 0 else self.columns[feature]] = result
+
+        return self.ranking()
+
+    def ranking(self) -> pd.DataFrame:
+        """
+        Importância de cada feature frente ao seu custo de cálculo
+
+        Returns:
+        --------
+        pd.DataFrame
+            Índice feature, ordenado pela importância, com importance
+            (queda média da métrica), importance_std, drop_importance (se
+            calculada), cost (s), cost_share e importance_per_cost
+        """
+        if not self.permutation_scores:
+            raise ValueError("Execute run() primeiro")
+
+        rows = []
+        for name in self.columns:
+            drops = self.baseline_score - self.permutation_scores[name]
+            row = {
+                'feature': name,
+                'importance': drops.mean(),
+                'importance_std': drops.std(ddof=1) if len(drops) > 1 else 0.0,
+            }
+            if self.drop_scores:
+                row['drop_importance'] = self.drop_scores['__all__'] - self.drop_scores[name]
+            rows.append(row)
+
+        ranking = pd.DataFrame(rows).set_index('feature')
+        ranking['cost'] = self.costs.reindex(ranking.index)
+        total_cost = ranking['cost'].sum()
+        ranking['cost_share'] = ranking['cost'] / total_cost if total_cost > 0 else np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ranking['importance_per_cost'] = ranking['importance'] / ranking['cost']
+        return ranking.sort_values('importance', ascending=False)
+
+    def prunable(self, threshold: float = 0.0) -> pd.DataFrame:
+        """
+        Features que não contribuem (importância <= threshold, também na
+        remoção de coluna quando calculada), das mais caras para as mais baratas
+        """
+        ranking = self.ranking()
+        mask = ranking['importance'] <= threshold
+        if 'drop_importance' in ranking:
+            mask &= ranking['drop_importance'] <= threshold
+        return ranking[mask].sort_values('cost', ascending=False)
+
+    def _batch_rows(self) -> int:
+        """Permutações por lote limitadas pela memória da matriz empilhada"""
+        elements = max(self.arrays['X_test'].size, 1)
+        return max(1, min(self.batch_size, MAX_BATCH_ELEMENTS // elements))
+
+    def _execute(self, tasks: List[Tuple], state: Dict) -> List:
+        """Executa os lotes localmente ou num pool com entradas em memória compartilhada"""
+        if self.n_jobs == 1 or len(tasks) == 1:
+            return [_run_task(state, task, self.block_size) for task in tasks]
+
+        extra = {'model': self.model, 'columns': self.columns, 'scoring': self.scoring}
+        with shared_pool(self.arrays, min(self.n_jobs, len(tasks)), extra) as executor:
+            futures = [
+                executor.submit(_run_worker_task, task, self.block_size)
+                for task in tasks
+            ]
+            return [future.result() for future in futures]
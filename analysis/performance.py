@@ -1,14 +1,16 @@
 # analysis/performance.py
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 class PerformanceAnalyzer:
-    def __init__(self, results: pd.DataFrame, strategy_data: pd.DataFrame):
+    def __init__(self, results: pd.DataFrame, strategy_data: pd.DataFrame,
+                 trades: Optional['TradeLog'] = None):
         self.results = results
         self.strategy_data = strategy_data
+        self.trades = trades  # backtest.TradeLog opcional para métricas por trade
         self._prepare_results()
 
     def _prepare_results(self):
@@ -61,6 +63,17 @@ class PerformanceAnalyzer:
             # Calcular retorno total
             total_return = ((final_equity / initial_equity) - 1) * 100 if initial_equity > 0 else 0
             
+            # Métricas de trades: por trade se houver livro de trades, senão por barra
+            if self.trades is not None:
+                trade_stats = self.trades.statistics()
+                win_rate = trade_stats['win_rate'] * 100
+                total_trades = trade_stats['total_trades']
+                profit_factor = trade_stats['profit_factor']
+            else:
+                win_rate = self._calculate_win_rate(returns)
+                total_trades = self._calculate_total_trades()
+                profit_factor = self._calculate_profit_factor(returns)
+            
             metrics = {
                 'Initial Capital': f"${initial_equity:,.2f}",
                 'Final Capital': f"${final_equity:,.2f}",
@@ -68,9 +81,9 @@ class PerformanceAnalyzer:
                 'Annual Return': f"{self._calculate_annual_return(total_return):.2f}%",
                 'Sharpe Ratio': f"{self._calculate_sharpe_ratio(returns):.2f}",
                 'Max Drawdown': f"{self._calculate_max_drawdown():.2f}%",
-                'Win Rate': f"{self._calculate_win_rate(returns):.2f}%",
-                'Total Trades': f"{self._calculate_total_trades():,d}",
-                'Profit Factor': f"{self._calculate_profit_factor(returns):.2f}",
+                'Win Rate': f"{win_rate:.2f}%",
+                'Total Trades': f"{total_trades:,d}",
+                'Profit Factor': f"{profit_factor:.2f}",
                 'Daily Volatility': f"{returns.std() * np.sqrt(252) * 100:.2f}%"
             }
             
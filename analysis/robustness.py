@@ -0,0 +1,326 @@
+# analysis/robustness.py
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import os
+
+from backtest.matrix_backtester import MatrixBacktester, PERIODS_PER_YEAR
+from src.utils.shared_memory import shared_pool, worker_state
+
+METRICS = ['total_return', 'sharpe_ratio', 'max_drawdown']
+
+# Limite de elementos por matriz de reamostragem (lote x barras) para conter a memória
+MAX_BATCH_ELEMENTS = 20_000_000
+
+
+def _return_metrics(returns: np.ndarray, periods_per_year: float) -> Dict[str, np.ndarray]:
+    """Retorno total, Sharpe e drawdown máximo por linha de uma matriz de retornos"""
+    equity = np.cumprod(1 + returns, axis=1)
+
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, np.sqrt(periods_per_year) * mean / std, 0.0)
+
+    running_max = np.maximum.accumulate(equity, axis=1)
+    max_drawdown = ((equity - running_max) / running_max).min(axis=1)
+
+    return {
+        'total_return': equity[:, -1] - 1,
+        'sharpe_ratio': sharpe,
+        'max_drawdown': max_drawdown
+    }
+
+
+def _trade_shuffle_batch(arrays: Dict[str, np.ndarray], size: int,
+                         rng: np.random.Generator, params: Dict) -> Dict[str, np.ndarray]:
+    """Embaralha a ordem dos trades (altera o caminho do capital e o drawdown)"""
+    trade_returns = arrays['trade_returns']
+    shuffled = rng.permuted(np.broadcast_to(trade_returns, (size, len(trade_returns))), axis=1)
+    return _return_metrics(shuffled, params['trades_per_year'])
+
+
+def _block_bootstrap_batch(arrays: Dict[str, np.ndarray], size: int,
+                           rng: np.random.Generator, params: Dict) -> Dict[str, np.ndarray]:
+    """Bootstrap circular em blocos dos retornos por barra (preserva autocorrelação curta)"""
+    returns = arrays['returns']
+    n_bars = len(returns)
+    block_size = max(1, min(params['block_size'], n_bars))
+    n_blocks = -(-n_bars // block_size)
+
+    starts = rng.integers(0, n_bars, size=(size, n_blocks))
+    idx = (starts[:, :, np.newaxis] + np.arange(block_size)) % n_bars
+    resampled = returns[idx.reshape(size, -1)[:, :n_bars]]
+    return _return_metrics(resampled, params['periods_per_year'])
+
+
+def _entry_delay_batch(arrays: Dict[str, np.ndarray], size: int,
+                       rng: np.random.Generator, params: Dict) -> Dict[str, np.ndarray]:
+    """Atrasa aleatoriamente cada entrada em 0..max_delay barras e refaz o backtest"""
+    positions = arrays['positions']
+    segment = arrays['segment']
+    offset = arrays['offset']
+    previous = arrays['previous']
+    is_entry = arrays['is_entry']
+
+    # Atraso por mudança de posição; saídas (posição zerada) não são atrasadas
+    delays = rng.integers(0, params['max_delay'] + 1, size=(size, len(is_entry)))
+    delays *= is_entry
+
+    delayed = offset < delays[:, segment]
+    perturbed = np.where(delayed, previous[segment], positions)
+
+    backtester = MatrixBacktester(arrays['close'], cost=params['cost'],
+                                  periods_per_year=params['periods_per_year'])
+    stats = backtester.run(perturbed, return_curves=False)['stats']
+    return {metric: stats[metric].to_numpy() for metric in METRICS}
+
+
+_BATCH_FUNCTIONS = {
+    'trade_shuffle': _trade_shuffle_batch,
+    'block_bootstrap': _block_bootstrap_batch,
+    'entry_delay': _entry_delay_batch,
+}
+
+
+def _run_batch(method: str, size: int, seed: np.random.SeedSequence,
+               params: Dict) -> Dict[str, np.ndarray]:
+    """Executa um lote de reamostragens no worker usando os arrays compartilhados"""
+    rng = np.random.default_rng(seed)
+    return _BATCH_FUNCTIONS[method](worker_state(), size, rng, params)
+
+
+class RobustnessAnalyzer:
+    """
+    Análise de robustez de resultados de backtest por Monte Carlo e bootstrap.
+
+    Gera distribuições de retorno total, Sharpe e drawdown máximo a partir de:
+    - ``trade_shuffle``: permutações da ordem dos trades (requer ``trades``)
+    - ``block_bootstrap``: bootstrap circular em blocos dos retornos por barra
+      (requer ``returns``)
+    - ``entry_delay``: atrasos aleatórios nas entradas (requer ``positions`` e
+      ``close``)
+
+    As reamostragens rodam em lotes vetorizados distribuídos num pool de
+    processos; os arrays de entrada são publicados uma única vez em memória
+    compartilhada e os workers recebem apenas método, tamanho do lote e semente.
+    """
+
+    def __init__(self, returns: Optional[Union[pd.Series, np.ndarray]] = None,
+                 trades=None,
+                 positions: Optional[Union[pd.Series, np.ndarray]] = None,
+                 close: Optional[Union[pd.Series, np.ndarray]] = None,
+                 periods_per_year: int = PERIODS_PER_YEAR,
+                 trades_per_year: Optional[float] = None,
+                 cost: float = 0.0002,
+                 n_jobs: Optional[int] = None,
+                 batch_size: int = 1000,
+                 seed: Optional[int] = None):
+        """
+        Parameters:
+        -----------
+        returns : pd.Series ou np.ndarray, optional
+            Retornos por barra da estratégia (ex.: ``strategy_returns`` do Backtester)
+        trades : TradeLog ou array, optional
+            Livro de trades (usa ``return_pct``) ou array de retornos por trade
+        positions, close : pd.Series ou np.ndarray, optional
+            Posições e fechamentos usados para as perturbações de entrada
+        trades_per_year : float, optional
+            Anualização do Sharpe por trade (padrão: estimado pelas datas dos trades)
+        n_jobs : int, optional
+            Número de processos (padrão: todos os núcleos; 1 executa localmente)
+        """
+        self.periods_per_year = periods_per_year
+        self.cost = cost
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.seed = seed
+        self.samples: Dict[str, Dict[str, np.ndarray]] = {}
+        self.observed: Dict[str, Dict[str, float]] = {}
+
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.trades_per_year = trades_per_year
+
+        if returns is not None:
+            self.arrays['returns'] = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+
+        if trades is not None:
+            self._set_trades(trades)
+
+        if positions is not None:
+            if close is None:
+                raise ValueError("Perturbação de entradas requer 'close'")
+            self._set_positions(positions, close)
+
+    def _set_trades(self, trades):
+        """Extrai os retornos por trade e estima a frequência anual de trades"""
+        records = getattr(trades, 'records', None)
+        if records is not None:
+            trade_returns = records['return_pct']
+            if self.trades_per_year is None and len(records) > 1:
+                times = records['entry_time']
+                span = (times.max() - times.min()) / np.timedelta64(1, 'D')
+                if np.isfinite(span) and span > 0:
+                    self.trades_per_year = len(records) * 365.25 / span
+        else:
+            trade_returns = np.asarray(trades, dtype=np.float64)
+
+        if self.trades_per_year is None:
+            self.trades_per_year = self.periods_per_year
+
+        self.arrays['trade_returns'] = np.ascontiguousarray(trade_returns, dtype=np.float64)
+
+    def _set_positions(self, positions, close):
+        """Pré-calcula os segmentos de posição usados nas perturbações de entrada"""
+        positions = np.nan_to_num(np.asarray(positions, dtype=np.float64))
+        close = np.asarray(close, dtype=np.float64)
+
+        # Segmentos entre mudanças de posição (a primeira barra abre o segmento 0)
+        changes = np.flatnonzero(np.diff(positions, prepend=np.nan) != 0)
+        segment = np.searchsorted(changes, np.arange(len(positions)), side='right') - 1
+        previous = np.where(changes > 0, positions[np.maximum(changes - 1, 0)], 0.0)
+
+        self.arrays.update({
+            'positions': positions,
+            'close': close,
+            'segment': segment.astype(np.int64),
+            'offset': (np.arange(len(positions)) - changes[segment]).astype(np.int64),
+            'previous': previous,
+            'is_entry': (positions[changes] != 0).astype(np.int64),
+        })
+
+    def available_methods(self) -> List[str]:
+        """Métodos possíveis com as entradas fornecidas"""
+        methods = []
+        if 'trade_returns' in self.arrays and len(self.arrays['trade_returns']) > 1:
+            methods.append('trade_shuffle')
+        if 'returns' in self.arrays and len(self.arrays['returns']) > 1:
+            methods.append('block_bootstrap')
+        if 'positions' in self.arrays and len(self.arrays['positions']) > 1:
+            methods.append('entry_delay')
+        return methods
+
+    def run(self, n_resamples: int = 10000,
+            methods: Optional[Sequence[str]] = None,
+            block_size: int = 20,
+            max_delay: int = 3,
+            confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Executa as reamostragens e retorna os intervalos de confiança
+
+        Parameters:
+        -----------
+        n_resamples : int
+            Número de reamostragens por método
+        methods : Sequence[str], optional
+            Métodos a executar (padrão: todos os disponíveis)
+        block_size : int
+            Tamanho dos blocos do bootstrap em barras
+        max_delay : int
+            Atraso máximo de entrada em barras
+        confidence : float
+            Nível de confiança dos intervalos
+
+        Returns:
+        --------
+        pd.DataFrame
+            Índice (método, métrica) com observado, média, mediana e limites
+        """
+        available = self.available_methods()
+        methods = list(methods) if methods is not None else available
+        missing = [m for m in methods if m not in available]
+        if missing:
+            raise ValueError(f"Métodos sem dados de entrada: {missing}")
+
+        params = {
+            'block_size': block_size,
+            'max_delay': max_delay,
+            'cost': self.cost,
+            'periods_per_year': self.periods_per_year,
+            'trades_per_year': self.trades_per_year,
+        }
+
+        tasks = []
+        seeds = np.random.SeedSequence(self.seed).spawn(len(methods))
+        for method, method_seed in zip(methods, seeds):
+            size = self._batch_rows(method)
+            n_batches = -(-n_resamples // size)
+            for i, batch_seed in enumerate(method_seed.spawn(n_batches)):
+                tasks.append((method, min(size, n_resamples - i * size), batch_seed))
+
+        batches = self._execute(tasks, params)
+
+        self.samples = {}
+        for method in methods:
+            parts = [result for (m, _, _), result in zip(tasks, batches) if m == method]
+            self.samples[method] = {
+                metric: np.concatenate([part[metric] for part in parts])
+                for metric in METRICS
+            }
+            self.observed[method] = self._observed_metrics(method)
+
+        return self.confidence_intervals(confidence)
+
+    def confidence_intervals(self, confidence: float = 0.95) -> pd.DataFrame:
+        """Intervalos de confiança por percentis das distribuições reamostradas"""
+        if not self.samples:
+            raise ValueError("Execute run() primeiro")
+
+        alpha = (1 - confidence) / 2
+        rows = []
+        for method, samples in self.samples.items():
+            for metric in METRICS:
+                values = samples[metric]
+                lower, median, upper = np.quantile(values, [alpha, 0.5, 1 - alpha])
+                rows.append({
+                    'method': method,
+                    'metric': metric,
+                    'observed': self.observed[method][metric],
+                    'mean': values.mean(),
+                    'median': median,
+                    'lower': lower,
+                    'upper': upper,
+                    'n_resamples': len(values)
+                })
+
+        return pd.DataFrame(rows).set_index(['method', 'metric'])
+
+    def _batch_rows(self, method: str) -> int:
+        """Tamanho do lote limitado pela memória da matriz de reamostragem"""
+        if method == 'trade_shuffle':
+            length = len(self.arrays['trade_returns'])
+        elif method == 'block_bootstrap':
+            length = len(self.arrays['returns'])
+        else:
+            length = len(self.arrays['positions'])
+        return max(1, min(self.batch_size, MAX_BATCH_ELEMENTS // max(length, 1)))
+
+    def _observed_metrics(self, method: str) -> Dict[str, float]:
+        """Métricas da série original para comparação com a distribuição"""
+        if method == 'trade_shuffle':
+            metrics = _return_metrics(self.arrays['trade_returns'][np.newaxis, :],
+                                      self.trades_per_year)
+        elif method == 'block_bootstrap':
+            metrics = _return_metrics(self.arrays['returns'][np.newaxis, :],
+                                      self.periods_per_year)
+        else:
+            stats = MatrixBacktester(self.arrays['close'], cost=self.cost,
+                                     periods_per_year=self.periods_per_year).run(
+                self.arrays['positions'], return_curves=False)['stats']
+            metrics = {metric: stats[metric].to_numpy() for metric in METRICS}
+        return {metric: float(values[0]) for metric, values in metrics.items()}
+
+    def _execute(self, tasks: List[Tuple], params: Dict) -> List[Dict[str, np.ndarray]]:
+        """Executa os lotes localmente ou num pool com entradas em memória compartilhada"""
+        if self.n_jobs == 1 or len(tasks) == 1:
+            return [
+                _BATCH_FUNCTIONS[method](self.arrays, size, np.random.default_rng(seed), params)
+                for method, size, seed in tasks
+            ]
+
+        with shared_pool(self.arrays, min(self.n_jobs, len(tasks))) as executor:
+            futures = [
+                executor.submit(_run_batch, method, size, seed, params)
+                for method, size, seed in tasks
+            ]
+            return [future.result() for future in futures]
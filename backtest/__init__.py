@@ -1,4 +1,8 @@
 # backtest/__init__.py
 from .backtester import Backtester
+from .matrix_backtester import MatrixBacktester
+from .trade_log import TradeLog
+from .fill_simulator import FillSimulator
+from .cache import BacktestCache
 
-__all__ = ['Backtester']
\ No newline at end of file
+__all__ = ['Backtester', 'MatrixBacktester', 'TradeLog', 'FillSimulator', 'BacktestCache']
\ No newline at end of file
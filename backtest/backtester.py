@@ -1,15 +1,45 @@
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional, Sequence, Union
 import traceback
+from .matrix_backtester import MatrixBacktester, TRANSACTION_COST
+from .trade_log import TradeLog
+from .cache import BacktestCache, strategy_parameters
 
 class Backtester:
-    def __init__(self, strategy, initial_capital: float = 100000.0):
+    def __init__(self, strategy, initial_capital: float = 100000.0,
+                 cache: Optional[BacktestCache] = None):
         self.strategy = strategy
         self.initial_capital = initial_capital
+        self.cache = cache
+        self.stats = {}
         
     def run(self) -> pd.DataFrame:
         """Execute backtest and return results"""
+        parameters = None if self.cache is None else strategy_parameters(self.strategy)
+        if parameters is None:
+            # Sem cache ou com estado que não pode ser identificado por hash
+            return self._run()
+        
+        # Reaproveita resultados de execuções idênticas (estratégia, parâmetros, estado, código e dados)
+        key = self.cache.make_key(
+            type(self.strategy),
+            parameters,
+            self.strategy.data,
+            extra={'initial_capital': self.initial_capital, 'cost': TRANSACTION_COST}
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            portfolio, self.stats = cached
+            return portfolio
+        
+        portfolio = self._run()
+        if not portfolio.empty:
+            self.cache.put(key, portfolio, self.stats)
+        return portfolio
+        
+    def _run(self) -> pd.DataFrame:
+        """Executa o backtest sem cache"""
         try:
             # Generate signals
             signals = self.strategy.generate_signals()
@@ -29,15 +59,45 @@ class Backtester:
             
             # Add transaction costs (0.02% per trade)
             portfolio['trades'] = portfolio['position'].diff().abs().fillna(0)
-            portfolio['costs'] = portfolio['trades'] * 0.0002
+            portfolio['costs'] = portfolio['trades'] * TRANSACTION_COST
             portfolio['strategy_returns'] = portfolio['strategy_returns'] - portfolio['costs']
             
             # Calculate equity curve
             portfolio['equity'] = self.initial_capital * (1 + portfolio['strategy_returns']).cumprod()
             
+            self.stats = self._summary_stats(portfolio)
             return portfolio
             
         except Exception as e:
             print(f"Erro no backtest: {str(e)}")
             traceback.print_exc()
             return pd.DataFrame()
+
+    def _summary_stats(self, portfolio: pd.DataFrame) -> Dict:
+        """Estatísticas resumidas da curva de capital"""
+        returns = portfolio['strategy_returns']
+        equity = portfolio['equity']
+        std = returns.std()
+        
+        return {
+            'total_return': float(equity.iloc[-1] / self.initial_capital - 1),
+            'sharpe_ratio': float(np.sqrt(252) * returns.mean() / std) if std > 0 else 0.0,
+            'max_drawdown': float((equity / equity.cummax() - 1).min()),
+            'total_trades': int((portfolio['trades'] > 0).sum())
+        }
+
+    def run_matrix(self, signals: Union[np.ndarray, pd.DataFrame],
+                   names: Optional[Sequence] = None,
+                   return_curves: bool = True) -> Dict:
+        """Executa o backtest de uma matriz (N x T) de sinais sobre os preços da estratégia"""
+        matrix = MatrixBacktester(self.strategy.data['Close'].squeeze(),
+                                  initial_capital=self.initial_capital)
+        return matrix.run(signals, names=names, return_curves=return_curves)
+
+    def extract_trades(self, portfolio: pd.DataFrame) -> TradeLog:
+        """Extrai o livro de trades a partir do resultado de ``run``"""
+        data = self.strategy.data
+        high = data['High'].reindex(portfolio.index) if 'High' in data else None
+        low = data['Low'].reindex(portfolio.index) if 'Low' in data else None
+        return TradeLog.from_positions(portfolio['position'], portfolio['close'],
+                                       high=high, low=low)
@@ -0,0 +1,274 @@
+# backtest/cache.py
+import pandas as pd
+import numpy as np
+from typing import Callable, Dict, Optional, Tuple, Union
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+
+CACHE_FORMAT_VERSION = 1
+
+_SIMPLE_TYPES = (int, float, str, bool, type(None), dict, list, tuple)
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """
+    Hash rápido do conteúdo de um DataFrame OHLCV (índice, colunas e valores)
+
+    Os buffers dos arrays são passados diretamente ao BLAKE2b, sem conversão
+    para texto, de modo que o custo é dominado pela leitura da memória.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(data.columns)).encode())
+    digest.update(repr(data.shape).encode())
+
+    index = data.index
+    if isinstance(index, pd.DatetimeIndex):
+        digest.update(np.ascontiguousarray(index.values.astype('M8[ns]')).view(np.int64).data)
+    else:
+        digest.update(pd.util.hash_pandas_object(index, index=False).values.data)
+
+    for col in data.columns:
+        values = data[col].to_numpy()
+        if values.dtype == object:
+            values = pd.util.hash_pandas_object(data[col], index=False).values
+        digest.update(np.ascontiguousarray(values).data)
+
+    return digest.hexdigest()
+
+
+def code_version(strategy_class: type) -> str:
+    """Hash do código-fonte da classe da estratégia e de suas classes base do projeto"""
+    digest = hashlib.blake2b(digest_size=16)
+    for cls in inspect.getmro(strategy_class):
+        if cls.__module__ in ('builtins', 'abc'):
+            continue
+        try:
+            digest.update(inspect.getsource(cls).encode())
+        except (OSError, TypeError):
+            digest.update(f"{cls.__module__}.{cls.__qualname__}".encode())
+    return digest.hexdigest()
+
+
+def state_fingerprint(value: object) -> Optional[str]:
+    """
+    Hash do estado de um atributo não simples (modelo treinado, scaler,
+    arrays, DataFrames); None se o objeto não puder ser serializado
+    """
+    if isinstance(value, pd.DataFrame):
+        return data_fingerprint(value)
+    if isinstance(value, pd.Series):
+        return data_fingerprint(value.to_frame())
+
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(f"{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).data)
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return None
+    return digest.hexdigest()
+
+
+def strategy_parameters(strategy: object) -> Optional[Dict]:
+    """
+    Parâmetros de uma instância de estratégia para a chave de cache
+
+    Atributos públicos simples entram como estão; os demais (modelos
+    treinados, scalers, tabelas) entram como hash do estado em
+    ``'__state__'``, de modo que retreinar a estratégia muda a chave. Ficam
+    de fora ``data`` (já presente na chave) e os atributos listados em
+    ``cache_ignore`` na classe (caches, saídas, objetos derivados só dos dados).
+
+    Returns:
+    --------
+    Dict or None
+        None quando algum estado não pode ser serializado: a estratégia não
+        deve usar o cache
+    """
+    ignored = {'data', *getattr(strategy, 'cache_ignore', ())}
+    parameters, state = {}, {}
+    for name, value in vars(strategy).items():
+        if name.startswith('_') or name in ignored:
+            continue
+        if isinstance(value, _SIMPLE_TYPES):
+            try:
+                json.dumps(value, sort_keys=True)
+                parameters[name] = value
+                continue
+            except (TypeError, ValueError):
+                pass
+        fingerprint = state_fingerprint(value)
+        if fingerprint is None:
+            return None
+        state[name] = fingerprint
+    if state:
+        parameters['__state__'] = state
+    return parameters
+
+
+class BacktestCache:
+    """
+    Cache em disco de resultados de backtest endereçado por conteúdo.
+
+    A chave combina classe da estratégia, parâmetros, versão do código e um
+    hash dos dados de entrada; o valor é a curva de capital (ou qualquer
+    DataFrame numérico de resultados) e um dicionário de estatísticas, salvos
+    em ``.npz``. O tamanho total é limitado com despejo LRU baseado no horário
+    de último acesso dos arquivos.
+    """
+
+    def __init__(self, cache_dir: str = '.backtest_cache',
+                 max_size_mb: float = 512.0,
+                 code_version: Optional[str] = None):
+        """
+        Parameters:
+        -----------
+        cache_dir : str
+            Diretório dos arquivos de cache
+        max_size_mb : float
+            Tamanho máximo do cache antes do despejo LRU
+        code_version : str, optional
+            Versão fixa do código (ex.: hash do commit); por padrão usa o hash
+            do código-fonte da classe da estratégia
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.code_version = code_version
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, strategy_class: type, parameters: Dict,
+                 data: Union[pd.DataFrame, str], extra: Optional[Dict] = None) -> str:
+        """
+        Gera a chave de cache para uma combinação estratégia/parâmetros/dados
+
+        ``data`` pode ser o DataFrame ou um fingerprint já calculado com
+        ``data_fingerprint`` (evita re-hash em buscas de parâmetros).
+        """
+        if not isinstance(data, str):
+            data = data_fingerprint(data)
+
+        payload = {
+            'format': CACHE_FORMAT_VERSION,
+            'strategy': f"{strategy_class.__module__}.{strategy_class.__qualname__}",
+            'code': self.code_version or code_version(strategy_class),
+            'parameters': parameters,
+            'data': data,
+            'extra': extra or {}
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Optional[pd.DataFrame], Dict]]:
+        """Retorna (resultados, estatísticas) ou None se a chave não estiver no cache"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                stats = json.loads(str(stored['stats']))
+                frame = None
+                if 'columns' in stored:
+                    columns = [str(col) for col in stored['columns']]
+                    index = stored['index']
+                    if index.dtype.kind == 'M':
+                        index = pd.DatetimeIndex(index)
+                        tz = str(stored['index_tz'])
+                        if tz:
+                            index = index.tz_localize('UTC').tz_convert(tz)
+                    frame = pd.DataFrame(
+                        {col: stored[f'column_{i}'] for i, col in enumerate(columns)},
+                        index=index
+                    )
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+
+        # Atualiza o horário de acesso para o despejo LRU
+        os.utime(path, None)
+        self.hits += 1
+        return frame, stats
+
+    def put(self, key: str, results: Optional[pd.DataFrame], stats: Dict):
+        """Salva resultados e estatísticas de forma atômica e aplica o limite de tamanho"""
+        arrays = {'stats': np.array(json.dumps(stats, default=float))}
+        if results is not None:
+            index = results.index
+            is_datetime = isinstance(index, pd.DatetimeIndex)
+            arrays.update({
+                f'column_{i}': results[col].to_numpy()
+                for i, col in enumerate(results.columns)
+            })
+            arrays.update({
+                'columns': np.array([str(col) for col in results.columns]),
+                'index': np.asarray(index.values) if is_datetime else self._plain_index(index),
+                'index_tz': np.array(str(index.tz) if is_datetime and index.tz else '')
+            })
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._evict()
+
+    def get_or_run(self, key: str,
+                   run: Callable[[], Tuple[Optional[pd.DataFrame], Dict]]) -> Tuple[Optional[pd.DataFrame], Dict]:
+        """Retorna o resultado em cache ou executa ``run`` e armazena o resultado"""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        results, stats = run()
+        self.put(key, results, stats)
+        return results, stats
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.npz'):
+                os.remove(entry.path)
+
+    @staticmethod
+    def _plain_index(index: pd.Index) -> np.ndarray:
+        """Índice não temporal como array numérico ou de texto (sem pickle)"""
+        values = np.asarray(index)
+        return values if values.dtype.kind in 'iufb' else values.astype(str)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _evict(self):
+        """Remove as entradas acessadas há mais tempo até respeitar o tamanho máximo"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.npz'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,357 @@
+# backtest/fill_simulator.py
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Union
+
+from .trade_log import (TradeLog, EXIT_SIGNAL, EXIT_REVERSAL, EXIT_END_OF_DATA,
+                        EXIT_STOP, EXIT_TAKE_PROFIT)
+
+WDO_TICK_SIZE = 0.5  # Variação mínima do mini dólar em pontos
+
+# Tipos de ordem
+ORDER_MARKET = 0
+ORDER_STOP = 1
+ORDER_LIMIT = 2
+
+# Suposições sobre o caminho do preço dentro da barra quando stop e alvo
+# são atingidos na mesma barra
+INTRABAR_PATHS = (
+    'pessimistic',           # Stop sempre primeiro
+    'optimistic',            # Alvo sempre primeiro
+    'open_high_low_close',   # Máxima visitada antes da mínima
+    'open_low_high_close',   # Mínima visitada antes da máxima
+    'nearest',               # Extremo mais próximo da abertura primeiro
+)
+
+ArrayLike = Union[pd.Series, np.ndarray]
+
+
+class FillSimulator:
+    """
+    Simulador vetorizado de execuções intrabarra a partir de barras OHLC.
+
+    Ordens enviadas no fechamento da barra ``i`` ficam ativas a partir da barra
+    ``i + 1``:
+    - mercado: executa na abertura, com slippage adverso
+    - stop: executa quando a máxima (compra) ou mínima (venda) atinge o preço;
+      em gaps executa na abertura, com slippage adverso
+    - limite: executa quando o preço atravessa o limite em pelo menos um tick
+      (ou apenas toca, com ``limit_fill_on_touch``); em gaps executa na abertura
+
+    Os preços são arredondados ao tick do WDO. Todas as ordens são resolvidas
+    em blocos de barras com operações matriciais, sem laço por barra.
+    """
+
+    def __init__(self, open: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike,
+                 tick_size: float = WDO_TICK_SIZE,
+                 slippage_ticks: float = 0.0,
+                 intrabar_path: str = 'pessimistic',
+                 limit_fill_on_touch: bool = False,
+                 point_value: float = 1.0,
+                 block_size: int = 256):
+        if intrabar_path not in INTRABAR_PATHS:
+            raise ValueError(f"Caminho intrabarra inválido: {intrabar_path}. Use {INTRABAR_PATHS}")
+
+        self.index = close.index if isinstance(close, pd.Series) else None
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.n_bars = len(self.close)
+
+        self.tick_size = tick_size
+        self.slippage = slippage_ticks * tick_size
+        self.intrabar_path = intrabar_path
+        self.limit_fill_on_touch = limit_fill_on_touch
+        self.point_value = point_value
+        self.block_size = block_size
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, **kwargs) -> 'FillSimulator':
+        """Cria o simulador a partir de um DataFrame OHLC (colunas em qualquer caixa)"""
+        columns = {col.lower(): col for col in data.columns}
+        return cls(*(data[columns[name]] for name in ('open', 'high', 'low', 'close')), **kwargs)
+
+    def round_to_tick(self, price: np.ndarray, side: Optional[np.ndarray] = None) -> np.ndarray:
+        """Arredonda ao tick; com ``side`` arredonda contra o executor (compra para cima)"""
+        ticks = np.asarray(price, dtype=np.float64) / self.tick_size
+        if side is None:
+            return np.round(ticks) * self.tick_size
+        return np.where(np.asarray(side) > 0, np.ceil(ticks - 1e-9), np.floor(ticks + 1e-9)) * self.tick_size
+
+    def fill_orders(self, bar: ArrayLike, side: ArrayLike, order_type: ArrayLike,
+                    price: Optional[ArrayLike] = None,
+                    valid_bars: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Resolve uma lista de ordens contra as barras seguintes
+
+        Parameters:
+        -----------
+        bar : array
+            Barra em que cada ordem é enviada (índice posicional)
+        side : array
+            1 para compra, -1 para venda
+        order_type : array
+            ORDER_MARKET, ORDER_STOP ou ORDER_LIMIT
+        price : array, optional
+            Preço de stop/limite (ignorado para ordens a mercado)
+        valid_bars : int
+            Número de barras em que ordens stop/limite permanecem ativas
+
+        Returns:
+        --------
+        Dict
+            'filled' (bool), 'fill_idx' (-1 se não executada) e 'fill_price'
+        """
+        bar = np.asarray(bar, dtype=np.int64)
+        side = np.sign(np.asarray(side, dtype=np.float64))
+        order_type = np.broadcast_to(np.asarray(order_type, dtype=np.int8), bar.shape)
+        price = np.full(bar.shape, np.nan) if price is None else \
+            self.round_to_tick(np.broadcast_to(np.asarray(price, dtype=np.float64), bar.shape))
+
+        first = bar + 1
+        idx = first[:, np.newaxis] + np.arange(max(valid_bars, 1))
+        valid = idx < self.n_bars
+        idx = np.minimum(idx, self.n_bars - 1)
+        is_market = order_type == ORDER_MARKET
+        valid[is_market, 1:] = False
+
+        o, h, l = self.open[idx], self.high[idx], self.low[idx]
+        buy = side[:, np.newaxis] > 0
+        level = price[:, np.newaxis]
+        through = 0.0 if self.limit_fill_on_touch else self.tick_size
+
+        stop_hit = np.where(buy, h >= level, l <= level)
+        limit_hit = np.where(buy, l <= level - through, h >= level + through)
+        hit = np.where(is_market[:, np.newaxis], True,
+                       np.where((order_type == ORDER_STOP)[:, np.newaxis], stop_hit, limit_hit))
+        hit &= valid
+
+        filled = hit.any(axis=1)
+        offset = np.argmax(hit, axis=1)
+        rows = np.arange(len(bar))
+        fill_open = o[rows, offset]
+
+        # Stop: pior entre abertura e preço; limite: melhor entre abertura e preço
+        stop_price = np.where(side > 0, np.maximum(fill_open, price), np.minimum(fill_open, price))
+        limit_price = np.where(side > 0, np.minimum(fill_open, price), np.maximum(fill_open, price))
+        fill_price = np.select(
+            [is_market, order_type == ORDER_STOP],
+            [fill_open + side * self.slippage, stop_price + side * self.slippage],
+            limit_price
+        )
+        fill_price = np.where(order_type == ORDER_LIMIT, fill_price,
+                              self.round_to_tick(fill_price, side))
+
+        return {
+            'filled': filled,
+            'fill_idx': np.where(filled, idx[rows, offset], -1),
+            'fill_price': np.where(filled, fill_price, np.nan)
+        }
+
+    def simulate_exits(self, entry_idx: ArrayLike, side: ArrayLike, entry_price: ArrayLike,
+                       stop_price: Optional[ArrayLike] = None,
+                       target_price: Optional[ArrayLike] = None,
+                       exit_idx: Optional[ArrayLike] = None,
+                       size: Optional[ArrayLike] = None,
+                       entry_at_open: bool = True,
+                       exit_reason: Optional[ArrayLike] = None) -> TradeLog:
+        """
+        Resolve stops e alvos de posições abertas e devolve o livro de trades
+
+        Parameters:
+        -----------
+        entry_idx : array
+            Barra de entrada de cada posição
+        side, entry_price : array
+            Lado (1/-1) e preço de entrada
+        stop_price, target_price : array, optional
+            Níveis de stop e alvo (NaN desativa)
+        exit_idx : array, optional
+            Barra em cuja abertura a posição é encerrada a mercado se nenhum nível
+            for atingido antes (``n_bars`` mantém até o fim dos dados)
+        entry_at_open : bool
+            Se True a barra de entrada também é verificada (entrada na abertura)
+        exit_reason : array, optional
+            Motivo atribuído às saídas por ``exit_idx`` (padrão: EXIT_SIGNAL)
+        """
+        entry_idx = np.asarray(entry_idx, dtype=np.int64)
+        n_orders = len(entry_idx)
+        side = np.sign(np.asarray(side, dtype=np.float64))
+        entry_price = np.asarray(entry_price, dtype=np.float64)
+        stop = np.full(n_orders, np.nan) if stop_price is None else \
+            self.round_to_tick(np.broadcast_to(np.asarray(stop_price, dtype=np.float64), (n_orders,)))
+        target = np.full(n_orders, np.nan) if target_price is None else \
+            self.round_to_tick(np.broadcast_to(np.asarray(target_price, dtype=np.float64), (n_orders,)))
+        exit_idx = np.full(n_orders, self.n_bars, dtype=np.int64) if exit_idx is None else \
+            np.minimum(np.asarray(exit_idx, dtype=np.int64), self.n_bars)
+        size = np.ones(n_orders) if size is None else \
+            np.broadcast_to(np.asarray(size, dtype=np.float64), (n_orders,))
+        reasons = np.full(n_orders, EXIT_SIGNAL, dtype=np.int8) if exit_reason is None else \
+            np.asarray(exit_reason, dtype=np.int8).copy()
+
+        first = entry_idx if entry_at_open else entry_idx + 1
+        # Última barra verificada: a anterior à saída a mercado
+        last = exit_idx - 1
+
+        out_idx = np.where(exit_idx < self.n_bars, exit_idx, self.n_bars - 1)
+        out_price = np.where(exit_idx < self.n_bars,
+                             self.open[np.minimum(exit_idx, self.n_bars - 1)] - side * self.slippage,
+                             self.close[-1])
+        out_price = np.where(exit_idx < self.n_bars, self.round_to_tick(out_price, -side), out_price)
+        reasons[exit_idx >= self.n_bars] = EXIT_END_OF_DATA
+
+        pending = (first <= last) & (np.isfinite(stop) | np.isfinite(target))
+        offset = 0
+        while pending.any():
+            rows = np.flatnonzero(pending)
+            idx = first[rows, np.newaxis] + offset + np.arange(self.block_size)
+            valid = idx <= last[rows, np.newaxis]
+            idx = np.minimum(idx, self.n_bars - 1)
+
+            hit_bar, hit_price, hit_reason = self._resolve_block(
+                idx, valid, side[rows], stop[rows], target[rows])
+
+            resolved = hit_bar >= 0
+            out_idx[rows[resolved]] = hit_bar[resolved]
+            out_price[rows[resolved]] = hit_price[resolved]
+            reasons[rows[resolved]] = hit_reason[resolved]
+
+            pending[rows[resolved]] = False
+            pending[rows[~resolved & ~valid[:, -1]]] = False
+            offset += self.block_size
+
+        # MAE/MFE entre a primeira barra verificada e a barra de saída
+        entry_bars = np.minimum(first, out_idx)
+        max_high, min_low = TradeLog._segment_extremes(self.high, self.low, entry_bars, out_idx)
+        long_side = side > 0
+        favorable = np.where(long_side, max_high - entry_price, entry_price - min_low)
+        adverse = np.where(long_side, entry_price - min_low, max_high - entry_price)
+
+        # Saídas por nível não realizam excursões além do próprio nível
+        realized = np.abs(out_price - entry_price)
+        adverse = np.where(reasons == EXIT_STOP, np.minimum(adverse, realized), adverse)
+        favorable = np.where(reasons == EXIT_TAKE_PROFIT, np.minimum(favorable, realized), favorable)
+
+        return TradeLog.from_arrays(
+            entry_idx, out_idx, side.astype(np.int8), size, entry_price, out_price,
+            mae=np.maximum(adverse, 0), mfe=np.maximum(favorable, 0),
+            exit_reason=reasons, index=self.index, point_value=self.point_value
+        )
+
+    def simulate_signals(self, signals: ArrayLike,
+                         stop_distance: Optional[ArrayLike] = None,
+                         target_distance: Optional[ArrayLike] = None,
+                         size: Optional[ArrayLike] = None) -> TradeLog:
+        """
+        Executa uma série de sinais com ordens a mercado e stops/alvos intrabarra
+
+        Cada mudança de sinal no fechamento da barra ``i`` gera uma ordem a
+        mercado na abertura de ``i + 1``. Stops e alvos são posicionados a
+        ``stop_distance``/``target_distance`` pontos do preço de entrada
+        (valores da barra do sinal). Após um stop a posição fica zerada até a
+        próxima mudança de sinal.
+        """
+        signals = self._align(signals)
+        positions = np.sign(np.nan_to_num(signals))
+
+        changes = np.flatnonzero(np.diff(positions, prepend=0.0) != 0)
+        changes = changes[changes + 1 < self.n_bars]
+        entries = changes[positions[changes] != 0]
+
+        if len(entries) == 0:
+            return TradeLog()
+
+        next_change = np.searchsorted(changes, entries, side='right')
+        has_exit = next_change < len(changes)
+        signal_exit = changes[np.minimum(next_change, len(changes) - 1)]
+        exit_idx = np.where(has_exit, signal_exit + 1, self.n_bars)
+
+        side = positions[entries]
+        reasons = np.where(np.sign(positions[signal_exit]) == -side, EXIT_REVERSAL, EXIT_SIGNAL)
+
+        fills = self.fill_orders(entries, side, ORDER_MARKET)
+        entry_idx = fills['fill_idx']
+        entry_price = fills['fill_price']
+
+        stop = None
+        if stop_distance is not None:
+            stop = entry_price - side * self._align(stop_distance)[entries]
+        target = None
+        if target_distance is not None:
+            target = entry_price + side * self._align(target_distance)[entries]
+        if size is not None:
+            size = np.abs(self._align(size)[entries])
+
+        return self.simulate_exits(entry_idx, side, entry_price, stop_price=stop,
+                                   target_price=target, exit_idx=exit_idx, size=size,
+                                   entry_at_open=True, exit_reason=reasons)
+
+    def _align(self, values: ArrayLike) -> np.ndarray:
+        """Alinha uma série ao índice das barras (ou valida o comprimento do array)"""
+        if isinstance(values, pd.Series) and self.index is not None:
+            values = values.reindex(self.index)
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 0:
+            values = np.full(self.n_bars, float(values))
+        if len(values) != self.n_bars:
+            raise ValueError(f"Série com {len(values)} valores para {self.n_bars} barras")
+        return values
+
+    def _resolve_block(self, idx: np.ndarray, valid: np.ndarray, side: np.ndarray,
+                       stop: np.ndarray, target: np.ndarray):
+        """Primeira barra do bloco em que stop ou alvo é atingido e o preço executado"""
+        o, h, l = self.open[idx], self.high[idx], self.low[idx]
+        long_side = side[:, np.newaxis] > 0
+        stop_level = stop[:, np.newaxis]
+        target_level = target[:, np.newaxis]
+
+        with np.errstate(invalid='ignore'):
+            stop_hit = np.where(long_side, l <= stop_level, h >= stop_level) & valid
+            target_hit = np.where(long_side, h >= target_level, l <= target_level) & valid
+
+        any_hit = stop_hit | target_hit
+        found = any_hit.any(axis=1)
+        rows = np.arange(len(side))
+        col = np.argmax(any_hit, axis=1)
+
+        bar_open, bar_high, bar_low = o[rows, col], h[rows, col], l[rows, col]
+        s_hit, t_hit = stop_hit[rows, col], target_hit[rows, col]
+        is_long = side > 0
+
+        with np.errstate(invalid='ignore'):
+            stop_gap = np.where(is_long, bar_open <= stop, bar_open >= stop)
+            target_gap = np.where(is_long, bar_open >= target, bar_open <= target)
+
+        # Ambos na mesma barra: abertura além de um nível decide; senão o caminho assumido
+        stop_first = np.where(stop_gap, True,
+                              np.where(target_gap, False,
+                                       self._stop_first(is_long, bar_open, bar_high, bar_low)))
+        take_stop = s_hit & (~t_hit | stop_first)
+
+        stop_fill = np.where(stop_gap, bar_open, stop) - side * self.slippage
+        stop_fill = self.round_to_tick(stop_fill, -side)
+        target_fill = np.where(target_gap, bar_open, target)
+
+        hit_bar = np.where(found, idx[rows, col], -1)
+        hit_price = np.where(take_stop, stop_fill, target_fill)
+        hit_reason = np.where(take_stop, EXIT_STOP, EXIT_TAKE_PROFIT).astype(np.int8)
+        return hit_bar, hit_price, hit_reason
+
+    def _stop_first(self, is_long: np.ndarray, bar_open: np.ndarray,
+                    bar_high: np.ndarray, bar_low: np.ndarray) -> np.ndarray:
+        """Se o stop é atingido antes do alvo segundo o caminho intrabarra configurado"""
+        if self.intrabar_path == 'pessimistic':
+            return np.ones(len(is_long), dtype=bool)
+        if self.intrabar_path == 'optimistic':
+            return np.zeros(len(is_long), dtype=bool)
+
+        if self.intrabar_path == 'open_high_low_close':
+            high_first = np.ones(len(is_long), dtype=bool)
+        elif self.intrabar_path == 'open_low_high_close':
+            high_first = np.zeros(len(is_long), dtype=bool)
+        else:
+            high_first = (bar_high - bar_open) <= (bar_open - bar_low)
+
+        # Stop do comprado fica na mínima; do vendido, na máxima
+        return np.where(is_long, ~high_first, high_first)
@@ -0,0 +1,185 @@
+# backtest/matrix_backtester.py
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Sequence, Union
+
+TRANSACTION_COST = 0.0002  # 0.02% por unidade de posição negociada
+PERIODS_PER_YEAR = 252
+
+
+class MatrixBacktester:
+    """
+    Backtest vetorizado de várias séries de sinais sobre os mesmos preços.
+
+    Os sinais são recebidos como uma matriz (N estratégias x T barras) e todas
+    as curvas de capital, custos e estatísticas são calculadas com broadcasting
+    2-D sobre os retornos de preço compartilhados. A semântica é a mesma de
+    ``Backtester.run``: a posição da barra t-1 captura o retorno da barra t e
+    cada mudança de posição paga ``cost`` por unidade negociada.
+    """
+
+    def __init__(self, close: Union[pd.Series, np.ndarray],
+                 initial_capital: float = 100000.0,
+                 cost: float = TRANSACTION_COST,
+                 periods_per_year: int = PERIODS_PER_YEAR):
+        self.index = close.index if isinstance(close, pd.Series) else None
+        close = np.asarray(close, dtype=np.float64).ravel()
+
+        self.initial_capital = initial_capital
+        self.cost = cost
+        self.periods_per_year = periods_per_year
+
+        # Retornos de preço calculados uma única vez e compartilhados por todas as linhas
+        self.price_returns = np.zeros_like(close)
+        self.price_returns[1:] = close[1:] / close[:-1] - 1
+        self.price_returns[~np.isfinite(self.price_returns)] = 0.0
+
+    def run(self, signals: Union[np.ndarray, pd.DataFrame],
+            names: Optional[Sequence] = None,
+            return_curves: bool = True,
+            chunk_size: int = 256) -> Dict:
+        """
+        Executa o backtest de todas as séries de sinais
+
+        Parameters:
+        -----------
+        signals : np.ndarray ou pd.DataFrame
+            Matriz (N x T) de posições. Um DataFrame é interpretado no formato
+            pandas usual (T barras x N colunas) e transposto.
+        names : Sequence, optional
+            Nomes das estratégias (padrão: colunas do DataFrame ou 0..N-1)
+        return_curves : bool
+            Se False, devolve apenas as estatísticas (economiza memória)
+        chunk_size : int
+            Número de linhas processadas por bloco para limitar os temporários
+
+        Returns:
+        --------
+        Dict
+            'stats' (DataFrame N x métricas) e, se solicitado, as matrizes
+            'positions', 'strategy_returns', 'costs' e 'equity' (N x T)
+        """
+        positions, names = self._as_matrix(signals, names)
+        n_strategies, n_bars = positions.shape
+
+        stats = {
+            'total_return': np.empty(n_strategies),
+            'annual_return': np.empty(n_strategies),
+            'sharpe_ratio': np.empty(n_strategies),
+            'max_drawdown': np.empty(n_strategies),
+            'volatility': np.empty(n_strategies),
+            'win_rate': np.empty(n_strategies),
+            'profit_factor': np.empty(n_strategies),
+            'total_costs': np.empty(n_strategies),
+            'total_trades': np.empty(n_strategies, dtype=np.int64),
+        }
+
+        if return_curves:
+            strategy_returns = np.empty((n_strategies, n_bars))
+            costs = np.empty((n_strategies, n_bars))
+            equity = np.empty((n_strategies, n_bars))
+
+        for start in range(0, n_strategies, chunk_size):
+            rows = slice(start, min(start + chunk_size, n_strategies))
+            chunk = positions[rows]
+
+            # Custos: variação absoluta da posição (primeira barra sem custo)
+            trades = np.zeros_like(chunk)
+            np.subtract(chunk[:, 1:], chunk[:, :-1], out=trades[:, 1:])
+            np.abs(trades, out=trades)
+            chunk_costs = trades * self.cost
+
+            # Retornos: posição anterior x retorno de preço compartilhado
+            chunk_returns = np.zeros_like(chunk)
+            np.multiply(chunk[:, :-1], self.price_returns[1:], out=chunk_returns[:, 1:])
+            chunk_returns -= chunk_costs
+
+            chunk_equity = np.cumprod(1 + chunk_returns, axis=1)
+            chunk_equity *= self.initial_capital
+
+            self._fill_stats(stats, rows, chunk_returns, chunk_equity,
+                             chunk_costs, np.count_nonzero(trades, axis=1))
+
+            if return_curves:
+                strategy_returns[rows] = chunk_returns
+                costs[rows] = chunk_costs
+                equity[rows] = chunk_equity
+
+        results = {'stats': pd.DataFrame(stats, index=pd.Index(names, name='strategy'))}
+        if return_curves:
+            results.update({
+                'positions': positions,
+                'strategy_returns': strategy_returns,
+                'costs': costs,
+                'equity': equity
+            })
+        return results
+
+    def equity_frame(self, results: Dict) -> pd.DataFrame:
+        """Converte as curvas de capital em DataFrame (T barras x N estratégias)"""
+        if 'equity' not in results:
+            raise ValueError("Execute run() com return_curves=True")
+        return pd.DataFrame(results['equity'].T, index=self.index,
+                            columns=results['stats'].index)
+
+    def _as_matrix(self, signals, names):
+        """Normaliza os sinais para uma matriz float64 (N x T)"""
+        if isinstance(signals, pd.DataFrame):
+            if self.index is not None:
+                signals = signals.reindex(self.index)
+            if names is None:
+                names = list(signals.columns)
+            signals = signals.to_numpy(dtype=np.float64).T
+        elif isinstance(signals, pd.Series):
+            if self.index is not None:
+                signals = signals.reindex(self.index)
+            signals = signals.to_numpy(dtype=np.float64)[np.newaxis, :]
+
+        positions = np.array(signals, dtype=np.float64, ndmin=2)
+        np.nan_to_num(positions, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+        if positions.ndim != 2 or positions.shape[1] != len(self.price_returns):
+            raise ValueError(
+                f"Sinais com formato {positions.shape} incompatíveis com "
+                f"{len(self.price_returns)} barras de preço"
+            )
+
+        if names is None:
+            names = range(positions.shape[0])
+        names = list(names)
+        if len(names) != positions.shape[0]:
+            raise ValueError("Número de nomes diferente do número de estratégias")
+
+        return positions, names
+
+    def _fill_stats(self, stats, rows, returns, equity, costs, n_trades):
+        """Calcula as estatísticas por linha para um bloco de estratégias"""
+        n_bars = returns.shape[1]
+
+        total_return = equity[:, -1] / self.initial_capital - 1
+        years = n_bars / self.periods_per_year
+
+        mean = returns.mean(axis=1)
+        std = returns.std(axis=1, ddof=1) if n_bars > 1 else np.zeros(len(mean))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(std > 0, np.sqrt(self.periods_per_year) * mean / std, 0.0)
+
+        running_max = np.maximum.accumulate(equity, axis=1)
+        max_drawdown = ((equity - running_max) / running_max).min(axis=1)
+
+        wins = np.count_nonzero(returns > 0, axis=1)
+        active = np.count_nonzero(returns, axis=1)
+        gains = np.where(returns > 0, returns, 0).sum(axis=1)
+        losses = -np.where(returns < 0, returns, 0).sum(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats['win_rate'][rows] = np.where(active > 0, wins / active, 0.0)
+            stats['profit_factor'][rows] = np.where(losses > 0, gains / losses, 0.0)
+
+        stats['total_return'][rows] = total_return
+        stats['annual_return'][rows] = total_return / years if years > 0 else 0.0
+        stats['sharpe_ratio'][rows] = sharpe
+        stats['max_drawdown'][rows] = max_drawdown
+        stats['volatility'][rows] = std * np.sqrt(self.periods_per_year)
+        stats['total_costs'][rows] = costs.sum(axis=1)
+        stats['total_trades'][rows] = n_trades
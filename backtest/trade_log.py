@@ -0,0 +1,228 @@
+# backtest/trade_log.py
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Union
+
+# Motivos de saída
+EXIT_SIGNAL = 0       # Sinal zerou a posição (ou alterou o tamanho)
+EXIT_REVERSAL = 1     # Posição invertida para o lado oposto
+EXIT_END_OF_DATA = 2  # Posição ainda aberta na última barra
+EXIT_STOP = 3         # Stop loss executado dentro da barra
+EXIT_TAKE_PROFIT = 4  # Alvo executado dentro da barra
+
+EXIT_REASONS = {
+    EXIT_SIGNAL: 'signal',
+    EXIT_REVERSAL: 'reversal',
+    EXIT_END_OF_DATA: 'end_of_data',
+    EXIT_STOP: 'stop',
+    EXIT_TAKE_PROFIT: 'take_profit',
+}
+
+TRADE_DTYPE = np.dtype([
+    ('entry_time', 'M8[ns]'),
+    ('exit_time', 'M8[ns]'),
+    ('entry_idx', np.int64),
+    ('exit_idx', np.int64),
+    ('side', np.int8),
+    ('size', np.float64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('pnl', np.float64),
+    ('return_pct', np.float64),
+    ('mae', np.float64),
+    ('mfe', np.float64),
+    ('bars', np.int32),
+    ('exit_reason', np.int8),
+])
+
+
+class TradeLog:
+    """
+    Livro de trades armazenado como array estruturado NumPy (TRADE_DTYPE).
+
+    Cada registro corresponde a um trade completo: entrada no fechamento da
+    barra em que a posição muda para um valor não nulo e saída no fechamento
+    da barra em que ela muda novamente (mesma convenção de ``Backtester.run``).
+    """
+
+    def __init__(self, records: Optional[np.ndarray] = None):
+        if records is None:
+            records = np.empty(0, dtype=TRADE_DTYPE)
+        if records.dtype != TRADE_DTYPE:
+            raise ValueError("Registros não seguem o TRADE_DTYPE")
+        self.records = records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @classmethod
+    def from_positions(cls, position: Union[pd.Series, np.ndarray],
+                       close: Union[pd.Series, np.ndarray],
+                       high: Optional[Union[pd.Series, np.ndarray]] = None,
+                       low: Optional[Union[pd.Series, np.ndarray]] = None,
+                       index: Optional[pd.Index] = None,
+                       point_value: float = 1.0) -> 'TradeLog':
+        """
+        Extrai os trades de uma série de posições de forma vetorizada
+
+        Parameters:
+        -----------
+        position : pd.Series ou np.ndarray
+            Posição mantida ao final de cada barra (sinal x tamanho)
+        close : pd.Series ou np.ndarray
+            Preços de fechamento (usados para entrada e saída)
+        high, low : pd.Series ou np.ndarray, optional
+            Máximas e mínimas para MAE/MFE (padrão: fechamento)
+        index : pd.Index, optional
+            Índice temporal (padrão: índice de ``position``)
+        point_value : float
+            Valor financeiro de um ponto por contrato (WDO: R$ 10)
+        """
+        if index is None and isinstance(position, pd.Series):
+            index = position.index
+
+        position = np.nan_to_num(np.asarray(position, dtype=np.float64))
+        close = np.asarray(close, dtype=np.float64)
+        high = close if high is None else np.asarray(high, dtype=np.float64)
+        low = close if low is None else np.asarray(low, dtype=np.float64)
+        n_bars = len(position)
+
+        if n_bars == 0:
+            return cls()
+
+        # Barras onde a posição muda; cada mudança para valor não nulo abre um trade
+        changes = np.flatnonzero(np.diff(position, prepend=0.0) != 0)
+        entries = changes[position[changes] != 0]
+        n_trades = len(entries)
+
+        if n_trades == 0:
+            return cls()
+
+        # A saída é a próxima mudança de posição após a entrada
+        next_change = np.searchsorted(changes, entries, side='right')
+        is_open = next_change >= len(changes)
+        exits = np.where(is_open, n_bars - 1, changes[np.minimum(next_change, len(changes) - 1)])
+
+        side = np.sign(position[entries]).astype(np.int8)
+        size = np.abs(position[entries])
+        entry_price = close[entries]
+        exit_price = close[exits]
+
+        next_position = position[exits]
+        exit_reason = np.full(n_trades, EXIT_SIGNAL, dtype=np.int8)
+        exit_reason[np.sign(next_position) == -side] = EXIT_REVERSAL
+        exit_reason[is_open] = EXIT_END_OF_DATA
+
+        # Máxima/mínima entre a barra seguinte à entrada e a barra de saída (inclusive)
+        max_high, min_low = cls._segment_extremes(high, low, entries + 1, exits)
+        has_bars = exits > entries
+        long_side = side > 0
+        favorable = np.where(long_side, max_high - entry_price, entry_price - min_low)
+        adverse = np.where(long_side, entry_price - min_low, max_high - entry_price)
+
+        return cls.from_arrays(
+            entries, exits, side, size, entry_price, exit_price,
+            mae=np.where(has_bars, np.maximum(adverse, 0), 0.0),
+            mfe=np.where(has_bars, np.maximum(favorable, 0), 0.0),
+            exit_reason=exit_reason, index=index, point_value=point_value
+        )
+
+    @classmethod
+    def from_arrays(cls, entry_idx: np.ndarray, exit_idx: np.ndarray,
+                    side: np.ndarray, size: np.ndarray,
+                    entry_price: np.ndarray, exit_price: np.ndarray,
+                    mae: np.ndarray, mfe: np.ndarray, exit_reason: np.ndarray,
+                    index: Optional[pd.Index] = None,
+                    point_value: float = 1.0) -> 'TradeLog':
+        """Monta o livro de trades a partir de arrays alinhados por trade"""
+        records = np.empty(len(entry_idx), dtype=TRADE_DTYPE)
+        if isinstance(index, pd.DatetimeIndex):
+            times = index.values.astype('M8[ns]')
+            records['entry_time'] = times[entry_idx]
+            records['exit_time'] = times[exit_idx]
+        else:
+            records['entry_time'] = np.datetime64('NaT')
+            records['exit_time'] = np.datetime64('NaT')
+
+        records['entry_idx'] = entry_idx
+        records['exit_idx'] = exit_idx
+        records['side'] = side
+        records['size'] = size
+        records['entry_price'] = entry_price
+        records['exit_price'] = exit_price
+        records['pnl'] = (exit_price - entry_price) * side * size * point_value
+        records['return_pct'] = (exit_price / entry_price - 1) * side
+        records['mae'] = mae
+        records['mfe'] = mfe
+        records['bars'] = exit_idx - entry_idx
+        records['exit_reason'] = exit_reason
+
+        return cls(records)
+
+    @staticmethod
+    def _segment_extremes(high: np.ndarray, low: np.ndarray,
+                          starts: np.ndarray, ends: np.ndarray):
+        """Máxima de ``high`` e mínima de ``low`` em [start, end] para segmentos ordenados"""
+        # Sentinela no final para que end + 1 nunca saia do array
+        high_ext = np.append(high, high[-1])
+        low_ext = np.append(low, low[-1])
+
+        starts = np.minimum(starts, ends)
+        bounds = np.empty(2 * len(starts), dtype=np.int64)
+        bounds[0::2] = starts
+        bounds[1::2] = ends + 1
+
+        max_high = np.maximum.reduceat(high_ext, bounds)[0::2]
+        min_low = np.minimum.reduceat(low_ext, bounds)[0::2]
+        return max_high, min_low
+
+    def save(self, path: str):
+        """Salva o livro de trades em formato binário (.npy)"""
+        np.save(path, self.records, allow_pickle=False)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> 'TradeLog':
+        """Carrega um livro de trades salvo com ``save``"""
+        records = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+        return cls(records)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Converte os trades em DataFrame (motivos de saída como texto)"""
+        df = pd.DataFrame(self.records)
+        df['exit_reason'] = df['exit_reason'].map(EXIT_REASONS)
+        return df
+
+    def statistics(self) -> Dict:
+        """Calcula estatísticas por trade"""
+        pnl = self.records['pnl']
+        n_trades = len(pnl)
+
+        if n_trades == 0:
+            return {
+                'total_trades': 0, 'long_trades': 0, 'short_trades': 0,
+                'win_rate': 0.0, 'profit_factor': 0.0, 'total_pnl': 0.0,
+                'avg_win': 0.0, 'avg_loss': 0.0, 'expectancy': 0.0,
+                'avg_bars': 0.0, 'avg_mae': 0.0, 'avg_mfe': 0.0
+            }
+
+        wins = pnl > 0
+        losses = pnl < 0
+        gross_profit = pnl[wins].sum()
+        gross_loss = -pnl[losses].sum()
+        n_wins = np.count_nonzero(wins)
+        n_losses = np.count_nonzero(losses)
+
+        return {
+            'total_trades': n_trades,
+            'long_trades': int(np.count_nonzero(self.records['side'] > 0)),
+            'short_trades': int(np.count_nonzero(self.records['side'] < 0)),
+            'win_rate': n_wins / n_trades,
+            'profit_factor': gross_profit / gross_loss if gross_loss > 0 else 0.0,
+            'total_pnl': float(pnl.sum()),
+            'avg_win': gross_profit / n_wins if n_wins else 0.0,
+            'avg_loss': -gross_loss / n_losses if n_losses else 0.0,
+            'expectancy': float(pnl.mean()),
+            'avg_bars': float(self.records['bars'].mean()),
+            'avg_mae': float(self.records['mae'].mean()),
+            'avg_mfe': float(self.records['mfe'].mean())
+        }
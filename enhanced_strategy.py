@@ -3,14 +3,28 @@ import pandas as pd
 from scipy.signal import argrelextrema
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
-import talib
+import time
+from backtest.cache import data_fingerprint
+from backtest.matrix_backtester import MatrixBacktester
+from ml_strategy.artifacts import ArtifactStore
+from ml_strategy import indicators as kernels
 
 class EnhancedWDOStrategy:
+    FEATURE_COLS = [
+        'trend_strength', 'rsi', 'volume_ratio', 'vol_profile_delta',
+        'atr', 'is_key_hour'
+    ]
+    
     def __init__(self, data):
         self.data = data
         self.model = RandomForestClassifier(n_estimators=200, random_state=42)
         self.scaler = StandardScaler()
         self.prepared_data = None
+        # Tempo de cálculo (s) de cada feature do modelo, medido em prepare_all_data
+        self.feature_costs = {}
+        # Fingerprint e período dos dados de mercado usados no último fit
+        self.training_fingerprint = None
+        self.training_period = None
 
     def prepare_all_data(self):
         """Prepara todos os dados uma única vez"""
@@ -19,12 +33,15 @@ class EnhancedWDOStrategy:
         
         # 1. Adiciona informações de horário
         print("Adicionando informações de horário...")
+        begin = time.perf_counter()
         df['hour'] = df.index.hour
         df['minute'] = df.index.minute
         df['is_key_hour'] = df['hour'].isin([9, 10, 15, 16])
+        self.feature_costs['is_key_hour'] = time.perf_counter() - begin
         
         # 2. Calcula POC por dia
         print("Calculando POC diário...")
+        begin = time.perf_counter()
         df['date'] = df.index.date
         
         # Calcula POC por dia
@@ -37,6 +54,7 @@ class EnhancedWDOStrategy:
         
         df['poc'] = poc_values
         df['vol_profile_delta'] = df['close'] - df['poc']
+        self.feature_costs['vol_profile_delta'] = time.perf_counter() - begin
         
         # Remove coluna auxiliar
         df = df.drop('date', axis=1)
@@ -93,26 +111,36 @@ class EnhancedWDOStrategy:
         
         # Tendência
         print("Calculando EMAs...")
-        df['ema9'] = talib.EMA(df['close'], timeperiod=9)
-        df['ema21'] = talib.EMA(df['close'], timeperiod=21)
+        begin = time.perf_counter()
+        close = df['close'].to_numpy(dtype=np.float64)
+        df['ema9'] = kernels.ema(close, 9)
+        df['ema21'] = kernels.ema(close, 21)
         df['trend_strength'] = df['ema9'] - df['ema21']
+        self.feature_costs['trend_strength'] = time.perf_counter() - begin
         
         # Momentum
         print("Calculando RSI...")
-        df['rsi'] = talib.RSI(df['close'], timeperiod=14)
+        begin = time.perf_counter()
+        df['rsi'] = kernels.rsi(close, 14)
+        self.feature_costs['rsi'] = time.perf_counter() - begin
         df['rsi_divergence'] = self._calculate_divergence(df['close'], df['rsi'])
         
         # Volatilidade
         print("Calculando ATR e Bandas de Bollinger...")
-        df['atr'] = talib.ATR(df['high'], df['low'], df['close'], timeperiod=14)
-        df['bbands_upper'], df['bbands_middle'], df['bbands_lower'] = talib.BBANDS(
-            df['close'], timeperiod=20, nbdevup=2, nbdevdn=2
+        begin = time.perf_counter()
+        df['atr'] = kernels.atr(df['high'].to_numpy(), df['low'].to_numpy(), close, 14)
+        self.feature_costs['atr'] = time.perf_counter() - begin
+        # Desvio populacional (ddof=0), como no talib
+        df['bbands_upper'], df['bbands_middle'], df['bbands_lower'] = kernels.bollinger(
+            close, window=20, num_std=2, ddof=0
         )
         
         # Volume
         print("Calculando indicadores de volume...")
-        df['volume_ma'] = talib.SMA(df['volume'], timeperiod=20)
+        begin = time.perf_counter()
+        df['volume_ma'] = kernels.sma(df['volume'].to_numpy(dtype=np.float64), 20)
         df['volume_ratio'] = df['volume'] / df['volume_ma']
+        self.feature_costs['volume_ratio'] = time.perf_counter() - begin
         
         # Verifica quais colunas têm NaN
         print("\nVerificando NaN após adicionar indicadores:")
@@ -158,52 +186,104 @@ class EnhancedWDOStrategy:
     
     def generate_signals(self, df):
         """Gera sinais de trading baseados em regras específicas para WDO"""
-        signals = pd.Series(0, index=df.index)
+        signals = self.generate_signal_grid(df).iloc[:, 0]
+        return signals.rename(None)
+    
+    def generate_signal_grid(self, df, trend_volume_ratio=1.2, reversal_volume_ratio=1.5,
+                             breakout_volume_ratio=2.0, rsi_lower=40, rsi_upper=60):
+        """
+        Gera sinais para vários conjuntos de limiares de uma só vez
+        
+        Cada limiar pode ser escalar ou vetor; os vetores são combinados por
+        broadcasting em K conjuntos e as regras são avaliadas como matrizes
+        (barras x K) em vez de um pipeline por valor.
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Sinais (barras x K) com colunas indexadas pelos limiares
+        """
+        thresholds = np.broadcast_arrays(*[
+            np.atleast_1d(np.asarray(value, dtype=np.float64))
+            for value in (trend_volume_ratio, reversal_volume_ratio,
+                          breakout_volume_ratio, rsi_lower, rsi_upper)
+        ])
+        trend_vr, reversal_vr, breakout_vr, rsi_lo, rsi_hi = thresholds
+        
+        # Indicadores como colunas (T, 1) para broadcasting contra os limiares (K,)
+        trend_strength = df['trend_strength'].to_numpy(dtype=np.float64)[:, None]
+        atr = df['atr'].to_numpy(dtype=np.float64)[:, None]
+        volume_ratio = df['volume_ratio'].to_numpy(dtype=np.float64)[:, None]
+        rsi = df['rsi'].to_numpy(dtype=np.float64)[:, None]
+        divergence = np.asarray(df['rsi_divergence'], dtype=np.float64)[:, None]
+        delta = df['vol_profile_delta'].to_numpy(dtype=np.float64)[:, None]
         
         # Regra 1: Scalping em tendência forte
         trend_signal = np.where(
-            (df['trend_strength'] > df['atr']) & 
-            (df['volume_ratio'] > 1.2) &
-            (df['rsi'] > 40) & (df['rsi'] < 60),
-            np.sign(df['trend_strength']),
+            (trend_strength > atr) &
+            (volume_ratio > trend_vr) &
+            (rsi > rsi_lo) & (rsi < rsi_hi),
+            np.sign(trend_strength),
             0
         )
         
         # Regra 2: Reversão em extremos
         reversal_signal = np.where(
-            (df['rsi_divergence'] != 0) &
-            (df['volume_ratio'] > 1.5),
-            df['rsi_divergence'],
+            (divergence != 0) &
+            (volume_ratio > reversal_vr),
+            divergence,
             0
         )
         
         # Regra 3: Breakout
         breakout_signal = np.where(
-            (abs(df['vol_profile_delta']) > df['atr']) &
-            (df['volume_ratio'] > 2),
-            np.sign(df['vol_profile_delta']),
+            (np.abs(delta) > atr) &
+            (volume_ratio > breakout_vr),
+            np.sign(delta),
             0
         )
         
-        # Combinando sinais
-        signals = pd.Series(
-            trend_signal + reversal_signal + breakout_signal,
-            index=df.index
-        )
-        
         # Filtros de horário
-        signals = signals.where(
-            (df['hour'].between(9, 16)) &  # Horário comercial
-            (~df['hour'].isin([12, 13])),  # Evita horário de almoço
-            0
+        hour = df['hour'].to_numpy()[:, None]
+        trading_hours = (hour >= 9) & (hour <= 16) & (hour != 12) & (hour != 13)
+        signals = np.where(trading_hours, trend_signal + reversal_signal + breakout_signal, 0.0)
+        
+        columns = pd.MultiIndex.from_arrays(
+            thresholds,
+            names=['trend_volume_ratio', 'reversal_volume_ratio',
+                   'breakout_volume_ratio', 'rsi_lower', 'rsi_upper']
         )
-        
-        return signals
+        return pd.DataFrame(signals, index=df.index, columns=columns)
+    
+    def evaluate_signal_grid(self, df, initial_capital=100000.0, **thresholds):
+        """
+        Pontua todos os conjuntos de limiares com um único backtest matricial
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Dados preparados (``prepare_all_data``)
+        initial_capital : float
+            Capital inicial de cada backtest
+        **thresholds
+            Limiares aceitos por ``generate_signal_grid`` (escalares ou vetores)
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Estatísticas de ``MatrixBacktester`` indexadas pelos limiares
+        """
+        signals = self.generate_signal_grid(df, **thresholds)
+        backtester = MatrixBacktester(df['close'], initial_capital=initial_capital)
+        stats = backtester.run(signals, names=range(signals.shape[1]),
+                               return_curves=False)['stats']
+        stats.index = signals.columns
+        return stats
     
     def calculate_position_size(self, df):
         """Calcula tamanho da posição baseado em volatilidade"""
         base_size = 1
-        vol_factor = df['atr'] / df['atr'].rolling(20).mean()
+        vol_factor = df['atr'] / kernels.sma(df['atr'].to_numpy(), 20)
         
         position_size = base_size * (1 / vol_factor)
         position_size = position_size.clip(0.5, 2)  # Limita entre 0.5 e 2 contratos
@@ -218,7 +298,7 @@ class EnhancedWDOStrategy:
         # Invalida sinais em condições de risco elevado
         risk_conditions = (
             (df['volume_ratio'] < 0.5) |  # Volume muito baixo
-            (df['atr'] > df['atr'].rolling(20).mean() * 2)  # Volatilidade muito alta
+            (df['atr'] > kernels.sma(df['atr'].to_numpy(), 20) * 2)  # Volatilidade muito alta
         )
         
         # Pega apenas o último valor das condições de risco
@@ -254,10 +334,7 @@ class EnhancedWDOStrategy:
         df['label'] = np.where(df['future_return'] > 0, 1, -1)
         
         # Seleciona features
-        feature_cols = [
-            'trend_strength', 'rsi', 'volume_ratio', 'vol_profile_delta',
-            'atr', 'is_key_hour'
-        ]
+        feature_cols = self.FEATURE_COLS
         
         # Remove apenas as primeiras linhas com NaN (devido ao período de cálculo dos indicadores)
         first_valid_idx = df[feature_cols].notna().all(axis=1).idxmax()
@@ -278,8 +355,38 @@ class EnhancedWDOStrategy:
         
         X_scaled = self.scaler.fit_transform(X)
         self.model.fit(X_scaled, y)
+        self.training_period = (X.index[0], X.index[-1])
+        self.training_fingerprint = data_fingerprint(self.data.loc[X.index[0]:X.index[-1]])
         print("Treinamento concluído!")
         
+    def save_model(self, store: ArtifactStore, name: str = 'enhanced_wdo', metadata=None) -> str:
+        """
+        Salva modelo, scaler, features e fingerprint dos dados de treino como
+        nova versão no ArtifactStore
+        
+        O fingerprint é o da fatia dos dados de mercado usada no último
+        ``fit`` (período em ``train_start``/``train_end`` nos metadados).
+        """
+        if self.training_fingerprint is None:
+            raise ValueError("Execute fit() antes de salvar o modelo")
+        metadata = dict(metadata or {})
+        metadata.setdefault('train_start', str(self.training_period[0]))
+        metadata.setdefault('train_end', str(self.training_period[1]))
+        return store.save(name, self.model, self.FEATURE_COLS, scaler=self.scaler,
+                          data=self.training_fingerprint, metadata=metadata)
+    
+    def load_model(self, store: ArtifactStore, name: str = 'enhanced_wdo', version=None):
+        """
+        Carrega um modelo salvo sem retreinar
+        
+        A floresta é carregada na forma compilada (arrays memory-mapped), que
+        reproduz ``predict`` do RandomForestClassifier.
+        """
+        artifact = store.load(name, version)
+        self.model = artifact.predictor
+        self.scaler = artifact.scaler
+        return artifact
+    
     def predict(self, current_data):
         """Faz previsão usando dados pré-processados"""
         try:
@@ -291,11 +398,7 @@ class EnhancedWDOStrategy:
             rule_signals = self.generate_signals(df)
             
             # Gera previsões do modelo
-            feature_cols = [
-                'trend_strength', 'rsi', 'volume_ratio', 'vol_profile_delta',
-                'atr', 'is_key_hour'
-            ]
-            X = df[feature_cols].iloc[-1:]
+            X = df[self.FEATURE_COLS].iloc[-1:]
             X_scaled = self.scaler.transform(X)
             model_signal = self.model.predict(X_scaled)[0]
             
@@ -1,6 +1,6 @@
 # main.py
 from enhanced_strategy import EnhancedWDOStrategy
-from backtest import Backtester
+from backtest import Backtester, FillSimulator
 from data import MT5DataLoader
 from analysis import PerformanceAnalyzer
 import pandas as pd
@@ -91,8 +91,16 @@ def main():
     results_df.set_index('date', inplace=True)
     
     if not results_df.empty:
+        # Simular execuções intrabarra respeitando o stop_distance da estratégia
+        simulator = FillSimulator.from_frame(data, slippage_ticks=1)
+        trades = simulator.simulate_signals(
+            results_df['signal'],
+            stop_distance=results_df['stop_distance']
+        )
+        print(f"\nTrades simulados: {len(trades)}")
+        
         # Analisar resultados
-        analyzer = PerformanceAnalyzer(results_df, data)
+        analyzer = PerformanceAnalyzer(results_df, data, trades=trades)
         metrics = analyzer.analyze()
         
         # Imprimir resultados
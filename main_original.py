@@ -1,5 +1,5 @@
 from strategies import MeanReversionStrategy, MeanReversionEnhanced
-from backtest import Backtester
+from backtest import Backtester, BacktestCache
 from analysis import PerformanceAnalyzer
 from data import MT5DataLoader
 import pandas as pd
@@ -27,10 +27,13 @@ def main():
     strategy = MLTradingStrategy(data)
     strategy.train('2024-01-01', '2024-10-31')
 
+    # Cache de backtests: reexecuções com mesmos dados e parâmetros são lidas do disco
+    cache = BacktestCache()
+    
     # Testar estratégias
     strategies = {
         'Mean Reversion': MeanReversionStrategy(data),
-        'Enhanced Mean Reversion': MeanReversionEnhanced(data)
+        'Enhanced Mean Reversion': MeanReversionEnhanced(data, cache=cache)
     }
     
     results_summary = []
@@ -39,11 +42,12 @@ def main():
         print(f"\nTesting {name} strategy...")
         
         # Executar backtest
-        backtester = Backtester(strategy)
+        backtester = Backtester(strategy, cache=cache)
         results = backtester.run()
         
         # Analisar e plotar resultados
-        analyzer = PerformanceAnalyzer(results, strategy.data)
+        trades = backtester.extract_trades(results)
+        analyzer = PerformanceAnalyzer(results, strategy.data, trades=trades)
         metrics = analyzer.analyze()
         
         # Imprimir métricas
@@ -1,11 +1,28 @@
 from .model import MLModel
 from .data_processor import DataProcessor
+from .feature_store import FeatureStore
 from .feature_engineering import FeatureEngineer
+from .feature_graph import FeaturePipeline, FeatureRegistry
 from .risk_manager import RiskManager
+from .inference import CompiledEnsemble, CompiledForest, benchmark_latency
+from .artifacts import ArtifactStore, ModelArtifact
+from .labeling import horizon_labels, triple_barrier_labels
+from .indicators import benchmark_indicators
 
 __all__ = [
     'MLModel',
     'DataProcessor',
+    'FeatureStore',
     'FeatureEngineer',
-    'RiskManager'
+    'FeaturePipeline',
+    'FeatureRegistry',
+    'RiskManager',
+    'CompiledEnsemble',
+    'CompiledForest',
+    'ArtifactStore',
+    'ModelArtifact',
+    'benchmark_latency',
+    'benchmark_indicators',
+    'horizon_labels',
+    'triple_barrier_labels'
 ]
\ No newline at end of file
@@ -0,0 +1,207 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+from backtest.cache import data_fingerprint
+from .inference import CompiledEnsemble, CompiledForest
+from .model import MLModel, restore_scaler, scaler_state
+
+_VERSION = re.compile(r'^v(\d+)$')
+
+
+class ModelArtifact:
+    """
+    Modelo carregado do ArtifactStore, pronto para prever
+
+    ``predictor`` é a forma compilada (arrays planos, memory-mapped por
+    padrão); as features são reordenadas pela lista salva e o scaler, se
+    houver, é aplicado antes da previsão.
+    """
+
+    def __init__(self, path: str, manifest: Dict, predictor):
+        self.path = path
+        self.manifest = manifest
+        self.predictor = predictor
+        self.version = manifest['version']
+        self.kind = manifest['kind']
+        self.features = manifest['features']
+        self.data_fingerprint = manifest['data_fingerprint']
+        self.scaler = restore_scaler(manifest['scaler'])
+
+    def _matrix(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X[self.features].to_numpy(dtype=np.float64)
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if self.scaler is not None:
+            X = (X - self.scaler.mean_) / self.scaler.scale_
+        return X
+
+    def predict_proba(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """Probabilidades das classes (linhas x classes)"""
+        return self.predictor.predict_batch(self._matrix(X))
+
+    def predict(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """Classes previstas (LightGBM: -1, 0, 1 como em ``MLModel.predict``)"""
+        proba = self.predict_proba(X)
+        if self.kind == 'random_forest':
+            return self.predictor.classes_[np.argmax(proba, axis=1)]
+        return np.argmax(proba, axis=1) - 1
+
+    def load_model(self) -> MLModel:
+        """MLModel completo (boosters do LightGBM) para ``update`` ou novo treino"""
+        if self.kind != 'lightgbm':
+            raise ValueError("Apenas artefatos LightGBM guardam o MLModel completo")
+        return MLModel.load(os.path.join(self.path, 'model'))
+
+
+class ArtifactStore:
+    """
+    Armazenamento versionado de modelos treinados
+
+    Cada ``save`` cria ``<root>/<nome>/vNNNN`` com o modelo compilado em
+    arrays ``.npy`` (carregados com memory-map: workers do otimizador e
+    processos ao vivo compartilham as páginas), o scaler, a lista de features
+    e o fingerprint dos dados de treino em ``manifest.json``. Modelos LightGBM
+    também guardam os boosters completos (``MLModel.save``) para atualizações
+    incrementais. A versão só aparece no diretório depois de escrita por
+    completo (renomeação atômica).
+    """
+
+    def __init__(self, root: str = 'model_artifacts'):
+        """
+        Parameters:
+        -----------
+        root : str
+            Diretório raiz do armazenamento
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def versions(self, name: str) -> List[str]:
+        """Versões salvas de um modelo, da mais antiga para a mais recente"""
+        directory = os.path.join(self.root, name)
+        if not os.path.isdir(directory):
+            return []
+        found = [entry for entry in os.listdir(directory) if _VERSION.match(entry)]
+        return sorted(found, key=lambda entry: int(_VERSION.match(entry).group(1)))
+
+    def latest(self, name: str) -> Optional[str]:
+        versions = self.versions(name)
+        return versions[-1] if versions else None
+
+    def save(self, name: str, model, features: List[str], scaler=None,
+             data: Union[pd.DataFrame, str, None] = None,
+             metadata: Optional[Dict] = None) -> str:
+        """
+        Salva uma nova versão do modelo
+
+        Parameters:
+        -----------
+        name : str
+            Nome do modelo (ex.: 'ml_strategy', 'enhanced_wdo')
+        model : MLModel, List[lgb.Booster] or RandomForestClassifier
+            Modelo treinado
+        features : List[str]
+            Colunas de entrada, na ordem do treino
+        scaler : StandardScaler, optional
+            Scaler ajustado (padrão: ``model.scaler`` de um MLModel)
+        data : pd.DataFrame or str, optional
+            Dados de treino ou fingerprint já calculado
+        metadata : Dict, optional
+            Informações extras (período, métricas, etc.)
+
+        Returns:
+        --------
+        str
+            Versão criada (ex.: 'v0003')
+        """
+        directory = os.path.join(self.root, name)
+        os.makedirs(directory, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=directory)
+        try:
+            if isinstance(model, MLModel):
+                kind = 'lightgbm'
+                scaler = model.scaler if scaler is None else scaler
+                model.save(os.path.join(staging, 'model'))
+                predictor = CompiledEnsemble(model.model)
+            elif isinstance(model, (list, tuple)):
+                kind = 'lightgbm'
+                wrapper = MLModel()
+                wrapper.model = list(model)
+                wrapper.feature_names_ = list(features)
+                wrapper.save(os.path.join(staging, 'model'))
+                predictor = CompiledEnsemble(wrapper.model)
+            elif hasattr(model, 'estimators_'):
+                kind = 'random_forest'
+                predictor = CompiledForest(model)
+            else:
+                raise TypeError(f"Modelo não suportado: {type(model).__name__}")
+
+            if predictor.n_features != len(features):
+                raise ValueError(f"Modelo usa {predictor.n_features} features, recebidas {len(features)}")
+            predictor.save(os.path.join(staging, 'trees'))
+
+            if isinstance(data, pd.DataFrame):
+                data = data_fingerprint(data)
+            manifest = {
+                'name': name,
+                'kind': kind,
+                'created_at': time.time(),
+                'features': list(features),
+                'data_fingerprint': data,
+                'scaler': scaler_state(scaler),
+                'metadata': metadata or {}
+            }
+
+            # Próxima versão livre; a renomeação falha se outro processo a criou antes
+            while True:
+                latest = self.latest(name)
+                version = f"v{(int(latest[1:]) if latest else 0) + 1:04d}"
+                manifest['version'] = version
+                with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+                    json.dump(manifest, f, indent=2, default=str)
+                try:
+                    os.rename(staging, os.path.join(directory, version))
+                    return version
+                except OSError:
+                    if not os.path.isdir(os.path.join(directory, version)):
+                        raise
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def load(self, name: str, version: Optional[str] = None, mmap: bool = True,
+             n_threads: Optional[int] = None) -> ModelArtifact:
+        """
+        Carrega uma versão (padrão: a mais recente)
+
+        Parameters:
+        -----------
+        name : str
+            Nome do modelo
+        version : str, optional
+            Versão (ex.: 'v0002')
+        mmap : bool
+            Mapeia os arrays das árvores em vez de copiá-los para a memória
+        n_threads : int, optional
+            Threads da previsão em lote
+
+        Returns:
+        --------
+        ModelArtifact
+        """
+        version = version or self.latest(name)
+        if version is None:
+            raise FileNotFoundError(f"Nenhuma versão salva para '{name}'")
+        path = os.path.join(self.root, name, version)
+        with open(os.path.join(path, 'manifest.json')) as f:
+            manifest = json.load(f)
+
+        compiled = CompiledForest if manifest['kind'] == 'random_forest' else CompiledEnsemble
+        predictor = compiled.load(os.path.join(path, 'trees'), mmap=mmap, n_threads=n_threads)
+        return ModelArtifact(path, manifest, predictor)
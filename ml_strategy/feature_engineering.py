@@ -1,45 +1,45 @@
 import pandas as pd
-import numpy as np
-from typing import List, Dict
+from typing import List, Optional
+from .feature_graph import DEFAULT_REGISTRY, FeaturePipeline, add_window_block
 
 class FeatureEngineer:
     """Classe responsável pela criação de features"""
     
     def __init__(self, data: pd.DataFrame):
         self.data = data
-        
-    def create_technical_features(self) -> pd.DataFrame:
-        """Cria features baseadas em indicadores técnicos"""
-        df = pd.DataFrame(index=self.data.index)
-        
-        # Preços e retornos
-        df['returns'] = self.data['Close'].pct_change()
-        df['log_returns'] = np.log(self.data['Close']).diff()
-        
-        # Features técnicas
-        for window in [5, 15, 30, 60]:
-            df[f'sma_{window}'] = self.data['Close'].rolling(window).mean()
-            df[f'momentum_{window}'] = self.data['Close'].pct_change(window)
-            df[f'volatility_{window}'] = df['returns'].rolling(window).std()
-        
-        return df
+        # Features sob demanda a partir do registro declarativo (ml_strategy.feature_graph)
+        self.pipeline = FeaturePipeline(data)
+        
+    def create_features(self, names: List[str], version: Optional[str] = None) -> pd.DataFrame:
+        """
+        Calcula apenas as features pedidas (e suas dependências)
+        
+        Intermediários e resultados ficam memorizados por versão dos dados;
+        ``version`` é o fingerprint dos dados, se o chamador já o calculou.
+        """
+        self.pipeline.data = self.data
+        return self.pipeline.compute(names, version)
+    
+    def create_technical_features(self, windows: List[int] = (5, 15, 30, 60),
+                                  version: Optional[str] = None) -> pd.DataFrame:
+        """
+        Cria features baseadas em indicadores técnicos
+        
+        Retornos, médias, momentum e volatilidades de todas as janelas saem
+        de um único nó do registro (``add_window_block``), escrito em um bloco
+        contíguo na ordem de colunas original.
+        """
+        registry = self.pipeline.registry
+        if registry is DEFAULT_REGISTRY:
+            registry = self.pipeline.registry = DEFAULT_REGISTRY.copy()
+        name = add_window_block(registry, windows)
+        self.pipeline.data = self.data
+        return self.pipeline.block(name, version)
     
-    def create_volume_features(self) -> pd.DataFrame:
+    def create_volume_features(self, version: Optional[str] = None) -> pd.DataFrame:
         """Cria features baseadas em volume"""
-        df = pd.DataFrame(index=self.data.index)
-        
-        df['volume'] = self.data['Volume']
-        df['volume_ma'] = df['volume'].rolling(20).mean()
-        df['volume_std'] = df['volume'].rolling(20).std()
-        
-        return df
+        return self.create_features(['volume', 'volume_ma', 'volume_std'], version)
     
-    def create_time_features(self) -> pd.DataFrame:
+    def create_time_features(self, version: Optional[str] = None) -> pd.DataFrame:
         """Cria features baseadas em tempo"""
-        df = pd.DataFrame(index=self.data.index)
-        
-        df['hour'] = self.data.index.hour
-        df['minute'] = self.data.index.minute
-        df['day_of_week'] = self.data.index.dayofweek
-        
-        return df
\ No newline at end of file
+        return self.create_features(['hour', 'minute', 'day_of_week'], version)
@@ -0,0 +1,362 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from backtest.cache import data_fingerprint
+from .rolling import moving_average, rolling_mean, rolling_std, pct_change_windows
+from . import indicators
+
+# Janelas registradas por padrão para as features parametrizadas
+DEFAULT_WINDOWS = (5, 10, 15, 20, 30, 50, 60)
+
+
+class FeatureNode:
+    """
+    Nó do grafo: nome, entradas, histórico próprio necessário e função de cálculo
+
+    Nós com ``outputs`` calculam um bloco 2-D (barras, saídas); cada coluna
+    fica disponível no pipeline, sem cópia, sob o nome correspondente.
+    """
+
+    def __init__(self, name: str, compute: Callable, inputs: Sequence[str] = (),
+                 lookback: int = 0, source: bool = False, outputs: Sequence[str] = ()):
+        self.name = name
+        self.compute = compute
+        self.inputs = tuple(inputs)
+        self.lookback = lookback
+        self.source = source
+        self.outputs = tuple(outputs)
+
+    def __repr__(self) -> str:
+        return f"FeatureNode({self.name!r}, inputs={self.inputs}, lookback={self.lookback})"
+
+
+class FeatureRegistry:
+    """
+    Registro declarativo de features
+
+    Cada feature declara as entradas (outras features ou fontes, como
+    'close' ou 'hour') e o histórico próprio em barras (``lookback``). A
+    função de cálculo recebe os arrays das entradas, na ordem declarada, e
+    retorna um array 1-D com uma posição por barra; fontes recebem o
+    DataFrame de dados.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, FeatureNode] = {}
+
+    def add(self, name: str, compute: Callable, inputs: Sequence[str] = (),
+            lookback: int = 0, source: bool = False, outputs: Sequence[str] = ()) -> FeatureNode:
+        """Registra (ou substitui) uma feature"""
+        node = FeatureNode(name, compute, inputs, lookback, source, outputs)
+        self.nodes[name] = node
+        return node
+
+    def feature(self, name: str, inputs: Sequence[str] = (), lookback: int = 0):
+        """Decorador equivalente a ``add``"""
+        def decorator(compute: Callable) -> Callable:
+            self.add(name, compute, inputs, lookback)
+            return compute
+        return decorator
+
+    def source(self, name: str, extract: Callable[[pd.DataFrame], np.ndarray]) -> FeatureNode:
+        """Registra uma fonte extraída diretamente dos dados"""
+        return self.add(name, extract, source=True)
+
+    def names(self, include_sources: bool = False) -> List[str]:
+        return [name for name, node in self.nodes.items() if include_sources or not node.source]
+
+    def resolve(self, names: Iterable[str]) -> List[str]:
+        """
+        Nós necessários para calcular ``names``, em ordem topológica
+
+        Raises:
+        -------
+        KeyError
+            Feature não registrada
+        ValueError
+            Dependência circular
+        """
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visitando, 2 = concluído
+
+        def visit(name: str, path: tuple):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Dependência circular: {' -> '.join(path + (name,))}")
+            if name not in self.nodes:
+                raise KeyError(f"Feature não registrada: {name}")
+            state[name] = 1
+            for dependency in self.nodes[name].inputs:
+                visit(dependency, path + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for name in names:
+            visit(name, ())
+        return order
+
+    def lookback(self, names: Iterable[str]) -> int:
+        """Barras de histórico necessárias (maior soma de lookbacks ao longo das dependências)"""
+        total: Dict[str, int] = {}
+        for name in self.resolve(names):
+            node = self.nodes[name]
+            total[name] = node.lookback + max((total[dep] for dep in node.inputs), default=0)
+        return max((total[name] for name in names), default=0)
+
+    def copy(self) -> 'FeatureRegistry':
+        registry = FeatureRegistry()
+        registry.nodes = dict(self.nodes)
+        return registry
+
+
+class FeaturePipeline:
+    """
+    Cálculo preguiçoso de conjuntos de features sobre um registro
+
+    Apenas os nós necessários para as features pedidas são calculados;
+    resultados (inclusive intermediários como retornos, true range e médias
+    móveis) ficam memorizados por versão dos dados (fingerprint do conteúdo)
+    e são compartilhados entre pedidos.
+    """
+
+    def __init__(self, data: pd.DataFrame, registry: Optional[FeatureRegistry] = None):
+        """
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            Dados de mercado (colunas OHLCV, maiúsculas ou minúsculas)
+        registry : FeatureRegistry, optional
+            Registro de features (padrão: ``DEFAULT_REGISTRY``)
+        """
+        self.data = data
+        self.registry = registry if registry is not None else DEFAULT_REGISTRY
+        self.version = None
+        self._results: Dict[str, np.ndarray] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self.computations = 0
+
+    def refresh(self, version: Optional[str] = None) -> str:
+        """
+        Recalcula a versão dos dados e descarta os resultados de versões anteriores
+
+        Parameters:
+        -----------
+        version : str, optional
+            Fingerprint de ``data`` já calculado pelo chamador (evita um novo
+            hash sobre todos os dados)
+        """
+        if version is None:
+            version = data_fingerprint(self.data)
+        if version != self.version:
+            self.version = version
+            self._results = {}
+            self._frames = {}
+        return version
+
+    def values(self, name: str) -> np.ndarray:
+        """Array de uma feature (calcula as dependências que faltam)"""
+        self.refresh()
+        return self._values(name)
+
+    def _values(self, name: str) -> np.ndarray:
+        """Como ``values``, sem recalcular a versão (chamado após ``refresh``)"""
+        for node_name in self.registry.resolve([name]):
+            if node_name in self._results:
+                continue
+            node = self.registry.nodes[node_name]
+            if node.source:
+                result = node.compute(self.data)
+            else:
+                result = node.compute(*(self._results[dep] for dep in node.inputs))
+            self._results[node_name] = result = np.asarray(result)
+            self.computations += 1
+            for j, output in enumerate(node.outputs):
+                self._results.setdefault(output, result[:, j])
+        return self._results[name]
+
+    def compute(self, names: Sequence[str], version: Optional[str] = None) -> pd.DataFrame:
+        """
+        Calcula um conjunto de features
+
+        Parameters:
+        -----------
+        names : Sequence[str]
+            Features desejadas
+        version : str, optional
+            Fingerprint de ``data`` já calculado pelo chamador
+
+        Returns:
+        --------
+        pd.DataFrame
+            Uma coluna por feature, no índice dos dados
+        """
+        self.refresh(version)
+        return pd.DataFrame({name: self._values(name) for name in names}, index=self.data.index)
+
+    def block(self, name: str, version: Optional[str] = None) -> pd.DataFrame:
+        """
+        Bloco de um nó com várias saídas como DataFrame, sem cópia
+
+        Parameters:
+        -----------
+        name : str
+            Nó registrado com ``outputs``
+        version : str, optional
+            Fingerprint de ``data`` já calculado pelo chamador
+        """
+        self.refresh(version)
+        frame = self._frames.get(name)
+        if frame is None:
+            frame = self._frames[name] = pd.DataFrame(
+                self._values(name), index=self.data.index,
+                columns=list(self.registry.nodes[name].outputs), copy=False
+            )
+        # Cópia rasa: com o DataFrame memorizado como referência, alterações
+        # do chamador copiam as colunas (copy-on-write) em vez de alterar o cache
+        return frame.copy(deep=False)
+
+    def lookback(self, names: Sequence[str]) -> int:
+        return self.registry.lookback(names)
+
+    def clear(self):
+        """Descarta os resultados memorizados"""
+        self.version = None
+        self._results = {}
+        self._frames = {}
+
+
+def _column(name: str) -> Callable[[pd.DataFrame], np.ndarray]:
+    def extract(data: pd.DataFrame) -> np.ndarray:
+        column = name if name in data.columns else name.capitalize()
+        return data[column].to_numpy(dtype=np.float64)
+    return extract
+
+
+def _shift_ratio(values: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[1:] = values[1:] / previous[:-1]
+    return out
+
+
+def _returns(close: np.ndarray) -> np.ndarray:
+    return _shift_ratio(close, close) - 1
+
+
+def _log_returns(close: np.ndarray) -> np.ndarray:
+    out = np.full(len(close), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[1:] = np.diff(np.log(close))
+    return out
+
+
+def _mean(window: int) -> Callable[[np.ndarray], np.ndarray]:
+    return lambda values: moving_average(values, window)
+
+
+def _std(window: int) -> Callable[[np.ndarray], np.ndarray]:
+    return lambda values: rolling_std(values, [window])[:, 0]
+
+
+def _momentum(window: int) -> Callable[[np.ndarray], np.ndarray]:
+    return lambda close: pct_change_windows(close, [window])[:, 0]
+
+
+def _distance(values: np.ndarray, average: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (values - average) / average
+
+
+def _ratio(values: np.ndarray, average: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return values / average
+
+
+def add_window_features(registry: FeatureRegistry, window: int):
+    """Registra média, distância à média, momentum e volatilidade de uma janela"""
+    registry.add(f'sma_{window}', _mean(window), ['close'], lookback=window - 1)
+    registry.add(f'sma_dist_{window}', _distance, ['close', f'sma_{window}'])
+    registry.add(f'momentum_{window}', _momentum(window), ['close'], lookback=window)
+    registry.add(f'volatility_{window}', _std(window), ['returns'], lookback=window - 1)
+
+
+def _window_block(windows: Sequence[int]) -> Callable:
+    def compute(close: np.ndarray, returns: np.ndarray, log_returns: np.ndarray) -> np.ndarray:
+        # Ordem Fortran: cada coluna é contígua e os kernels escrevem direto nela
+        block = np.empty((2 + 3 * len(windows), len(close))).T
+        block[:, 0] = returns
+        block[:, 1] = log_returns
+        rolling_mean(close, windows, out=block[:, 2::3])
+        pct_change_windows(close, windows, out=block[:, 3::3])
+        rolling_std(returns, windows, out=block[:, 4::3])
+        return block
+    return compute
+
+
+def _block_column(position: int) -> Callable[[np.ndarray], np.ndarray]:
+    return lambda block: block[:, position]
+
+
+def add_window_block(registry: FeatureRegistry, windows: Sequence[int]) -> str:
+    """
+    Registra o bloco de retornos e média, momentum e volatilidade de várias janelas
+
+    Todas as janelas saem de uma chamada de cada kernel (ml_strategy.rolling)
+    e são escritas num único array contíguo com as colunas ``returns``,
+    ``log_returns`` e ``sma_w``, ``momentum_w``, ``volatility_w`` de cada
+    janela, nessa ordem.
+
+    Returns:
+    --------
+    str
+        Nome do nó (``window_block_5_15_...``)
+    """
+    windows = tuple(int(window) for window in windows)
+    name = 'window_block_' + '_'.join(map(str, windows))
+    if name not in registry.nodes:
+        outputs = ['returns', 'log_returns']
+        for window in windows:
+            outputs += [f'sma_{window}', f'momentum_{window}', f'volatility_{window}']
+        # Somado ao retorno (1): o momentum da maior janela usa ``max(windows)`` barras
+        registry.add(name, _window_block(windows), ['close', 'returns', 'log_returns'],
+                     lookback=max(windows, default=1) - 1, outputs=outputs)
+        # Janelas sem nó próprio passam a ser colunas do bloco
+        for j, output in enumerate(outputs):
+            if output not in registry.nodes:
+                registry.add(output, _block_column(j), [name])
+    return name
+
+
+def build_default_registry(windows: Sequence[int] = DEFAULT_WINDOWS) -> FeatureRegistry:
+    """
+    Registro com as features usadas pelo FeatureEngineer, pelo MLModel e
+    pelas estratégias (retornos, médias, volatilidades, volume, horário,
+    true range, ATR e RSI)
+    """
+    registry = FeatureRegistry()
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        registry.source(name, _column(name))
+    registry.source('hour', lambda data: np.asarray(data.index.hour))
+    registry.source('minute', lambda data: np.asarray(data.index.minute))
+    registry.source('day_of_week', lambda data: np.asarray(data.index.dayofweek))
+
+    # Intermediários compartilhados
+    registry.add('returns', _returns, ['close'], lookback=1)
+    registry.add('log_returns', _log_returns, ['close'], lookback=1)
+    registry.add('true_range', indicators.true_range, ['high', 'low', 'close'], lookback=1)
+    registry.add('range', np.subtract, ['high', 'low'])
+
+    for window in windows:
+        add_window_features(registry, window)
+
+    registry.add('volume_ma', _mean(20), ['volume'], lookback=19)
+    registry.add('volume_std', _std(20), ['volume'], lookback=19)
+    registry.add('volume_ratio', _ratio, ['volume', 'volume_ma'])
+    registry.add('range_ma', _mean(20), ['range'], lookback=19)
+    registry.add('atr', _mean(14), ['true_range'], lookback=13)
+    registry.add('rsi', lambda close: indicators.rsi(close, 14, smoothing='simple'), ['close'], lookback=13)
+    return registry
+
+
+DEFAULT_REGISTRY = build_default_registry()
@@ -0,0 +1,157 @@
+import hashlib
+import inspect
+import json
+import time
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+from backtest.cache import BacktestCache, code_version, data_fingerprint
+from . import feature_graph
+
+FEATURE_FAMILIES = ('technical', 'volume', 'time')
+
+# As famílias do FeatureEngineer são definidas no registro de features
+_GRAPH_VERSION = hashlib.blake2b(inspect.getsource(feature_graph).encode(), digest_size=16).hexdigest()
+
+
+class FeatureStore:
+    """
+    Armazena as famílias de features calculadas para uma versão dos dados
+
+    Cada família (técnicas, volume, tempo) é calculada uma única vez por
+    versão dos dados (fingerprint do conteúdo) e mantida em memória; a matriz
+    combinada e limpa também é guardada, de modo que treino e geração de
+    sinais sobre os mesmos dados compartilham um único cálculo. Com um
+    ``BacktestCache`` as famílias também são persistidas em disco, chaveadas
+    pela versão dos dados e pelo código do FeatureEngineer.
+    """
+
+    def __init__(self, feature_engineer, disk_cache: Optional[BacktestCache] = None):
+        """
+        Parameters:
+        -----------
+        feature_engineer : FeatureEngineer
+            Fonte dos dados e dos métodos ``create_<família>_features``
+        disk_cache : BacktestCache, optional
+            Cache em disco para as famílias calculadas
+        """
+        self.feature_engineer = feature_engineer
+        self.disk_cache = disk_cache
+        self.version = None
+        self._families: Dict[str, pd.DataFrame] = {}
+        self._combined: Optional[pd.DataFrame] = None
+        self.computations = 0
+        # Tempo de cálculo (s) de cada família, guardado junto com o cache em disco
+        self.timings: Dict[str, float] = {}
+
+    def refresh(self) -> str:
+        """
+        Recalcula a versão dos dados e descarta as features de versões anteriores
+
+        Chamado uma vez por método público (o hash percorre todos os dados);
+        os auxiliares internos assumem a versão já verificada.
+        """
+        version = data_fingerprint(self.feature_engineer.data)
+        if version != self.version:
+            self.version = version
+            self._families = {}
+            self._combined = None
+        return version
+
+    def family(self, name: str) -> pd.DataFrame:
+        """Features brutas de uma família (memória, disco ou cálculo, nessa ordem)"""
+        if name not in FEATURE_FAMILIES:
+            raise ValueError(f"Família de features desconhecida: {name}")
+        self.refresh()
+        return self._family(name)
+
+    def _family(self, name: str) -> pd.DataFrame:
+        """Como ``family``, sem recalcular a versão (chamado após ``refresh``)"""
+        frame = self._families.get(name)
+        if frame is not None:
+            return frame
+
+        key = self._disk_key(name) if self.disk_cache is not None else None
+        cached = self.disk_cache.get(key) if key is not None else None
+        if cached is not None and cached[0] is not None:
+            frame = cached[0]
+            if 'seconds' in cached[1]:
+                self.timings[name] = cached[1]['seconds']
+        else:
+            print(f"Creating {name} features...")
+            begin = time.perf_counter()
+            # A versão já calculada é repassada para o FeatureEngineer não refazer o hash
+            frame = getattr(self.feature_engineer, f'create_{name}_features')(version=self.version)
+            self.timings[name] = time.perf_counter() - begin
+            self.computations += 1
+            if key is not None:
+                self.disk_cache.put(key, frame, {'family': name, 'shape': list(frame.shape),
+                                                 'seconds': self.timings[name]})
+
+        self._families[name] = frame
+        return frame
+
+    def features(self) -> pd.DataFrame:
+        """Todas as famílias concatenadas, sem infinitos e sem linhas com NaN"""
+        self.refresh()
+        return self._features()
+
+    def _features(self) -> pd.DataFrame:
+        if self._combined is None:
+            features = pd.concat([self._family(name) for name in FEATURE_FAMILIES], axis=1)
+            self._combined = features.replace([np.inf, -np.inf], np.nan).dropna()
+        return self._combined
+
+    def get(self, columns: Optional[List[str]] = None,
+            start=None, end=None) -> pd.DataFrame:
+        """
+        Subconjunto da matriz de features limpa
+
+        Parameters:
+        -----------
+        columns : List[str], optional
+            Colunas desejadas (padrão: todas)
+        start, end : optional
+            Intervalo do índice (inclusivo), como em ``DataFrame.loc``
+
+        Returns:
+        --------
+        pd.DataFrame
+            Cópia das linhas e colunas selecionadas
+        """
+        self.refresh()
+        features = self._features()
+        rows = slice(start, end)
+        if columns is None:
+            return features.loc[rows].copy()
+        return features.loc[rows, list(columns)].copy()
+
+    def column_costs(self) -> pd.Series:
+        """
+        Custo de cálculo estimado por coluna (s)
+
+        As famílias são calculadas em bloco; o tempo de cada família é
+        dividido igualmente entre as suas colunas.
+        """
+        self.refresh()
+        costs = {}
+        for name in FEATURE_FAMILIES:
+            frame = self._family(name)
+            seconds = self.timings.get(name, np.nan)
+            costs.update({column: seconds / frame.shape[1] for column in frame.columns})
+        return pd.Series(costs, name='cost')
+
+    def clear(self):
+        """Descarta as features em memória"""
+        self.version = None
+        self._families = {}
+        self._combined = None
+
+    def _disk_key(self, name: str) -> str:
+        payload = {
+            'data': self.version,
+            'family': name,
+            'code': code_version(type(self.feature_engineer)),
+            'graph': _GRAPH_VERSION
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
@@ -0,0 +1,584 @@
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from typing import Callable, Dict, Optional, Tuple, Union
+from .rolling import moving_average, rolling_mean_std, rolling_std
+
+ArrayLike = Union[np.ndarray, pd.Series]
+
+SMOOTHING = ('wilder', 'simple')
+
+
+def _array(values: ArrayLike) -> np.ndarray:
+    """Entrada como array float32 (preservado) ou float64"""
+    values = np.asarray(values)
+    if values.dtype != np.float32:
+        values = values.astype(np.float64, copy=False)
+    return values
+
+
+def _output(out: Optional[np.ndarray], shape: tuple, *inputs: np.ndarray) -> np.ndarray:
+    """Buffer de saída: ``out`` validado ou um novo array (float32 só se todas as entradas forem)"""
+    if out is not None:
+        if out.shape != shape:
+            raise ValueError(f"Buffer de saída com formato {out.shape}, esperado {shape}")
+        return out
+    dtype = np.float32 if all(x.dtype == np.float32 for x in inputs) else np.float64
+    return np.empty(shape, dtype=dtype)
+
+
+def _first_valid(values: np.ndarray) -> int:
+    finite = np.flatnonzero(np.isfinite(values))
+    return int(finite[0]) if len(finite) else len(values)
+
+
+def _empty_windows(mask: np.ndarray, window: int) -> np.ndarray:
+    """
+    Janelas completas sem nenhuma posição verdadeira
+
+    A contagem acumulada é feita módulo 2⁸ (ou 2¹⁶): com a janela menor que
+    o módulo, a diferença é zero apenas se a contagem real for zero, e o
+    acumulado em inteiros curtos custa menos da metade do int64.
+    """
+    empty = np.zeros(mask.shape, dtype=bool)
+    if window <= len(mask):
+        dtype = np.uint8 if window < 2 ** 8 else np.uint16 if window < 2 ** 16 else np.int64
+        total = np.cumsum(mask, dtype=dtype)
+        empty[window - 1] = total[window - 1] == 0
+        np.equal(total[window:], total[:-window], out=empty[window:])
+    return empty
+
+
+def _check_smoothing(smoothing: str):
+    if smoothing not in SMOOTHING:
+        raise ValueError(f"Suavização desconhecida: {smoothing} (use {SMOOTHING})")
+
+
+def sma(values: ArrayLike, window: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Média móvel simples (NaN nas primeiras ``window - 1`` barras, como no pandas)"""
+    values = _array(values)
+    out = _output(out, values.shape, values)
+    return moving_average(values, window, out=out)
+
+
+def stddev(values: ArrayLike, window: int, ddof: int = 1,
+           out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Desvio padrão móvel (``ddof=1`` como no pandas, ``ddof=0`` como no talib)"""
+    values = _array(values)
+    out = _output(out, values.shape, values)
+    out[...] = rolling_std(values, [window], ddof=ddof)[:, 0]
+    return out
+
+
+def _ema_recursion(values: np.ndarray, alpha: float, initial: float) -> np.ndarray:
+    """
+    y[t] = alpha * x[t] + (1 - alpha) * y[t-1] a partir de ``initial`` (valor
+    anterior a ``values[0]``), com um ``lfilter`` por trecho sem NaN
+
+    NaN não interrompem a série: a saída repete o último valor e, na próxima
+    observação, o peso do valor anterior decai por todas as barras do
+    intervalo, como no pandas ``ewm(adjust=False)`` (``ignore_na=False``).
+    """
+    decay = 1.0 - alpha
+    missing = np.isnan(values)
+    if not missing.any():
+        return lfilter([alpha], [1.0, -decay], values, zi=[decay * initial])[0]
+
+    result = np.empty(len(values))
+    observed = np.flatnonzero(~missing)
+    breaks = np.flatnonzero(np.diff(observed) > 1) + 1
+    starts = observed[np.r_[0, breaks]] if len(observed) else observed
+    ends = observed[np.r_[breaks - 1, len(observed) - 1]] if len(observed) else observed
+
+    previous, last = initial, -1
+    for start, end in zip(starts, ends):
+        result[last + 1:start] = previous
+        weight = decay ** (start - last)
+        result[start] = (weight * previous + alpha * values[start]) / (weight + alpha)
+        if end > start:
+            result[start + 1:end + 1] = lfilter([alpha], [1.0, -decay], values[start + 1:end + 1],
+                                                zi=[decay * result[start]])[0]
+        previous, last = result[end], end
+    result[last + 1:] = previous
+    return result
+
+
+def ema(values: ArrayLike, window: Optional[int] = None, alpha: Optional[float] = None,
+        seed: str = 'sma', out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Média móvel exponencial y[t] = alpha * x[t] + (1 - alpha) * y[t-1]
+
+    A recursão roda como um filtro IIR (``scipy.signal.lfilter``) em float64,
+    sem laço em Python por barra.
+
+    Parameters:
+    -----------
+    values : array-like
+        Série 1-D; NaN iniciais são ignorados e NaN posteriores repetem o
+        último valor, com o peso do valor anterior decaindo pelo intervalo
+        (como no pandas ``ewm(adjust=False)``)
+    window : int, optional
+        Período (alpha = 2 / (window + 1)); obrigatório com ``seed='sma'``
+    alpha : float, optional
+        Fator de suavização explícito (ex.: 1 / window para Wilder)
+    seed : str
+        'sma': primeiro valor é a média das ``window`` primeiras barras
+        (talib); 'first': parte do primeiro valor (pandas ``adjust=False``)
+    out : np.ndarray, optional
+        Buffer de saída
+
+    Returns:
+    --------
+    np.ndarray
+    """
+    values = _array(values)
+    out = _output(out, values.shape, values)
+    if seed not in ('sma', 'first'):
+        raise ValueError(f"Semente desconhecida: {seed}")
+    if window is None and (alpha is None or seed == 'sma'):
+        raise ValueError("Informe window (obrigatório com seed='sma') ou alpha com seed='first'")
+    if alpha is None:
+        alpha = 2.0 / (window + 1)
+
+    out[...] = np.nan
+    first = _first_valid(values)
+    start = first + (window - 1 if seed == 'sma' else 0)
+    if start >= len(values):
+        return out
+    with np.errstate(invalid='ignore'):
+        initial = np.nanmean(values[first:start + 1], dtype=np.float64)
+    out[start] = initial
+
+    rest = values[start + 1:]
+    if len(rest):
+        out[start + 1:] = _ema_recursion(rest.astype(np.float64, copy=False), alpha, initial)
+    return out
+
+
+def _wilder_rows(rows: np.ndarray, window: int, start: int, out: np.ndarray) -> np.ndarray:
+    """
+    Wilder de várias séries alinhadas (linhas x barras) numa única chamada do
+    filtro; a semente é a média de ``rows[:, start:start + window]``. Pode
+    escrever sobre a própria entrada (``out`` igual a ``rows``).
+    """
+    n = rows.shape[1]
+    seed = start + window - 1
+    if seed >= n:
+        out[...] = np.nan
+        return out
+    initial = rows[:, start:seed + 1].mean(axis=1, dtype=np.float64)
+    decay = 1.0 - 1.0 / window
+    filtered = None
+    if seed + 1 < n:
+        filtered = lfilter([1.0 / window], [1.0, -decay], rows[:, seed + 1:].astype(np.float64, copy=False),
+                           axis=1, zi=(decay * initial)[:, None])[0]
+    out[:, :seed] = np.nan
+    out[:, seed] = initial
+    if filtered is not None:
+        out[:, seed + 1:] = filtered
+    return out
+
+
+def wilder(values: ArrayLike, window: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Suavização de Wilder: EMA com alpha = 1 / window semeada pela média das
+    ``window`` primeiras barras válidas
+
+    Parameters:
+    -----------
+    values : array-like
+        Série 1-D ou matriz (séries x barras); linhas com o mesmo início
+        válido são suavizadas juntas numa única chamada do filtro
+    window : int
+        Período
+    out : np.ndarray, optional
+        Buffer de saída (pode ser a própria entrada)
+
+    Returns:
+    --------
+    np.ndarray
+    """
+    values = _array(values)
+    if values.ndim not in (1, 2):
+        raise ValueError("Entrada deve ter uma ou duas dimensões")
+    out = _output(out, values.shape, values)
+    rows = values if values.ndim == 2 else values[np.newaxis]
+    target = out if out.ndim == 2 else out[np.newaxis]
+
+    starts = np.array([_first_valid(row) for row in rows])
+    for start in np.unique(starts):
+        selected = np.flatnonzero(starts == start)
+        if len(selected) == len(rows):
+            _wilder_rows(rows, window, int(start), target)
+        else:
+            target[selected] = _wilder_rows(rows[selected], window, int(start),
+                                            np.empty((len(selected), rows.shape[1])))
+    return out
+
+
+def _smooth(values: np.ndarray, window: int, smoothing: str,
+            out: Optional[np.ndarray] = None) -> np.ndarray:
+    return wilder(values, window, out=out) if smoothing == 'wilder' else sma(values, window, out=out)
+
+
+def rsi(close: ArrayLike, window: int = 14, smoothing: str = 'wilder',
+        out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Relative Strength Index
+
+    Parameters:
+    -----------
+    close : array-like
+        Preços
+    window : int
+        Período
+    smoothing : str
+        'wilder': médias de Wilder dos ganhos e perdas, primeiro valor na
+        barra ``window`` (talib); 'simple': médias simples, com a primeira
+        variação igual a zero (versão pandas usada pelas estratégias)
+    out : np.ndarray, optional
+        Buffer de saída
+
+    Returns:
+    --------
+    np.ndarray
+        RSI entre 0 e 100; NaN quando ganhos e perdas são ambos zero
+    """
+    _check_smoothing(smoothing)
+    close = _array(close)
+    out = _output(out, close.shape, close)
+    delta = np.empty(close.shape)
+    delta[0] = np.nan if smoothing == 'wilder' else 0.0
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+
+    with np.errstate(invalid='ignore'):
+        if smoothing == 'wilder':
+            gains = wilder(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), window)
+            losses = wilder(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), window)
+        else:
+            # Média das perdas = média dos ganhos - variação líquida da janela / window
+            finite = np.isfinite(np.add.reduce(close))
+            if not finite:
+                delta[np.isnan(delta)] = 0.0
+            gains = sma(np.maximum(delta, 0.0), window)
+            losses = np.empty(close.shape)
+            losses[:window - 1] = np.nan
+            if window <= len(close):
+                if finite:
+                    # Com a primeira variação igual a zero, a soma das variações da
+                    # janela é close[t] - close[t - window] (sem soma acumulada)
+                    losses[window - 1] = close[window - 1] - close[0]
+                    np.subtract(close[window:], close[:-window], out=losses[window:])
+                else:
+                    net = np.cumsum(delta)
+                    losses[window - 1] = net[window - 1]
+                    np.subtract(net[window:], net[:-window], out=losses[window:])
+            losses /= -window
+            losses += gains
+            np.maximum(losses, 0.0, out=losses)
+            # Janelas sem nenhuma alta (ou queda) ficam exatamente em zero
+            gains[_empty_windows(delta > 0, window)] = 0.0
+            losses[_empty_windows(delta < 0, window)] = 0.0
+    # RSI = 100 - 100 / (1 + ganhos / perdas) = 100 * ganhos / (ganhos + perdas)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.add(gains, losses, out=losses)
+        np.divide(gains, losses, out=out)
+    out *= 100
+    return out
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+    """max(high - low, |high - close anterior|, |low - close anterior|); primeira barra: high - low"""
+    high, low, close = _array(high), _array(low), _array(close)
+    out = _output(out, high.shape, high, low, close)
+    np.subtract(high, low, out=out)
+    previous = close[:-1]
+    np.fmax(out[1:], np.abs(high[1:] - previous), out=out[1:])
+    np.fmax(out[1:], np.abs(low[1:] - previous), out=out[1:])
+    return out
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, window: int = 14,
+        smoothing: str = 'wilder', out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Average True Range
+
+    'wilder' descarta o true range da primeira barra (sem fechamento
+    anterior) e começa na barra ``window``, como o talib; 'simple' é a média
+    simples do true range, como ``TechnicalIndicators.atr``.
+    """
+    _check_smoothing(smoothing)
+    high, low, close = _array(high), _array(low), _array(close)
+    out = _output(out, high.shape, high, low, close)
+    tr = true_range(high, low, close, out=np.empty(high.shape))
+    if smoothing == 'wilder':
+        tr[0] = np.nan
+    return _smooth(tr, window, smoothing, out=out)
+
+
+def bollinger(values: ArrayLike, window: int = 20, num_std: float = 2.0, ddof: int = 1,
+              out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bandas de Bollinger
+
+    Returns:
+    --------
+    Tuple
+        (superior, média, inferior); com ``out`` de formato (3, barras) as
+        bandas são linhas desse buffer
+    """
+    values = _array(values)
+    out = _output(out, (3,) + values.shape, values)
+    upper, middle, lower = out
+    mean, std = rolling_mean_std(values, [window], ddof=ddof)
+    middle[...] = mean[:, 0]
+    np.multiply(std[:, 0], num_std, out=upper)
+    np.subtract(middle, upper, out=lower)
+    upper += middle
+    return upper, middle, lower
+
+
+def macd(values: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9,
+         seed: str = 'first', out: Optional[np.ndarray] = None
+         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence
+
+    Returns:
+    --------
+    Tuple
+        (linha MACD, linha de sinal, histograma); com ``out`` de formato
+        (3, barras) as séries são linhas desse buffer
+    """
+    values = _array(values)
+    out = _output(out, (3,) + values.shape, values)
+    line, signal_line, histogram = out
+    ema(values, fast, seed=seed, out=line)
+    ema(values, slow, seed=seed, out=histogram)
+    line -= histogram
+    ema(line, signal, seed=seed, out=signal_line)
+    np.subtract(line, signal_line, out=histogram)
+    return line, signal_line, histogram
+
+
+DIRECTIONAL_FIELDS = ('adx', 'plus_di', 'minus_di', 'atr', 'true_range')
+
+
+def _directional(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int,
+                 result: np.ndarray, plus_di: np.ndarray, minus_di: np.ndarray,
+                 average_tr: np.ndarray, tr: np.ndarray):
+    """
+    Núcleo do sistema direcional: uma matriz de trabalho (3 x barras) com
+    [TR, +DM, -DM], suavizada por Wilder numa única chamada do filtro e
+    reaproveitada para o DX; as saídas são escritas nos buffers recebidos.
+    """
+    n = len(high)
+    work = np.empty((3, n))
+    true_range(high, low, close, out=work[0])
+    tr[...] = work[0]
+
+    # +DM: alta da máxima quando maior que a queda da mínima e positiva; -DM: caso oposto
+    up, down = work[1], work[2]
+    np.subtract(high[1:], high[:-1], out=up[1:])
+    np.subtract(low[:-1], low[1:], out=down[1:])
+    with np.errstate(invalid='ignore'):
+        plus_move = (up[1:] > down[1:]) & (up[1:] > 0)
+        minus_move = (down[1:] > up[1:]) & (down[1:] > 0)
+    np.copyto(up[1:], 0.0, where=~plus_move)
+    np.copyto(down[1:], 0.0, where=~minus_move)
+    work[:, 0] = np.nan  # primeira barra sem barra anterior (como no talib)
+
+    _wilder_rows(work, window, 1, work)
+    average_tr[...] = work[0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.divide(work[1], work[0], out=plus_di)
+        np.divide(work[2], work[0], out=minus_di)
+        plus_di *= 100
+        minus_di *= 100
+        # TR suavizado zero (série sem variação): sem direção
+        flat = work[0] == 0
+        plus_di[flat] = 0.0
+        minus_di[flat] = 0.0
+
+        # DX = 100 * |+DI - -DI| / (+DI + -DI), zero quando não há movimento direcional
+        dx, total = work[1], work[2]
+        np.add(plus_di, minus_di, out=total)
+        np.subtract(plus_di, minus_di, out=dx)
+        np.abs(dx, out=dx)
+        np.divide(dx, total, out=dx)
+        dx *= 100
+        dx[total == 0] = 0.0
+    wilder(dx, window, out=result)
+
+
+def directional_movement(high: ArrayLike, low: ArrayLike, close: ArrayLike, window: int = 14,
+                         out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, ...]:
+    """
+    Sistema direcional de Wilder completo em uma passada: TR, ATR, +DI, -DI e ADX
+
+    TR, +DM e -DM são montados numa única matriz de trabalho e suavizados
+    juntos; não há DataFrames nem séries intermediárias. O ATR é o mesmo de
+    ``atr(..., smoothing='wilder')`` e o ADX começa na barra ``2 * window - 1``.
+
+    Parameters:
+    -----------
+    high, low, close : array-like
+        Máximas, mínimas e fechamentos
+    window : int
+        Período
+    out : np.ndarray, optional
+        Buffer de formato (5, barras), linhas na ordem de ``DIRECTIONAL_FIELDS``
+
+    Returns:
+    --------
+    Tuple
+        (ADX, +DI, -DI, ATR, true range)
+    """
+    high, low, close = _array(high), _array(low), _array(close)
+    out = _output(out, (len(DIRECTIONAL_FIELDS),) + high.shape, high, low, close)
+    _directional(high, low, close, window, *out)
+    return tuple(out)
+
+
+def adx(high: ArrayLike, low: ArrayLike, close: ArrayLike, window: int = 14,
+        out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Average Directional Index de Wilder (ver ``directional_movement``)
+
+    Returns:
+    --------
+    Tuple
+        (ADX, +DI, -DI); com ``out`` de formato (3, barras) as séries são
+        linhas desse buffer
+    """
+    high, low, close = _array(high), _array(low), _array(close)
+    out = _output(out, (3,) + high.shape, high, low, close)
+    scratch = np.empty((2,) + high.shape)
+    _directional(high, low, close, window, out[0], out[1], out[2], scratch[0], scratch[1])
+    return out[0], out[1], out[2]
+
+
+# Implementações em pandas que os kernels substituíram (referência do benchmark)
+def _pandas_rsi(close: pd.Series, window: int = 14) -> pd.Series:
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+def _pandas_atr(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
+    tr = pd.concat([high - low, (high - close.shift()).abs(),
+                    (low - close.shift()).abs()], axis=1).max(axis=1)
+    return tr.rolling(window=window).mean()
+
+
+def _pandas_adx(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14):
+    plus_dm = high.diff()
+    minus_dm = low.diff()
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm > 0] = 0
+    tr = _pandas_atr(high, low, close, window)
+    plus_di = 100 * (plus_dm.rolling(window).mean() / tr)
+    minus_di = 100 * (minus_dm.rolling(window).mean() / tr)
+    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    return dx.rolling(window).mean(), plus_di, minus_di
+
+
+def _pandas_bollinger(close: pd.Series, window: int = 20, num_std: float = 2.0):
+    middle = close.rolling(window=window).mean()
+    std = close.rolling(window=window).std()
+    return middle + std * num_std, middle, middle - std * num_std
+
+
+def _pandas_macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    signal_line = line.ewm(span=signal, adjust=False).mean()
+    return line, signal_line, line - signal_line
+
+
+def benchmark_indicators(n_bars: int = 1_000_000, repeats: int = 3,
+                         dtype=np.float64, seed: int = 0) -> pd.DataFrame:
+    """
+    Compara os kernels com as implementações em pandas que eles substituíram
+
+    Parameters:
+    -----------
+    n_bars : int
+        Tamanho da série sintética
+    repeats : int
+        Repetições (vale o menor tempo)
+    dtype : np.dtype
+        Tipo das entradas dos kernels (float32 ou float64)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Por indicador: numpy_ms, pandas_ms, speedup, memória alocada no pico
+        (numpy_peak_mb, pandas_peak_mb) e a maior diferença absoluta entre as
+        saídas (NaN quando as definições diferem)
+    """
+    rng = np.random.default_rng(seed)
+    close = 5000 + np.cumsum(rng.normal(0, 2, n_bars))
+    high = close + rng.random(n_bars)
+    low = close - rng.random(n_bars)
+    series = {name: pd.Series(values) for name, values in
+              (('close', close), ('high', high), ('low', low))}
+    arrays = {name: values.astype(dtype) for name, values in
+              (('close', close), ('high', high), ('low', low))}
+    buffer = np.empty(n_bars, dtype=dtype)
+    bands = np.empty((3, n_bars), dtype=dtype)
+    directional = np.empty((len(DIRECTIONAL_FIELDS), n_bars), dtype=dtype)
+
+    cases: Dict[str, Tuple[Callable, Callable]] = {
+        'sma': (lambda: sma(arrays['close'], 20, out=buffer),
+                lambda: series['close'].rolling(20).mean()),
+        'ema': (lambda: ema(arrays['close'], 20, seed='first', out=buffer),
+                lambda: series['close'].ewm(span=20, adjust=False).mean()),
+        'rsi': (lambda: rsi(arrays['close'], 14, smoothing='simple', out=buffer),
+                lambda: _pandas_rsi(series['close'])),
+        'atr': (lambda: atr(arrays['high'], arrays['low'], arrays['close'], 14,
+                            smoothing='simple', out=buffer),
+                lambda: _pandas_atr(series['high'], series['low'], series['close'])),
+        'bollinger': (lambda: bollinger(arrays['close'], out=bands),
+                      lambda: _pandas_bollinger(series['close'])),
+        'macd': (lambda: macd(arrays['close'], out=bands),
+                 lambda: _pandas_macd(series['close'])),
+        'adx': (lambda: directional_movement(arrays['high'], arrays['low'], arrays['close'],
+                                             14, out=directional)[:3],
+                lambda: _pandas_adx(series['high'], series['low'], series['close'])),
+    }
+    # A versão pandas do ADX somava médias simples e -DM negativo: tempos comparáveis, valores não
+    comparable = {name: name != 'adx' for name in cases}
+
+    def best(function: Callable) -> Tuple[float, float, object]:
+        elapsed = []
+        for _ in range(repeats):
+            begin = time.perf_counter()
+            result = function()
+            elapsed.append(time.perf_counter() - begin)
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return min(elapsed) * 1e3, peak / 2 ** 20, result
+
+    rows = []
+    for name, (kernel, reference) in cases.items():
+        numpy_ms, numpy_mb, result = best(kernel)
+        pandas_ms, pandas_mb, expected = best(reference)
+        result = np.atleast_2d(np.asarray(result, dtype=np.float64))
+        expected = np.atleast_2d(np.asarray(expected, dtype=np.float64))
+        rows.append({
+            'indicator': name,
+            'numpy_ms': numpy_ms,
+            'pandas_ms': pandas_ms,
+            'speedup': pandas_ms / numpy_ms,
+            'numpy_peak_mb': numpy_mb,
+            'pandas_peak_mb': pandas_mb,
+            'max_abs_diff': (float(np.nanmax(np.abs(result - expected)))
+                             if comparable[name] else np.nan)
+        })
+    return pd.DataFrame(rows).set_index('indicator')
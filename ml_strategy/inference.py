@@ -0,0 +1,419 @@
+import json
+import os
+import time
+import numpy as np
+import lightgbm as lgb
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+K_ZERO_THRESHOLD = 1e-35  # Mesmo limite do LightGBM para "zero" em missing_type='Zero'
+
+
+class _FlatTrees(ABC):
+    """
+    Árvores achatadas em arrays planos e percorridas com NumPy
+
+    Os nós de todas as árvores ficam em um único conjunto de arrays
+    (feature, limiar, filhos, valor) e são percorridos simultaneamente com
+    operações vetorizadas: cada passo avança todas as árvores um nível.
+    Folhas apontam para si mesmas, de modo que o laço roda um número fixo de
+    passos (profundidade máxima) sem ramificações. Os arrays podem ser
+    salvos em ``.npy`` e carregados com memory-map, compartilhando as
+    páginas entre processos.
+    """
+
+    _ARRAYS = ('feature', 'threshold', 'children', 'value', 'default_left',
+               'nan_missing', 'zero_missing', 'roots')
+    _META = ('n_classes', 'n_features', 'feature_names', 'max_depth', 'has_zero_missing')
+
+    def __init__(self, n_threads: Optional[int] = None):
+        self.n_threads = n_threads
+        self._row_nodes = None
+
+    def _set_nodes(self, features, thresholds, children, values, default_left,
+                   nan_missing, zero_missing, roots, max_depth):
+        self.feature = np.array(features, dtype=np.intp)
+        self.threshold = np.array(thresholds, dtype=np.float64)
+        self.children = np.array(children, dtype=np.intp).ravel()  # [esquerda, direita] por nó
+        self.value = np.array(values, dtype=np.float64)
+        self.default_left = np.array(default_left, dtype=bool)
+        self.nan_missing = np.array(nan_missing, dtype=bool)
+        self.zero_missing = np.array(zero_missing, dtype=bool)
+        self.roots = np.array(roots, dtype=np.intp)
+        self.max_depth = max_depth
+        self.has_zero_missing = bool(self.zero_missing.any())
+        self._row_nodes = None
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _traverse(self, X: np.ndarray) -> np.ndarray:
+        """Índices das folhas (linhas x árvores) para uma matriz float64"""
+        n_rows = X.shape[0]
+        node = np.broadcast_to(self.roots, (n_rows, self.n_trees)).copy()
+        rows = np.arange(n_rows)[:, None]
+        general = self.has_zero_missing or np.isnan(X).any()
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            if general:
+                # Regras de valores ausentes do LightGBM (NumericalDecision)
+                is_nan = np.isnan(x)
+                x = np.where(is_nan & ~self.nan_missing[node], 0.0, x)
+                use_default = (is_nan & self.nan_missing[node]) | (
+                    self.zero_missing[node] & (np.abs(x) <= K_ZERO_THRESHOLD)
+                )
+                go_right = np.where(use_default, ~self.default_left[node],
+                                    ~(x <= self.threshold[node]))
+            else:
+                go_right = ~(x <= self.threshold[node])
+            node = self.children[2 * node + go_right]
+        return node
+
+    def _row_arrays(self):
+        """
+        Arrays do caminho de uma única barra, montados na primeira chamada
+
+        Os pares (feature, limiar) distintos são poucos (os limiares do
+        LightGBM vêm dos bins de cada feature); cada nó guarda o índice do
+        seu par, e a decisão de todos os pares é calculada uma vez por
+        barra. O estado do percurso é a posição de filho (``2 * pai +
+        lado``): cada posição guarda o par do nó para o qual aponta e a
+        posição do filho esquerdo dele. Folhas usam um par que nunca vai à
+        direita e apontam para si mesmas.
+        """
+        if self._row_nodes is None:
+            leaf = np.isinf(self.threshold)
+            keys = np.stack([np.where(leaf, -1, self.feature), np.where(leaf, 0.0, self.threshold)])
+            pairs, pair = np.unique(keys.T, axis=0, return_inverse=True)
+            pair = pair.ravel()
+            threshold = pairs[:, 1].copy()
+            threshold[pairs[:, 0] < 0] = np.inf
+            child = np.asarray(self.children)
+            self._row_nodes = (pairs[:, 0].astype(np.intp).clip(0), threshold,
+                               pair[child], 2 * child, child, pair[self.roots], 2 * self.roots)
+        return self._row_nodes
+
+    def _traverse_row(self, x: np.ndarray) -> np.ndarray:
+        """
+        Índices das folhas de uma única barra sem NaN (vetor float64)
+
+        Caminho dedicado da inferência ao vivo (ver ``_row_arrays``): uma
+        comparação por par (feature, limiar) distinto e, por nível, duas
+        indexações 1-D e uma soma sobre ``n_trees`` posições, sem a
+        indexação 2-D nem as regras de valores ausentes de ``_traverse``.
+        """
+        feature, threshold, pair, first, child, root_pair, root_first = self._row_arrays()
+        go_right = x[feature] > threshold
+        slot = root_first + go_right[root_pair]
+        for _ in range(self.max_depth - 1):
+            slot = first[slot] + go_right[pair[slot]]
+        return child[slot]
+
+    def _prepare(self, X: np.ndarray) -> np.ndarray:
+        """Matriz float64 usada nas comparações com os limiares"""
+        return np.asarray(X, dtype=np.float64)
+
+    @abstractmethod
+    def _probabilities(self, leaves: np.ndarray) -> np.ndarray:
+        """Probabilidades das classes a partir dos índices das folhas (linhas x árvores)"""
+
+    def predict_row(self, row: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Probabilidades das classes para uma única barra
+
+        Parameters:
+        -----------
+        row : np.ndarray
+            Vetor de features (float32 preferencialmente pré-alocado), na
+            ordem usada no treino
+        out : np.ndarray, optional
+            Buffer de saída com ``n_classes`` posições
+
+        Returns:
+        --------
+        np.ndarray
+            Probabilidades de cada classe
+        """
+        x = self._prepare(row)
+        if self.has_zero_missing or np.isnan(x).any():
+            leaves = self._traverse(x.reshape(1, -1))
+        else:
+            leaves = self._traverse_row(x)[None, :]
+        proba = self._probabilities(leaves)[0]
+        if out is None:
+            return proba
+        out[:] = proba
+        return out
+
+    def predict_batch(self, X: np.ndarray, block_size: int = 1024) -> np.ndarray:
+        """
+        Probabilidades para várias barras, em blocos distribuídos entre threads
+
+        As operações do NumPy liberam o GIL, então os blocos são processados
+        em paralelo por um ThreadPoolExecutor.
+        """
+        X = np.ascontiguousarray(self._prepare(X))
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Esperado (n, {self.n_features}), recebido {X.shape}")
+
+        starts = range(0, len(X), block_size)
+        out = np.empty((len(X), self.n_classes))
+
+        def run(start):
+            block = X[start:start + block_size]
+            out[start:start + len(block)] = self._probabilities(self._traverse(block))
+
+        if len(starts) <= 1 or self.n_threads == 1:
+            for start in starts:
+                run(start)
+        else:
+            with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+                list(executor.map(run, starts))
+        return out
+
+    def save(self, path: str):
+        """Salva os arrays em ``.npy`` (um arquivo por array) e os metadados em JSON"""
+        os.makedirs(path, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name), allow_pickle=False)
+        meta = {name: getattr(self, name) for name in self._META}
+        with open(os.path.join(path, 'trees.json'), 'w') as f:
+            json.dump({'kind': type(self).__name__, **meta}, f, default=_json_default)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, n_threads: Optional[int] = None):
+        """
+        Carrega arrays salvos com ``save``
+
+        Com ``mmap=True`` os arrays são mapeados somente leitura: nada é
+        copiado na carga e processos que abrem o mesmo arquivo compartilham
+        as páginas do sistema operacional.
+        """
+        with open(os.path.join(path, 'trees.json')) as f:
+            meta = json.load(f)
+        if meta.pop('kind') != cls.__name__:
+            raise ValueError(f"Arquivos em {path} não são de um {cls.__name__}")
+
+        trees = cls.__new__(cls)
+        _FlatTrees.__init__(trees, n_threads)
+        for name in cls._ARRAYS:
+            setattr(trees, name, np.load(os.path.join(path, f'{name}.npy'),
+                                         mmap_mode='r' if mmap else None, allow_pickle=False))
+        for name in cls._META:
+            value = meta[name]
+            setattr(trees, name, np.asarray(value) if isinstance(value, list) and name != 'feature_names'
+                    else value)
+        return trees
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo não serializável: {type(value)}")
+
+
+class CompiledEnsemble(_FlatTrees):
+    """
+    Ensemble de boosters LightGBM compilado em arrays planos para inferência
+
+    As árvores de todos os folds são percorridas juntas (ver ``_FlatTrees``).
+    As probabilidades seguem ``MLModel.predict``: softmax por booster e média
+    entre boosters.
+    """
+
+    _ARRAYS = _FlatTrees._ARRAYS + ('group_matrix',)
+    _META = _FlatTrees._META + ('n_boosters',)
+
+    def __init__(self, boosters: List[lgb.Booster], n_threads: Optional[int] = None):
+        """
+        Parameters:
+        -----------
+        boosters : List[lgb.Booster]
+            Boosters do ensemble (``MLModel.model``); cada um usa sua melhor iteração
+        n_threads : int, optional
+            Threads do modo em lote (padrão: número de núcleos)
+        """
+        if not boosters:
+            raise ValueError("Ensemble vazio")
+
+        super().__init__(n_threads)
+        self._compile(boosters)
+
+    def _compile(self, boosters: List[lgb.Booster]):
+        features, thresholds, children, values = [], [], [], []
+        default_left, nan_missing, zero_missing = [], [], []
+        roots, groups = [], []
+        max_depth = 0
+
+        models = [
+            booster.dump_model(num_iteration=booster.best_iteration if booster.best_iteration > 0 else None)
+            for booster in boosters
+        ]
+        self.n_classes = models[0]['num_class']
+        self.n_features = models[0]['max_feature_idx'] + 1
+        self.feature_names = models[0]['feature_names']
+        self.n_boosters = len(boosters)
+
+        for booster_id, model in enumerate(models):
+            if model['max_feature_idx'] + 1 != self.n_features or model['num_class'] != self.n_classes:
+                raise ValueError("Boosters com formatos diferentes")
+            per_iteration = model['num_tree_per_iteration']
+
+            for tree in model['tree_info']:
+                if tree.get('num_cat', 0):
+                    raise NotImplementedError("Splits categóricos não são suportados")
+                roots.append(len(features))
+                groups.append(booster_id * self.n_classes + tree['tree_index'] % per_iteration)
+
+                # Percurso em pré-ordem; filhos são preenchidos depois de numerados
+                stack = [(tree['tree_structure'], None, 0, 1)]
+                while stack:
+                    node, parent_slot, side, depth = stack.pop()
+                    index = len(features)
+                    if parent_slot is not None:
+                        children[parent_slot][side] = index
+                    max_depth = max(max_depth, depth)
+
+                    if 'leaf_value' in node:
+                        features.append(0)
+                        thresholds.append(np.inf)
+                        children.append([index, index])
+                        values.append(node['leaf_value'])
+                        default_left.append(True)
+                        nan_missing.append(False)
+                        zero_missing.append(False)
+                        continue
+
+                    if node['decision_type'] != '<=':
+                        raise NotImplementedError(f"Decisão não suportada: {node['decision_type']}")
+                    features.append(node['split_feature'])
+                    thresholds.append(node['threshold'])
+                    children.append([-1, -1])
+                    values.append(0.0)
+                    default_left.append(node['default_left'])
+                    nan_missing.append(node['missing_type'] == 'NaN')
+                    zero_missing.append(node['missing_type'] == 'Zero')
+                    stack.append((node['right_child'], index, 1, depth + 1))
+                    stack.append((node['left_child'], index, 0, depth + 1))
+
+        self._set_nodes(features, thresholds, children, values, default_left,
+                        nan_missing, zero_missing, roots, max_depth)
+
+        # Soma das folhas por (booster, classe) como produto matricial
+        n_groups = self.n_boosters * self.n_classes
+        self.group_matrix = np.zeros((len(roots), n_groups))
+        self.group_matrix[np.arange(len(roots)), groups] = 1.0
+
+    def _probabilities(self, leaves: np.ndarray) -> np.ndarray:
+        raw = (self.value[leaves] @ self.group_matrix).reshape(-1, self.n_boosters, self.n_classes)
+        raw -= raw.max(axis=2, keepdims=True)
+        np.exp(raw, out=raw)
+        raw /= raw.sum(axis=2, keepdims=True)
+        return raw.mean(axis=1)
+
+    def predict_signal(self, row: np.ndarray) -> int:
+        """Sinal (-1, 0, 1) da classe mais provável, como em ``MLModel.predict``"""
+        return int(np.argmax(self.predict_row(row))) - 1
+
+
+class CompiledForest(_FlatTrees):
+    """
+    Floresta de árvores de decisão do scikit-learn em arrays planos
+
+    Reproduz ``predict_proba`` de um RandomForestClassifier: cada árvore
+    devolve a distribuição de classes da folha e o resultado é a média entre
+    as árvores. Como no scikit-learn, as features são convertidas para
+    float32 antes das comparações e NaN segue ``missing_go_to_left``.
+    """
+
+    _ARRAYS = _FlatTrees._ARRAYS + ('classes_',)
+
+    def __init__(self, forest, n_threads: Optional[int] = None):
+        """
+        Parameters:
+        -----------
+        forest : RandomForestClassifier (ou ensemble com ``estimators_``)
+            Floresta já treinada
+        n_threads : int, optional
+            Threads do modo em lote (padrão: número de núcleos)
+        """
+        super().__init__(n_threads)
+        self.classes_ = np.asarray(forest.classes_)
+        self.n_classes = len(self.classes_)
+        self.n_features = int(forest.n_features_in_)
+        names = getattr(forest, 'feature_names_in_', None)
+        self.feature_names = None if names is None else [str(name) for name in names]
+
+        features, thresholds, children, values = [], [], [], []
+        default_left, roots = [], []
+        max_depth, offset = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = tree.__getstate__()['nodes']
+            leaf = nodes['left_child'] < 0
+            local = np.arange(tree.node_count)
+
+            roots.append(offset)
+            features.append(np.where(leaf, 0, nodes['feature']))
+            thresholds.append(np.where(leaf, np.inf, nodes['threshold']))
+            children.append(np.stack([
+                np.where(leaf, local, nodes['left_child']),
+                np.where(leaf, local, nodes['right_child'])
+            ], axis=1) + offset)
+            proba = tree.value[:, 0, :]
+            values.append(proba / proba.sum(axis=1, keepdims=True))
+            default_left.append(nodes['missing_go_to_left'].astype(bool))
+            max_depth = max(max_depth, tree.max_depth + 1)
+            offset += tree.node_count
+
+        n_nodes = offset
+        self._set_nodes(
+            np.concatenate(features), np.concatenate(thresholds), np.concatenate(children),
+            np.concatenate(values), np.concatenate(default_left),
+            np.ones(n_nodes, dtype=bool), np.zeros(n_nodes, dtype=bool), roots, max_depth
+        )
+
+    def _prepare(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(X, dtype=np.float32).astype(np.float64)
+
+    def _probabilities(self, leaves: np.ndarray) -> np.ndarray:
+        return self.value[leaves].mean(axis=1)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Classes previstas, como ``RandomForestClassifier.predict``"""
+        return self.classes_[np.argmax(self.predict_batch(X), axis=1)]
+
+
+def benchmark_latency(ensemble: _FlatTrees, X: np.ndarray,
+                      n_runs: int = 1000, warmup: int = 50) -> Dict[str, float]:
+    """
+    Latência de ``predict_row`` em microssegundos (p50, p99, média, máximo)
+
+    As linhas são copiadas para um buffer float32 pré-alocado antes de cada
+    chamada, como num loop de execução ao vivo.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    row = np.empty(X.shape[1], dtype=np.float32)
+    out = np.empty(ensemble.n_classes)
+    timings = np.empty(n_runs)
+
+    for i in range(warmup + n_runs):
+        row[:] = X[i % len(X)]
+        start = time.perf_counter()
+        ensemble.predict_row(row, out)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            timings[i - warmup] = elapsed
+
+    timings *= 1e6
+    return {
+        'p50_us': float(np.percentile(timings, 50)),
+        'p99_us': float(np.percentile(timings, 99)),
+        'mean_us': float(timings.mean()),
+        'max_us': float(timings.max())
+    }
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Union
+from .rolling import rolling_std
+
+# Classes no formato do LightGBM: 0 = PUT (baixa), 1 = neutro, 2 = CALL (alta)
+PUT, NEUTRAL, CALL = 0, 1, 2
+
+Barrier = Union[float, np.ndarray, pd.Series]
+
+
+def forward_returns(close: pd.Series, horizons: Sequence[int]) -> np.ndarray:
+    """
+    Retornos futuros close[t+h] / close[t] - 1 de vários horizontes
+
+    Returns:
+    --------
+    np.ndarray
+        Formato (barras, horizontes), NaN onde t+h passa do fim da série
+    """
+    values = np.asarray(close, dtype=np.float64)
+    out = np.full((len(horizons), len(values)), np.nan)
+    for j, horizon in enumerate(horizons):
+        if 0 < horizon < len(values):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                np.divide(values[horizon:], values[:-horizon], out=out[j, :-horizon])
+            out[j, :-horizon] -= 1
+    return out.T
+
+
+def volatility_thresholds(close: pd.Series, horizons: Sequence[int], window: int = 60,
+                          multiplier: float = 1.0) -> np.ndarray:
+    """
+    Limiares proporcionais à volatilidade: multiplier * std(retornos, window) * sqrt(h)
+
+    Returns:
+    --------
+    np.ndarray
+        Formato (barras, horizontes)
+    """
+    values = np.asarray(close, dtype=np.float64)
+    returns = np.full(len(values), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns[1:] = values[1:] / values[:-1] - 1
+    volatility = rolling_std(returns, [window])[:, 0]
+    return multiplier * volatility[:, None] * np.sqrt(np.asarray(horizons, dtype=np.float64))
+
+
+def horizon_labels(close: pd.Series, horizons: Sequence[int] = (5,),
+                   threshold: Optional[float] = 0.0003,
+                   volatility_window: int = 60,
+                   volatility_multiplier: float = 1.0) -> pd.DataFrame:
+    """
+    Labels de retorno futuro para vários horizontes de uma vez
+
+    Parameters:
+    -----------
+    close : pd.Series
+        Preços de fechamento
+    horizons : Sequence[int]
+        Horizontes de previsão em barras
+    threshold : float, optional
+        Limiar fixo (simétrico) do retorno; None usa limiares proporcionais
+        à volatilidade (ver ``volatility_thresholds``)
+    volatility_window : int
+        Janela da volatilidade dos retornos quando ``threshold`` é None
+    volatility_multiplier : float
+        Multiplicador da volatilidade quando ``threshold`` é None
+
+    Returns:
+    --------
+    pd.DataFrame
+        Uma coluna ``label_<h>`` por horizonte (0 PUT, 1 neutro, 2 CALL);
+        barras sem retorno futuro ou sem volatilidade ficam neutras
+    """
+    returns = forward_returns(close, horizons)
+    if threshold is None:
+        limits = volatility_thresholds(close, horizons, volatility_window, volatility_multiplier)
+    else:
+        limits = np.full(returns.shape, threshold)
+
+    labels = np.full(returns.shape, NEUTRAL, dtype=np.int8)
+    with np.errstate(invalid='ignore'):
+        labels[returns > limits] = CALL
+        labels[returns < -limits] = PUT
+    return pd.DataFrame(labels, index=close.index,
+                        columns=[f'label_{horizon}' for horizon in horizons])
+
+
+def _barrier_array(barrier: Barrier, n: int) -> np.ndarray:
+    values = np.asarray(barrier, dtype=np.float64)
+    return np.broadcast_to(values, (n,)) if values.ndim == 0 else values
+
+
+def triple_barrier_labels(close: pd.Series, horizons: Sequence[int] = (5,),
+                          upper: Barrier = 0.0003, lower: Optional[Barrier] = None,
+                          chunk_size: int = 65536) -> pd.DataFrame:
+    """
+    Labels de barreira tripla: primeiro toque na barreira superior, inferior
+    ou de tempo
+
+    Para cada barra t o caminho close[t+1..t+H] / close[t] - 1 (H = maior
+    horizonte) é montado em blocos de ``chunk_size`` barras como uma matriz
+    (bloco x H) sobre uma visão deslizante dos preços. O primeiro toque em
+    cada barreira vem de um ``argmax`` por linha, e os horizontes menores são
+    derivados dos mesmos índices de toque, sem refazer o caminho. Se as duas
+    barreiras forem tocadas pela primeira vez na mesma barra, o label é
+    neutro.
+
+    Parameters:
+    -----------
+    close : pd.Series
+        Preços de fechamento
+    horizons : Sequence[int]
+        Barreiras de tempo em barras
+    upper : float or array-like
+        Retorno da barreira superior (escalar ou um valor por barra, ex.: de
+        ``volatility_thresholds``)
+    lower : float or array-like, optional
+        Retorno (positivo) da barreira inferior; padrão igual a ``upper``
+    chunk_size : int
+        Barras por bloco (limita a memória a chunk_size x H)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Colunas ``label_<h>`` (0 PUT, 1 neutro/tempo, 2 CALL) e ``touch_<h>``
+        (barras até o toque; h na barreira de tempo) para cada horizonte.
+        Perto do fim da série apenas as barras disponíveis são consideradas
+    """
+    values = np.asarray(close, dtype=np.float64)
+    n = len(values)
+    horizons = [int(h) for h in horizons]
+    max_horizon = max(horizons)
+    upper = _barrier_array(upper, n)
+    lower = upper if lower is None else _barrier_array(lower, n)
+
+    # Posição (1-based) do primeiro toque de cada barreira; max_horizon + 1 = sem toque
+    no_touch = max_horizon + 1
+    first_up = np.empty(n, dtype=np.int64)
+    first_down = np.empty(n, dtype=np.int64)
+
+    padded = np.concatenate([values, np.full(max_horizon, np.nan)])
+    paths = np.lib.stride_tricks.sliding_window_view(padded[1:], max_horizon)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            path = paths[start:stop] / values[start:stop, None] - 1
+            up = path >= upper[start:stop, None]
+            down = path <= -lower[start:stop, None]
+        first_up[start:stop] = np.where(up.any(axis=1), up.argmax(axis=1) + 1, no_touch)
+        first_down[start:stop] = np.where(down.any(axis=1), down.argmax(axis=1) + 1, no_touch)
+
+    columns = {}
+    for horizon in horizons:
+        up_hit = first_up <= horizon
+        down_hit = first_down <= horizon
+        labels = np.full(n, NEUTRAL, dtype=np.int8)
+        labels[up_hit & (first_up < first_down)] = CALL
+        labels[down_hit & (first_down < first_up)] = PUT
+        columns[f'label_{horizon}'] = labels
+        columns[f'touch_{horizon}'] = np.minimum(np.minimum(first_up, first_down), horizon)
+    return pd.DataFrame(columns, index=close.index)
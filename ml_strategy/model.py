@@ -1,59 +1,362 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 import lightgbm as lgb
-from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import ParameterGrid
 from sklearn.model_selection import TimeSeriesSplit
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 from sklearn.utils import class_weight
+from .inference import CompiledEnsemble
+
+PARAM_GRID = {
+    'learning_rate': [0.05, 0.1, 0.2],
+    'max_depth': [6, 8, 10],
+    'num_leaves': [64, 128, 256],
+    'min_child_samples': [10, 20, 30]
+}
+
+BASE_PARAMS = {
+    'objective': 'multiclass',
+    'num_class': 3,
+    'feature_fraction': 0.9,
+    'bagging_fraction': 0.9,
+    'metric': 'multi_logloss',
+    'verbosity': -1
+}
+
+
+def build_dataset(X, y, weight=None, reference: lgb.Dataset = None) -> lgb.Dataset:
+    """
+    Dataset do LightGBM binado uma única vez sobre a matriz de treino completa
+
+    Os folds são derivados com ``Dataset.subset``, que reaproveita os bins.
+    ``feature_pre_filter`` fica desligado para que candidatos com
+    ``min_child_samples`` diferentes possam usar o mesmo Dataset. Com
+    ``reference``, os limites dos bins são copiados de outro Dataset (ex.: a
+    mesma matriz sem os pesos de amostra).
+    """
+    dataset = lgb.Dataset(
+        np.asarray(X, dtype=np.float64),
+        label=np.asarray(y),
+        weight=None if weight is None else np.asarray(weight),
+        reference=reference,
+        params={'feature_pre_filter': False, 'verbosity': -1},
+        free_raw_data=False
+    )
+    return dataset.construct()
+
+
+def balanced_sample_weights(y: pd.Series) -> pd.Series:
+    """Pesos de amostra que equilibram as classes"""
+    classes = np.unique(y)
+    class_weights = class_weight.compute_class_weight(
+        class_weight='balanced',
+        classes=classes,
+        y=y
+    )
+    return y.map(dict(zip(classes, class_weights)))
+
+
+def scaler_state(scaler: StandardScaler):
+    """Estatísticas de um StandardScaler ajustado em formato JSON (None sem scaler)"""
+    if scaler is None:
+        return None
+    state = {'mean': scaler.mean_.tolist(), 'scale': scaler.scale_.tolist()}
+    if hasattr(scaler, 'feature_names_in_'):
+        state['features'] = [str(name) for name in scaler.feature_names_in_]
+    return state
+
+
+def restore_scaler(state) -> StandardScaler:
+    """StandardScaler pronto para ``transform`` a partir de ``scaler_state``"""
+    if state is None:
+        return None
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(state['mean'])
+    scaler.scale_ = np.asarray(state['scale'])
+    scaler.var_ = scaler.scale_ ** 2
+    scaler.n_features_in_ = len(scaler.mean_)
+    if 'features' in state:
+        scaler.feature_names_in_ = np.asarray(state['features'], dtype=object)
+    return scaler
+
+
+def time_decay_weights(index: pd.Index, half_life) -> np.ndarray:
+    """
+    Pesos com decaimento exponencial pela idade de cada barra
+
+    A barra mais recente tem peso 1 e o peso cai pela metade a cada
+    ``half_life``: número de barras (int) ou duração (ex.: '30D',
+    pd.Timedelta) quando o índice é temporal.
+    """
+    if isinstance(half_life, (int, float, np.integer, np.floating)):
+        age = np.arange(len(index) - 1, -1, -1, dtype=np.float64) / half_life
+    else:
+        index = pd.DatetimeIndex(index)
+        age = (index[-1] - index) / pd.Timedelta(half_life)
+        age = np.asarray(age, dtype=np.float64)
+    return np.power(0.5, age)
+
 
 class HyperparameterOptimizer:
-    def __init__(self, X, y):
+    def __init__(self, X, y, method: str = 'grid', n_splits: int = 5,
+                 sample_weight=None, param_grid=None, eta: int = 3, min_rows: int = 500,
+                 num_boost_round: int = 1000, early_stopping_rounds: int = 50,
+                 dataset: lgb.Dataset = None, n_jobs: int = -1):
+        """
+        Parameters:
+        -----------
+        method : str
+            'grid' (busca exaustiva na grade) ou 'halving' (successive halving
+            sobre linhas e rodadas de boosting, com early stopping)
+        n_splits : int
+            Folds do TimeSeriesSplit
+        sample_weight : array-like, optional
+            Pesos de amostra usados no modo 'halving'
+        param_grid : dict, optional
+            Espaço de busca (padrão: PARAM_GRID)
+        eta : int
+            Fator de redução de candidatos por rodada no modo 'halving'
+        min_rows : int
+            Mínimo de linhas de treino por fold nas rodadas iniciais (piso de
+            qualidade; o custo dessas rodadas vem dos folds e das rodadas de
+            boosting, que encolhem com o orçamento)
+        num_boost_round, early_stopping_rounds : int
+            Orçamento de boosting e paciência do early stopping da rodada
+            final; no modo 'halving' as rodadas anteriores usam a mesma
+            fração do orçamento para ambos
+        dataset : lgb.Dataset, optional
+            Dataset já binado de ``build_dataset`` (com os pesos do modo
+            'halving'); por padrão é construído a partir de X e y. O modo
+            'grid' reaproveita apenas os bins e treina sem pesos
+        n_jobs : int
+            Candidatos avaliados em paralelo no modo 'grid' (-1 = todos os
+            núcleos); as threads do LightGBM são divididas entre eles
+        """
         self.X = X
         self.y = y
+        self.method = method
+        self.n_splits = n_splits
+        self.sample_weight = sample_weight
+        self.param_grid = param_grid or PARAM_GRID
+        self.eta = eta
+        self.min_rows = min_rows
+        self.num_boost_round = num_boost_round
+        self.early_stopping_rounds = early_stopping_rounds
+        self.dataset = dataset
+        self.n_jobs = n_jobs
         self.best_params_ = None
+        self.best_models_ = None
+        self.results_ = None
 
     def optimize(self):
-        # Definir os hiperparâmetros a serem otimizados
-        param_grid = {
-            'learning_rate': [0.05, 0.1, 0.2],
-            'max_depth': [6, 8, 10],
-            'num_leaves': [64, 128, 256],
-            'min_child_samples': [10, 20, 30]
-        }
+        if self.method == 'halving':
+            return self._optimize_halving()
+        if self.method != 'grid':
+            raise ValueError(f"Método de busca desconhecido: {self.method}")
+
+        # Mesma configuração do LGBMClassifier padrão do GridSearchCV original (100
+        # árvores, sem pesos), pontuada por acurácia em cada fold do TimeSeriesSplit;
+        # do Dataset recebido (com pesos) só os bins são reaproveitados
+        X = np.asarray(self.X, dtype=np.float64)
+        y = np.asarray(self.y)
+        dataset = build_dataset(X, y, reference=self.dataset)
+        folds = list(TimeSeriesSplit(n_splits=self.n_splits).split(X))
+        candidates = list(ParameterGrid(self.param_grid))
 
-        # Definir a validação cruzada com split temporal
-        tscv = TimeSeriesSplit(n_splits=5)
+        n_cpus = os.cpu_count() or 1
+        n_workers = min(len(candidates), n_cpus if self.n_jobs < 0 else max(1, self.n_jobs))
+        params = {'objective': 'multiclass', 'num_class': 3, 'metric': 'multi_logloss',
+                  'verbosity': -1, 'num_threads': max(1, n_cpus // n_workers)}
 
-        # Criar o modelo GridSearchCV
-        model = lgb.LGBMClassifier(objective='multiclass', metric='multi_logloss')
-        grid_search = GridSearchCV(estimator=model, param_grid=param_grid, cv=tscv, scoring='accuracy', n_jobs=-1)
+        def evaluate(candidate):
+            # O treino do LightGBM libera o GIL: candidatos rodam em threads sobre o mesmo Dataset
+            accuracies = []
+            for train_idx, val_idx in folds:
+                model = lgb.train({**params, **candidate}, dataset.subset(train_idx),
+                                  num_boost_round=100)
+                proba = model.predict(X[val_idx], num_threads=params['num_threads'])
+                accuracies.append(np.mean(np.argmax(proba, axis=1) == y[val_idx]))
+            return np.mean(accuracies)
 
-        # Executar a otimização de hiperparâmetros
         print("Iniciando a otimização de hiperparâmetros...")
-        grid_search.fit(self.X, self.y)
+        if n_workers > 1:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                scores = list(executor.map(evaluate, candidates))
+        else:
+            scores = [evaluate(candidate) for candidate in candidates]
 
-        self.best_params_ = grid_search.best_params_
+        # Empates mantêm a ordem da grade
+        history = [{**candidate, 'accuracy': score} for candidate, score in zip(candidates, scores)]
+        self.best_params_ = candidates[int(np.argmax(scores))]
+        self.results_ = pd.DataFrame(history)
         print(f"Melhores hiperparâmetros: {self.best_params_}")
 
         return self.best_params_
 
+    def _optimize_halving(self):
+        """
+        Successive halving no mesmo espaço da busca em grade
+
+        Cada rodada treina os candidatos restantes nos folds temporais mais
+        recentes, usando as linhas mais recentes de cada treino, um teto de
+        rodadas de boosting e uma paciência de early stopping proporcionais
+        ao orçamento da rodada (fração 1/eta^k). O número de folds também
+        cresce com o orçamento: as rodadas iniciais usam só os últimos folds.
+        Só o melhor 1/eta segue. A rodada final usa todas as linhas, todos
+        os folds e o orçamento completo, com os mesmos parâmetros de treino
+        do MLModel, e os boosters do melhor candidato (na melhor iteração)
+        ficam em ``best_models_`` para reaproveitamento no ensemble.
+        """
+        X = np.asarray(self.X, dtype=np.float64)
+        y = np.asarray(self.y)
+        dataset = self.dataset
+        if dataset is None:
+            dataset = build_dataset(X, y, self.sample_weight)
+        folds = list(TimeSeriesSplit(n_splits=self.n_splits).split(X))
+
+        candidates = list(ParameterGrid(self.param_grid))
+        n_rungs = self._n_rungs(len(candidates), self.eta)
+        history = []
+
+        print("Iniciando a otimização de hiperparâmetros (successive halving)...")
+        for rung in range(n_rungs):
+            fraction = float(self.eta) ** (rung - n_rungs + 1)
+            rounds = max(1, int(self.num_boost_round * fraction))
+            patience = max(1, int(np.ceil(self.early_stopping_rounds * fraction)))
+            rung_folds = folds[-max(1, int(np.ceil(len(folds) * fraction))):]
+            final = rung == n_rungs - 1
+
+            scored = []
+            for params in candidates:
+                accuracies, losses, models = [], [], []
+                for train_idx, val_idx in rung_folds:
+                    n_rows = max(self.min_rows, int(len(train_idx) * fraction))
+                    train_idx = train_idx[-n_rows:]
+                    model = self._train_fold(params, dataset, train_idx, val_idx, rounds, patience)
+                    proba = model.predict(X[val_idx], num_iteration=model.best_iteration)
+                    accuracies.append(np.mean(np.argmax(proba, axis=1) == y[val_idx]))
+                    losses.append(model.best_score['valid_1']['multi_logloss'])
+                    if final:
+                        models.append(model)
+
+                score = (np.mean(accuracies), -np.mean(losses))
+                scored.append((score, params, models))
+                history.append({**params, 'rung': rung, 'rows_fraction': fraction,
+                                'n_folds': len(rung_folds), 'num_boost_round': rounds,
+                                'early_stopping_rounds': patience, 'accuracy': score[0],
+                                'multi_logloss': -score[1]})
+
+            # Ordenação estável: empates mantêm a ordem da grade
+            scored.sort(key=lambda item: item[0], reverse=True)
+            n_keep = max(1, int(np.ceil(len(scored) / self.eta)))
+            print(f"Rodada {rung + 1}/{n_rungs}: {len(scored)} candidatos, "
+                  f"{len(rung_folds)} folds, {fraction:.0%} das linhas, até {rounds} rodadas")
+            candidates = [params for _, params, _ in scored[:n_keep]]
+
+        _, self.best_params_, self.best_models_ = scored[0]
+        self.results_ = pd.DataFrame(history)
+        print(f"Melhores hiperparâmetros: {self.best_params_}")
+
+        return self.best_params_
+
+    @staticmethod
+    def _n_rungs(n_candidates: int, eta: int) -> int:
+        """
+        Rodadas do successive halving: 1 + maior k com eta^k <= candidatos
+
+        Calculado com inteiros; ``floor(log(n) / log(eta))`` em ponto
+        flutuante perde uma rodada em casos exatos como 243/3 ou 1000/10.
+        """
+        n_rungs, capacity = 1, eta
+        while capacity <= n_candidates:
+            n_rungs += 1
+            capacity *= eta
+        return n_rungs
+
+    def _train_fold(self, params, dataset, train_idx, val_idx, num_boost_round,
+                    early_stopping_rounds=None):
+        """Treina um booster com early stopping na validação do fold"""
+        if early_stopping_rounds is None:
+            early_stopping_rounds = self.early_stopping_rounds
+        train_dataset = dataset.subset(train_idx)
+        val_dataset = dataset.subset(val_idx)
+        return lgb.train(
+            params={**BASE_PARAMS, **params},
+            train_set=train_dataset,
+            valid_sets=[train_dataset, val_dataset],
+            num_boost_round=num_boost_round,
+            callbacks=[lgb.early_stopping(stopping_rounds=early_stopping_rounds, verbose=False)]
+        )
+
+
 class MLModel:
     """Classe responsável pelo treinamento e predição"""
     
-    def __init__(self):
+    def __init__(self, search: str = 'halving', half_life=None):
+        """
+        Parameters:
+        -----------
+        search : str
+            Busca de hiperparâmetros: 'halving' (padrão, reaproveita os
+            boosters da busca) ou 'grid' (busca exaustiva + retreino dos folds)
+        half_life : int, str or pd.Timedelta, optional
+            Meia-vida dos pesos de amostra por idade (ver ``time_decay_weights``);
+            None desliga o decaimento
+        """
         self.model = None
-        self.scaler = StandardScaler()
+        # Árvores são invariantes a transformações monótonas: sem StandardScaler
+        self.scaler = None
+        self.search = search
+        self.half_life = half_life
+        self.best_params_ = None
+        self.feature_names_ = None
+        self.n_updates_ = 0
+        # Barras de treino atuais (X, y): base da janela deslizante de ``update``
+        self.window_ = None
+    
+    def _sample_weights(self, y: pd.Series) -> pd.Series:
+        """Pesos balanceados por classe, com decaimento temporal se configurado"""
+        weights = balanced_sample_weights(y)
+        if self.half_life is not None:
+            weights = weights * time_decay_weights(y.index, self.half_life)
+        return weights
 
     def train(self, X: pd.DataFrame, y: pd.Series):
         """Treina o modelo"""
-        print("Scaling features...")
-        X_scaled = self.scaler.fit_transform(X)
+        X_values = X.to_numpy(dtype=np.float64)
+        self.feature_names_ = list(X.columns)
+        self.n_updates_ = 0
+        self.window_ = (X, y)
+
+        print("Calculando pesos de classe...")
+        sample_weights = self._sample_weights(y)
+
+        # Features binadas uma única vez; busca e folds usam subconjuntos
+        print("Binning features...")
+        dataset = build_dataset(X_values, y, sample_weights)
 
         # Otimizar hiperparâmetros
-        optimizer = HyperparameterOptimizer(X_scaled, y)
+        optimizer = HyperparameterOptimizer(X_values, y, method=self.search,
+                                            sample_weight=sample_weights,
+                                            dataset=dataset)
         self.best_params_ = optimizer.optimize()
 
-        # Definir os parâmetros do LightGBM usando os melhores valores
+        if optimizer.best_models_ is not None:
+            # Boosters da rodada final da busca: mesmos folds, pesos e parâmetros do ensemble
+            print("\nReutilizando boosters da busca (melhor iteração de cada fold)")
+            self.model = optimizer.best_models_
+            print("\nTraining completed successfully.")
+            return
+
+        print("Setting up cross-validation...")
+        self.model = self._fit_folds(dataset, y)
+        print("\nTraining completed successfully.")
+    
+    def _fit_folds(self, dataset: lgb.Dataset, y: pd.Series, n_splits: int = 5) -> list:
+        """Treina um booster por fold do TimeSeriesSplit com os melhores hiperparâmetros"""
         params = {
             'objective': 'multiclass',
             'num_class': 3,
@@ -66,30 +369,16 @@ class MLModel:
             'metric': 'multi_logloss'
         }
 
-        print("Calculando pesos de classe...")
-        # Calcular pesos de classe
-        class_weights = class_weight.compute_class_weight(
-            class_weight='balanced',
-            classes=np.unique(y),
-            y=y
-        )
-        class_weight_dict = dict(zip(np.unique(y), class_weights))
-        sample_weights = y.map(class_weight_dict)
-
-        print("Setting up cross-validation...")
-        tscv = TimeSeriesSplit(n_splits=5)
+        tscv = TimeSeriesSplit(n_splits=n_splits)
         models = []
         
-        for fold, (train_idx, val_idx) in enumerate(tscv.split(X_scaled), 1):
-            print(f"\nTraining fold {fold}/5...")
-            X_train, X_val = X_scaled[train_idx], X_scaled[val_idx]
-            y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
-            sample_weights_train = sample_weights.iloc[train_idx]
-            sample_weights_val = sample_weights.iloc[val_idx]
+        for fold, (train_idx, val_idx) in enumerate(tscv.split(np.arange(len(y))), 1):
+            print(f"\nTraining fold {fold}/{n_splits}...")
+            y_train = y.iloc[train_idx]
             
-            # Criar datasets do LightGBM com pesos de amostra
-            train_dataset = lgb.Dataset(X_train, label=y_train, weight=sample_weights_train)
-            val_dataset = lgb.Dataset(X_val, label=y_val, weight=sample_weights_val, reference=train_dataset)
+            # Subconjuntos do Dataset binado (rótulos e pesos incluídos)
+            train_dataset = dataset.subset(train_idx)
+            val_dataset = dataset.subset(val_idx)
             
             # Treinar modelo
             model = lgb.train(
@@ -109,20 +398,21 @@ class MLModel:
         print("\nClass distribution in training data:")
         print(y_train.value_counts().sort_index())
         print("\nTraining model...")
-
-        self.model = models
-        print("\nTraining completed successfully.")
+        return models
     
     def predict(self, X: pd.DataFrame) -> pd.Series:
         """Faz predições utilizando o modelo treinado"""
         if self.model is None:
             raise ValueError("Model needs to be trained first")
                 
-        X_scaled = self.scaler.transform(X)
+        if self.scaler is not None:
+            X_values = self.scaler.transform(X)
+        else:
+            X_values = X.to_numpy(dtype=np.float64)
         predictions = np.zeros((len(X), 3))
         
         for model in self.model:
-            pred = model.predict(X_scaled)
+            pred = model.predict(X_values)
             predictions += pred
         predictions /= len(self.model)
         
@@ -145,54 +435,146 @@ class MLModel:
         
         return signals
     
-    def create_technical_features(self) -> pd.DataFrame:
-        df = pd.DataFrame(index=self.data.index)
+    def update(self, X: pd.DataFrame, y: pd.Series, num_boost_round: int = 100,
+               drop_oldest: bool = False):
+        """
+        Atualiza o ensemble com barras novas sem refazer a busca
         
-        close = self.data['Close']
+        Cada booster (truncado na melhor iteração) continua o boosting por
+        ``num_boost_round`` rodadas apenas sobre as barras novas, com os
+        mesmos hiperparâmetros e pesos balanceados (com decaimento temporal,
+        se configurado).
         
-        # Features básicas
-        df['returns'] = close.pct_change()
-        df['log_returns'] = np.log(close).diff()
+        Com ``drop_oldest``, a janela de treino desliza: as barras novas
+        substituem o mesmo número de barras mais antigas e os folds são
+        retreinados sobre a janela resultante (sem refazer a busca), com o
+        mesmo número de boosters do ensemble atual.
         
-        # Médias móveis em diferentes períodos
-        for window in [5, 10, 20, 50]:
-            df[f'sma_{window}'] = close.rolling(window=window).mean()
-            df[f'sma_dist_{window}'] = (close - df[f'sma_{window}']) / df[f'sma_{window}']
+        Parameters:
+        -----------
+        X, y : pd.DataFrame, pd.Series
+            Barras acrescentadas desde o último treino/atualização
+        num_boost_round : int
+            Árvores adicionadas a cada booster (sem ``drop_oldest``)
+        drop_oldest : bool
+            Descarta da janela de treino as barras mais antigas, tantas
+            quantas as novas, e retreina os folds sobre a janela
+        """
+        if self.model is None:
+            raise ValueError("Model needs to be trained first")
+        if self.feature_names_ is not None and list(X.columns) != self.feature_names_:
+            raise ValueError("Features diferentes das usadas no treino")
+        if drop_oldest and self.window_ is None:
+            raise ValueError("Janela de treino indisponível para descartar as barras antigas")
         
-        # Volatilidade
-        for window in [5, 15, 30]:
-            df[f'volatility_{window}'] = df['returns'].rolling(window=window).std()
+        if self.window_ is not None:
+            X_window = pd.concat([self.window_[0], X])
+            y_window = pd.concat([self.window_[1], y])
+            if drop_oldest:
+                X_window, y_window = X_window.iloc[len(X):], y_window.iloc[len(y):]
+            self.window_ = (X_window, y_window)
         
-        # Momentum
-        df['momentum_1d'] = close.pct_change(1)
-        df['momentum_5d'] = close.pct_change(5)
+        if drop_oldest:
+            # Mesmo número de boosters, todos treinados apenas dentro da janela
+            X_values = X_window.to_numpy(dtype=np.float64)
+            if self.scaler is not None:
+                X_values = self.scaler.transform(X_values)
+            dataset = build_dataset(X_values, y_window, self._sample_weights(y_window))
+            self.model = self._fit_folds(dataset, y_window, n_splits=len(self.model))
+            self.n_updates_ += 1
+            print("Update completed.")
+            return
         
-        # RSI
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss.replace(0, 1e-9)
-        df['rsi'] = 100 - (100 / (1 + rs))
+        X_values = X.to_numpy(dtype=np.float64)
+        if self.scaler is not None:
+            X_values = self.scaler.transform(X_values)
         
-        return df
-
-    def create_wdo_features(self) -> pd.DataFrame:
-        df = pd.DataFrame(index=self.data.index)
+        # Mesmos bins para todos os boosters
+        dataset = build_dataset(X_values, y, self._sample_weights(y))
+        params = {**BASE_PARAMS, **(self.best_params_ or {})}
+        
+        models = []
+        for i, booster in enumerate(self.model, 1):
+            print(f"Updating booster {i}/{len(self.model)}...")
+            models.append(lgb.train(
+                params=params,
+                train_set=dataset,
+                num_boost_round=num_boost_round,
+                init_model=self._truncate(booster)
+            ))
+        self.model = models
+        self.n_updates_ += 1
+        print("Update completed.")
+    
+    @staticmethod
+    def _truncate(booster: lgb.Booster) -> lgb.Booster:
+        """Booster com as árvores até a melhor iteração (as de paciência são descartadas)"""
+        if booster.best_iteration <= 0:
+            return booster
+        return lgb.Booster(model_str=booster.model_to_string(num_iteration=booster.best_iteration))
+    
+    def save(self, path: str):
+        """
+        Salva boosters, parâmetros e scaler em um diretório
         
-        # Padrões intraday
-        df['hour'] = self.data.index.hour
-        df['minute'] = self.data.index.minute
+        Os boosters são gravados no formato texto do LightGBM (já truncados
+        na melhor iteração), a janela de treino em ``window.npz`` e o
+        restante em ``model.json``.
+        """
+        if self.model is None:
+            raise ValueError("Model needs to be trained first")
+        os.makedirs(path, exist_ok=True)
         
-        # Volume patterns
-        df['volume_ma'] = self.data['Volume'].rolling(20).mean()
-        df['volume_ratio'] = self.data['Volume'] / df['volume_ma']
+        files = []
+        for i, booster in enumerate(self.model):
+            name = f'booster_{i}.txt'
+            self._truncate(booster).save_model(os.path.join(path, name))
+            files.append(name)
         
-        # Price patterns
-        df['range'] = self.data['High'] - self.data['Low']
-        df['range_ma'] = df['range'].rolling(20).mean()
+        state = {
+            'search': self.search,
+            'half_life': self.half_life if self.half_life is None or isinstance(self.half_life, (int, float))
+            else str(self.half_life),
+            'best_params': self.best_params_,
+            'feature_names': self.feature_names_,
+            'n_updates': self.n_updates_,
+            'boosters': files,
+            'window': None,
+            'scaler': scaler_state(self.scaler)
+        }
+        if self.window_ is not None:
+            X_window, y_window = self.window_
+            arrays = {'X': X_window.to_numpy(dtype=np.float64), 'y': y_window.to_numpy()}
+            if X_window.index.dtype.kind in 'iufM':
+                arrays['index'] = X_window.index.to_numpy()
+            np.savez(os.path.join(path, 'window.npz'), **arrays)
+            state['window'] = 'window.npz'
+        with open(os.path.join(path, 'model.json'), 'w') as f:
+            json.dump(state, f, indent=2, default=float)
+    
+    @classmethod
+    def load(cls, path: str) -> 'MLModel':
+        """Carrega um modelo salvo com ``save``"""
+        with open(os.path.join(path, 'model.json')) as f:
+            state = json.load(f)
         
-        # Momentum em diferentes timeframes
-        for window in [5, 15, 30, 60]:
-            df[f'return_{window}'] = self.data['Close'].pct_change(window)
-                
-        return df
\ No newline at end of file
+        model = cls(search=state['search'], half_life=state['half_life'])
+        model.best_params_ = state['best_params']
+        model.feature_names_ = state['feature_names']
+        model.n_updates_ = state['n_updates']
+        model.model = [lgb.Booster(model_file=os.path.join(path, name)) for name in state['boosters']]
+        model.scaler = restore_scaler(state['scaler'])
+        if state.get('window'):
+            with np.load(os.path.join(path, state['window']), allow_pickle=False) as stored:
+                index = stored['index'] if 'index' in stored.files else None
+                X_window = pd.DataFrame(stored['X'], columns=model.feature_names_, index=index)
+                model.window_ = (X_window, pd.Series(stored['y'], index=X_window.index))
+        return model
+    
+    def compile(self, n_threads: int = None) -> 'CompiledEnsemble':
+        """Compila o ensemble de folds para inferência de baixa latência (ver ml_strategy.inference)"""
+        if self.model is None:
+            raise ValueError("Model needs to be trained first")
+        if self.scaler is not None:
+            raise ValueError("Modelos com StandardScaler devem ser retreinados antes de compilar")
+        return CompiledEnsemble(self.model, n_threads=n_threads)
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 class RiskManager:
     def __init__(self, data: pd.DataFrame):
@@ -9,6 +9,16 @@ class RiskManager:
         self.max_trades_per_day = 5
         self.max_loss_per_trade = 0.02  # 2% por trade
         self.min_profit_target = 0.01    # 1% alvo mínimo
+        self.trading_hours = (9, 17)     # Horas (inclusivas) permitidas para operar
+        self._volatility_limit = None
+        self._accepted_trades: Dict = {}  # Trades aceitos por dia em validate_trade
+    
+    @property
+    def volatility_limit(self) -> float:
+        """Limite de volatilidade: 2x o desvio dos retornos do histórico (calculado uma vez)"""
+        if self._volatility_limit is None:
+            self._volatility_limit = self.data['Close'].pct_change().std() * 2
+        return self._volatility_limit
         
     def calculate_option_parameters(self, signal: int, current_price: float) -> Dict:
         """
@@ -27,13 +37,9 @@ class RiskManager:
         """
         if signal == 1:  # CALL - Expectativa de ALTA
             strike_price = self._calculate_call_strike(current_price)
-            stop_loss = current_price * 0.997  # Stop 0.3% abaixo
-            take_profit = current_price * 1.005  # Alvo 0.5% acima
-            
         else:  # PUT - Expectativa de BAIXA
             strike_price = self._calculate_put_strike(current_price)
-            stop_loss = current_price * 1.003  # Stop 0.3% acima
-            take_profit = current_price * 0.995  # Alvo 0.5% abaixo
+        stop_loss, take_profit = self._calculate_exit_levels(current_price, signal == 1)
             
         return {
             'option_type': 'CALL' if signal == 1 else 'PUT',
@@ -53,33 +59,125 @@ class RiskManager:
         """Calcula strike price ideal para PUT"""
         return np.floor(current_price / 5) * 5
     
+    def _calculate_exit_levels(self, current_price: float, call: bool) -> Tuple[float, float]:
+        """Stop loss e alvo (aceita arrays de preços e direções)"""
+        # CALL: stop 0.3% abaixo e alvo 0.5% acima; PUT: o inverso
+        stop_loss = current_price * np.where(call, 0.997, 1.003)
+        take_profit = current_price * np.where(call, 1.005, 0.995)
+        return stop_loss, take_profit
+    
     def _calculate_position_size(self, current_price: float) -> int:
-        """Calcula tamanho da posição baseado no risco"""
+        """Calcula tamanho da posição baseado no risco (aceita arrays de preços)"""
         account_value = 100000  # Exemplo - deve vir da configuração
         risk_per_trade = account_value * self.max_loss_per_trade
         contract_value = current_price * 10  # Cada ponto = R$ 10
         
-        return max(1, int(risk_per_trade / contract_value))
+        size = np.maximum(1, np.floor(risk_per_trade / contract_value)).astype(np.int64)
+        return size if size.ndim else int(size)
     
     def validate_trade(self, signal: int, current_price: float, 
-                      volatility: float) -> Tuple[bool, str]:
-        """Valida se o trade deve ser executado"""
-        hour = pd.Timestamp.now().hour
+                      volatility: float, timestamp: Optional[pd.Timestamp] = None) -> Tuple[bool, str]:
+        """
+        Valida se o trade deve ser executado (``timestamp`` padrão: agora)
+        
+        Trades aceitos são registrados e contam para o limite diário, como em
+        ``validate_trades``: chamadas barra a barra em ordem dão o mesmo
+        resultado que a validação vetorizada dos mesmos sinais.
+        """
+        timestamp = pd.Timestamp.now() if timestamp is None else timestamp
+        hour = timestamp.hour
         
         # Regras de validação
-        if hour < 9 or hour > 17:
+        if hour < self.trading_hours[0] or hour > self.trading_hours[1]:
             return False, "Fora do horário de trading"
             
-        if volatility > self.data['Close'].pct_change().std() * 2:
+        if volatility > self.volatility_limit:
             return False, "Volatilidade muito alta"
             
-        if self._count_daily_trades() >= self.max_trades_per_day:
+        if self._count_daily_trades(timestamp) >= self.max_trades_per_day:
             return False, "Limite diário de trades atingido"
-            
+        
+        day = timestamp.date()
+        self._accepted_trades[day] = self._accepted_trades.get(day, 0) + 1
         return True, "Trade válido"
     
-    def _count_daily_trades(self) -> int:
-        """Conta número de trades no dia"""
-        today = pd.Timestamp.now().date()
-        daily_trades = self.data[self.data.index.date == today]
-        return len(daily_trades[daily_trades['Volume'] > 0])
\ No newline at end of file
+    def validate_trades(self, signals: pd.Series, volatility: pd.Series) -> pd.DataFrame:
+        """
+        Valida todos os sinais de uma vez usando o horário de cada barra
+        
+        Aplica as mesmas regras de ``validate_trade`` (horário, volatilidade e
+        limite diário) com operações vetorizadas. O limite diário conta os
+        trades aceitos no dia da barra, na ordem das barras: um sinal só
+        ocupa vaga se passou pelas regras de horário e volatilidade.
+        
+        Parameters:
+        -----------
+        signals : pd.Series
+            Sinais (-1, 0, 1) indexados pelo horário das barras
+        volatility : pd.Series
+            Volatilidade de cada barra (alinhada aos sinais)
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Colunas 'valid' (bool) e 'reason' por barra; barras sem sinal são
+            marcadas como inválidas com motivo "Sem sinal"
+        """
+        index = pd.DatetimeIndex(signals.index)
+        has_signal = signals.to_numpy() != 0
+        hours = index.hour.to_numpy()
+        
+        outside_hours = (hours < self.trading_hours[0]) | (hours > self.trading_hours[1])
+        too_volatile = volatility.reindex(signals.index).to_numpy(dtype=np.float64) > self.volatility_limit
+        candidate = has_signal & ~outside_hours & ~too_volatile
+        
+        # Posição de cada candidato entre os candidatos do mesmo dia
+        days = index.normalize().to_numpy()
+        day_rank = pd.Series(candidate.astype(np.int64)).groupby(days).cumsum().to_numpy()
+        over_limit = candidate & (day_rank > self.max_trades_per_day)
+        
+        reason = np.select(
+            [~has_signal, outside_hours, too_volatile, over_limit],
+            ["Sem sinal", "Fora do horário de trading", "Volatilidade muito alta",
+             "Limite diário de trades atingido"],
+            default="Trade válido"
+        )
+        return pd.DataFrame({'valid': candidate & ~over_limit, 'reason': reason},
+                            index=signals.index)
+    
+    def option_parameters(self, signals: pd.Series, prices: pd.Series) -> pd.DataFrame:
+        """
+        Versão vetorizada de ``calculate_option_parameters``
+        
+        Parameters:
+        -----------
+        signals : pd.Series
+            1 para CALL, -1 para PUT (demais valores são ignorados)
+        prices : pd.Series
+            Preço de cada barra (alinhado aos sinais)
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Uma linha por sinal com option_type, strike_price, stop_loss,
+            take_profit e position_size
+        """
+        signals = signals[signals.isin([1, -1])]
+        price = prices.reindex(signals.index).to_numpy(dtype=np.float64)
+        call = signals.to_numpy() == 1
+        
+        # Mesmos auxiliares de ``calculate_option_parameters``, aplicados aos arrays
+        stop_loss, take_profit = self._calculate_exit_levels(price, call)
+        return pd.DataFrame({
+            'option_type': np.where(call, 'CALL', 'PUT'),
+            'strike_price': np.where(call, self._calculate_call_strike(price),
+                                     self._calculate_put_strike(price)),
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'position_size': self._calculate_position_size(price)
+        }, index=signals.index)
+    
+    def _count_daily_trades(self, timestamp: Optional[pd.Timestamp] = None) -> int:
+        """Conta os trades aceitos por ``validate_trade`` no dia"""
+        day = (pd.Timestamp.now() if timestamp is None else timestamp).date()
+        return self._accepted_trades.get(day, 0)
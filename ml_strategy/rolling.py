@@ -0,0 +1,349 @@
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+MIN_BLOCK = 256  # Barras por bloco das somas acumuladas (limita o erro de arredondamento)
+CHUNK_BARS = 16384  # Barras finalizadas por passada (buffers do trecho cabem no cache)
+
+
+def _window_sums(prefix: np.ndarray, window: int, shift: np.ndarray,
+                 squares: bool, missing: bool, out: np.ndarray):
+    """
+    Somas móveis de uma janela a partir das somas acumuladas por bloco
+
+    ``prefix`` tem formato (séries, blocos, barras por bloco) com as linhas
+    [soma, soma dos quadrados (opcional), NaN (opcional)] acumuladas dentro de cada bloco sobre
+    valores centralizados na média do próprio bloco. Com ``block >= window``
+    a janela termina no mesmo bloco em que começa ou no seguinte: no primeiro
+    caso a soma é P[fim] - P[início-1]; no segundo a parte do bloco anterior
+    (total - P[início-1]) é trazida para o centro do bloco atual com o
+    deslocamento ``shift`` = centro anterior - centro atual:
+
+        Σ(x - c) = Σ(x - c') + k·d
+        Σ(x - c)² = Σ(x - c')² + 2·d·Σ(x - c') + k·d²
+
+    onde k é o número de valores válidos daquela parte.
+    """
+    n_series, n_blocks, block = prefix.shape
+    flat = prefix.reshape(n_series, -1)
+    out[:, :window - 1] = np.nan
+    out[:, window - 1] = flat[:, window - 1]
+    np.subtract(flat[:, window:], flat[:, :-window], out=out[:, window:])
+    if n_blocks == 1:
+        return
+
+    # Janelas que começam no bloco anterior (primeiras ``window`` barras de cada bloco)
+    crossing = out.reshape(n_series, n_blocks, block)[:, 1:, :window]
+    carried = prefix[:, :-1, -1:] - prefix[:, :-1, block - window:]
+    count = np.arange(window - 1, -1, -1, dtype=np.float64)
+    if missing:
+        count = count - carried[-1]
+        crossing[-1] = prefix[-1, 1:, :window] + carried[-1]
+    d = shift[:, None]
+    if squares:
+        crossing[1] = prefix[1, 1:, :window] + carried[1] + 2 * d * carried[0] + count * d * d
+    crossing[0] = prefix[0, 1:, :window] + carried[0] + count * d
+
+
+def _rolling_moments(values: np.ndarray, windows: Sequence[int], ddof: Optional[int] = None,
+                     means: Optional[np.ndarray] = None, stds: Optional[np.ndarray] = None
+                     ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Médias e (com ``ddof``) desvios padrão móveis de todas as janelas
+
+    A série é dividida em blocos de ``MIN_BLOCK`` barras (ou da maior janela)
+    e cada bloco é centralizado na própria média antes da acumulação; o erro
+    de arredondamento das somas acumuladas fica limitado ao bloco e à
+    variação local dos valores, não ao tamanho ou ao nível da série.
+
+    Cada janela é finalizada em trechos de ``CHUNK_BARS`` barras: as somas do
+    trecho vão para um buffer pequeno reaproveitado (que permanece no cache)
+    e médias e desvios são escritos direto nas saídas, sem arrays
+    intermediários do tamanho de (janelas, barras).
+
+    Parameters:
+    -----------
+    means, stds : np.ndarray, optional
+        Saídas (janelas, barras); ``means`` None calcula as médias num
+        buffer temporário (só os desvios são devolvidos)
+
+    Returns:
+    --------
+    Tuple
+        (médias ou None, desvios ou None), formato (janelas, barras)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    windows = np.asarray(windows, dtype=np.intp)
+    if values.ndim != 1:
+        raise ValueError("A série deve ser unidimensional")
+    if len(windows) == 0 or (windows < 1).any():
+        raise ValueError("Janelas devem ser positivas")
+    squares = ddof is not None
+    n_total = len(values)
+    if means is None and not squares:
+        means = np.empty((len(windows), n_total))
+    if squares and stds is None:
+        stds = np.empty((len(windows), n_total))
+
+    # NaN iniciais (ex.: primeiro retorno) ficam fora dos blocos
+    finite = np.isfinite(values)
+    start = int(finite.argmax()) if finite.any() else n_total
+    values = values[start:]
+
+    n = len(values)
+    block = max(int(windows.max()), MIN_BLOCK)
+    n_blocks = max(-(-n // block), 1)
+    missing = not finite[start:].all()
+
+    # Linhas [soma, quadrados (opcional), NaN (opcional)] acumuladas no próprio buffer
+    prefix = np.empty((1 + squares + missing, n_blocks, block))
+    padded = prefix[0]
+    padded.reshape(-1)[:n] = values
+    if missing:
+        padded.reshape(-1)[n:] = np.nan
+        valid = np.isfinite(padded)
+        with np.errstate(invalid='ignore'):
+            counts = valid.sum(axis=1)
+            centers = np.where(counts > 0, np.where(valid, padded, 0.0).sum(axis=1) / np.maximum(counts, 1), 0.0)
+        padded -= centers[:, None]
+        padded[~valid] = 0.0
+        prefix[-1] = ~valid
+    else:
+        # Cauda completada com o último valor: as somas só acumulam para frente,
+        # então ela não afeta as janelas reais
+        padded.reshape(-1)[n:] = values[-1] if n else 0.0
+        centers = padded.mean(axis=1)
+        padded -= centers[:, None]
+    if squares:
+        np.multiply(padded, padded, out=prefix[1])
+    np.cumsum(prefix, axis=2, out=prefix)
+    shift = centers[:-1] - centers[1:]
+
+    # Mudanças de valor acumuladas: janelas sem mudança têm desvio exatamente zero
+    changes = _change_counts(values) if squares else None
+
+    per_chunk = max(CHUNK_BARS // block, 1)
+    sums = np.empty((len(prefix), (per_chunk + 1) * block))
+    scratch = np.empty(per_chunk * block) if means is None else None
+    constant = np.empty(per_chunk * block, dtype=bool) if squares else None
+    for j, window in enumerate(windows):
+        window = int(window)
+        if window > n:
+            for out in (means, stds):
+                if out is not None:
+                    out[j] = np.nan
+            continue
+        for out in (means, stds):
+            if out is not None:
+                out[j, :start] = np.nan
+
+        for b0 in range(0, n_blocks, per_chunk):
+            # O trecho inclui o bloco anterior, de onde vêm as janelas que cruzam a fronteira
+            b1 = min(b0 + per_chunk, n_blocks)
+            lo = max(b0 - 1, 0)
+            part = sums[:, :(b1 - lo) * block]
+            _window_sums(prefix[:, lo:b1], window, shift[lo:b1 - 1], squares, missing, part)
+            first, last = b0 * block, min(b1 * block, n)
+            chunk = part[:, (b0 - lo) * block:(b0 - lo) * block + last - first]
+
+            mean = scratch[:last - first] if means is None else means[j, start + first:start + last]
+            np.divide(chunk[0], window, out=mean)
+            if squares:
+                # Σ(x - média)² = Σx² - (Σx)²/n, nas coordenadas centralizadas
+                deviation = chunk[1]
+                np.multiply(chunk[0], mean, out=chunk[0])
+                deviation -= chunk[0]
+                deviation /= max(window - ddof, 1)
+                np.maximum(deviation, 0.0, out=deviation)
+                std = stds[j, start + first:start + last]
+                np.sqrt(deviation, out=std)
+                begin = max(first, window - 1)
+                if window > 1 and begin < last:
+                    # Sem mudança entre as barras [p - window + 1, p]
+                    flat = constant[:last - begin]
+                    np.equal(changes[begin + 1:last + 1], changes[begin - window + 2:last - window + 2], out=flat)
+                    np.copyto(std[begin - first:], 0.0, where=flat)
+            if means is not None:
+                # As somas estão centralizadas no centro do bloco da barra final da janela:
+                # o centro é somado bloco a bloco, sem um array de centros por barra
+                full = (last - first) // block
+                mean[:full * block].reshape(full, block)[...] += centers[b0:b0 + full, None]
+                if full * block < len(mean):
+                    mean[full * block:] += centers[b0 + full]
+            if missing:
+                # NaN na janela (o NaN inicial das somas também é != 0)
+                incomplete = chunk[-1] != 0
+                for out in (mean, std if squares else None):
+                    if out is not None:
+                        out[incomplete] = np.nan
+        if squares and window <= ddof:
+            stds[j] = np.nan
+    return means, stds
+
+
+def _change_counts(values: np.ndarray) -> np.ndarray:
+    """
+    Número acumulado de mudanças entre barras consecutivas
+
+    ``changes[p + 1]`` conta as mudanças até a barra ``p``; a janela que
+    termina em ``p`` não tem mudança se ``changes[p + 1] == changes[p - window + 2]``.
+    A contagem é exata (inteira): nessas janelas o desvio é exatamente zero,
+    como no pandas, em vez do resíduo de arredondamento das somas.
+    """
+    changes = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values[1:] != values[:-1], out=changes[2:])
+    return changes
+
+
+def rolling_mean(values: np.ndarray, windows: Sequence[int],
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Médias móveis de várias janelas a partir de uma única soma acumulada
+
+    A série é acumulada uma vez; cada janela adicional custa uma subtração
+    de vetores. Como no pandas (``min_periods`` igual à janela), janelas com
+    algum NaN resultam em NaN.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Série 1-D
+    windows : Sequence[int]
+        Tamanhos das janelas
+    out : np.ndarray, optional
+        Saída (barras, janelas); colunas contíguas (ex.: colunas de um array
+        em ordem Fortran) evitam escritas espaçadas
+
+    Returns:
+    --------
+    np.ndarray
+        Médias com formato (barras, janelas)
+    """
+    means, _ = _rolling_moments(values, windows, means=None if out is None else out.T)
+    return means.T
+
+
+def moving_average(values: np.ndarray, window: int,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Média móvel de uma única janela, escrita direto em ``out``
+
+    Mesmas somas acumuladas centralizadas por bloco de ``rolling_mean``, sem
+    os buffers por janela: cada bloco é centralizado e copiado numa única
+    passada, as somas das janelas vão direto para a saída e o centro é
+    somado por bloco. Séries com NaN ou infinitos usam ``rolling_mean``.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Série 1-D
+    window : int
+        Tamanho da janela
+    out : np.ndarray, optional
+        Buffer de saída (barras,)
+
+    Returns:
+    --------
+    np.ndarray
+        Médias (NaN nas primeiras ``window - 1`` barras)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1:
+        raise ValueError("A série deve ser unidimensional")
+    if window < 1:
+        raise ValueError("Janelas devem ser positivas")
+    n = len(values)
+    target = out if out is not None and out.dtype == np.float64 else np.empty(n)
+
+    # A soma é finita só se não houver NaN nem infinitos (estouro cai no caminho geral)
+    if window > n or not np.isfinite(np.add.reduce(values)):
+        target[...] = rolling_mean(values, [window])[:, 0]
+    else:
+        block = max(window, MIN_BLOCK)
+        full, rest = divmod(n, block)
+        n_blocks = full + (rest > 0)
+        prefix = np.empty((n_blocks, block))
+        centers = np.empty(n_blocks)
+        body = values[:full * block].reshape(full, block)
+        np.mean(body, axis=1, out=centers[:full])
+        np.subtract(body, centers[:full, None], out=prefix[:full])
+        if rest:
+            tail = values[full * block:]
+            centers[-1] = tail.mean()
+            np.subtract(tail, centers[-1], out=prefix[-1, :rest])
+            prefix[-1, rest:] = 0.0
+        np.cumsum(prefix, axis=1, out=prefix)
+
+        flat = prefix.reshape(-1)
+        target[window - 1] = flat[window - 1]
+        np.subtract(flat[window:n], flat[:n - window], out=target[window:])
+        if n_blocks > 1:
+            # Janelas que começam no bloco anterior (ver ``_window_sums``)
+            carried = prefix[:-1, -1:] - prefix[:-1, block - window:]
+            count = np.arange(window - 1, -1, -1, dtype=np.float64)
+            crossing = prefix[1:, :window] + carried + count * (centers[:-1] - centers[1:])[:, None]
+            target[:full * block].reshape(full, block)[1:, :window] = crossing[:full - 1]
+            if rest:
+                target[full * block:full * block + window] = crossing[-1, :min(window, rest)]
+
+        target /= window
+        target[:full * block].reshape(full, block)[...] += centers[:full, None]
+        if rest:
+            target[full * block:] += centers[-1]
+        target[:window - 1] = np.nan
+
+    if out is not None and target is not out:
+        out[...] = target
+        return out
+    return target
+
+
+def rolling_std(values: np.ndarray, windows: Sequence[int], ddof: int = 1,
+                out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Desvios padrão móveis de várias janelas a partir de somas acumuladas
+
+    As somas acumuladas são reiniciadas e centralizadas a cada bloco, o que
+    evita o cancelamento catastrófico de ``Σx² - n·média²`` em séries de
+    nível alto ou longas; variâncias negativas por arredondamento são
+    truncadas em zero.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Série 1-D
+    windows : Sequence[int]
+        Tamanhos das janelas
+    ddof : int
+        Graus de liberdade (1 como no pandas)
+    out : np.ndarray, optional
+        Saída (barras, janelas), como em ``rolling_mean``
+
+    Returns:
+    --------
+    np.ndarray
+        Desvios com formato (barras, janelas)
+    """
+    _, stds = _rolling_moments(values, windows, ddof, stds=None if out is None else out.T)
+    return stds.T
+
+
+def rolling_mean_std(values: np.ndarray, windows: Sequence[int],
+                     ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Médias e desvios padrão móveis das mesmas somas acumuladas, formato (barras, janelas) cada"""
+    means = np.empty((len(windows), len(values)))
+    means, stds = _rolling_moments(values, windows, ddof, means=means)
+    return means.T, stds.T
+
+
+def pct_change_windows(values: np.ndarray, windows: Sequence[int],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Variação percentual em relação a ``w`` barras atrás, formato (barras, janelas)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty((len(windows), len(values))) if out is None else out.T
+    for j, window in enumerate(windows):
+        out[j, :window] = np.nan
+        if window < len(values):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                np.divide(values[window:], values[:-window], out=out[j, window:])
+            out[j, window:] -= 1
+    return out.T
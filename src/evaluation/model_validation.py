@@ -1,21 +1,83 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Callable
+from typing import Dict, List, Optional
 from sklearn.metrics import mean_squared_error, mean_absolute_error
-from src.evaluation.backtesting import BacktestEngine
+from concurrent.futures import as_completed
+import copy
+import os
+import time
+from src.utils.shared_memory import shared_pool, worker_state
 import logging
 
+def _split_positions(split: Dict) -> np.ndarray:
+    """Posições de treino de um split purgado (segmentos concatenados)."""
+    return np.concatenate([np.arange(segment['start'], segment['end'])
+                           for segment in split['train']]).astype(np.intp)
+
+
+def _fit_split(model: object, feature_columns: List[str], target_column: str,
+               split: Dict, data: Optional[pd.DataFrame] = None,
+               validator: Optional['TimeSeriesValidator'] = None) -> Dict:
+    """Treina e avalia uma cópia do modelo em um split.
+
+    Sem ``data``/``validator`` usa os dados compartilhados do worker.
+
+    Returns:
+        Dict: Métricas do split, tamanhos e tempos de treino e previsão
+    """
+    if data is None:
+        state = worker_state()
+        data, validator = state['data'], state['validator']
+    model = copy.deepcopy(model)
+
+    segments = split['train']
+    if len(segments) == 1:
+        train_data = data.iloc[segments[0]['start']:segments[0]['end']]
+    else:
+        train_data = data.iloc[_split_positions(split)]
+    test_data = data.iloc[split['test']['start']:split['test']['end']]
+
+    begin = time.perf_counter()
+    model.fit(train_data[feature_columns], train_data[target_column])
+    fit_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    y_pred = model.predict(test_data[feature_columns])
+    predict_time = time.perf_counter() - begin
+
+    test_returns = test_data['Close'].pct_change().dropna()
+    metrics = validator.calculate_metrics(test_data[target_column], y_pred, test_returns)
+    metrics.update({
+        'train_size': len(train_data),
+        'test_size': len(test_data),
+        'purged': split['purged'],
+        'embargoed': split['embargoed'],
+        'fit_time': fit_time,
+        'predict_time': predict_time,
+        'worker': os.getpid()
+    })
+    return metrics
+
+
 class TimeSeriesValidator:
-    def __init__(self, n_splits: int = 5, test_size: int = 63):
+    def __init__(self, n_splits: int = 5, test_size: int = 63,
+                 purge: int = 0, embargo: int = 0):
         """Inicializa validador de séries temporais.
         
         Args:
             n_splits: Número de splits para validação
             test_size: Tamanho da janela de teste em dias
+            purge: Barras de treino descartadas antes de cada janela de teste
+                (use o horizonte dos labels)
+            embargo: Barras de treino descartadas após cada janela de teste
+                (validação purgada com dados posteriores ao teste)
         """
         self.n_splits = n_splits
         self.test_size = test_size
+        self.purge = purge
+        self.embargo = embargo
         self.results = []
+        self.elapsed = None
         
         # Configura logging
         self.logger = logging.getLogger(__name__)
@@ -156,6 +218,119 @@ class TimeSeriesValidator:
         
         return results_df
     
+    def generate_purged_splits(self, data: pd.DataFrame,
+                               expanding: bool = True) -> List[Dict]:
+        """Gera splits com purga e embargo em torno das janelas de teste.
+        
+        As janelas de teste são as mesmas de ``generate_validation_splits``.
+        As ``purge`` barras anteriores ao teste saem do treino, pois seus
+        labels (retornos futuros de várias barras) cobrem o período de teste.
+        Com ``expanding=False`` o treino também usa as barras posteriores ao
+        teste (k-fold purgado), descartando as ``embargo`` primeiras, cujas
+        features ainda refletem o período de teste.
+        
+        Args:
+            data: DataFrame com dados
+            expanding: Treina apenas com dados anteriores ao teste
+            
+        Returns:
+            List[Dict]: Splits com 'train' (lista de segmentos start/end),
+                'test' (start/end) e as barras purgadas e embargadas
+        """
+        total_size = len(data)
+        splits = []
+        
+        for split in self.generate_validation_splits(data):
+            test_start = split['test']['start']
+            test_end = split['test']['end']
+            train_end = max(test_start - self.purge, 0)
+            segments = [{'start': 0, 'end': train_end}] if train_end > 0 else []
+            embargoed = 0
+            
+            if not expanding and test_end < total_size:
+                after_start = min(test_end + self.embargo, total_size)
+                embargoed = after_start - test_end
+                if after_start < total_size:
+                    segments.append({'start': after_start, 'end': total_size})
+            
+            if not segments:
+                continue
+            splits.append({
+                'train': segments,
+                'test': {'start': test_start, 'end': test_end},
+                'purged': test_start - train_end,
+                'embargoed': embargoed
+            })
+        
+        self.logger.info(f"Gerados {len(splits)} splits purgados "
+                         f"(purge={self.purge}, embargo={self.embargo})")
+        return splits
+    
+    def validate_model_parallel(self, model: object, data: pd.DataFrame,
+                                feature_columns: List[str],
+                                target_column: str,
+                                expanding: bool = True,
+                                n_jobs: Optional[int] = None) -> pd.DataFrame:
+        """Executa validação cruzada purgada com os splits em paralelo.
+        
+        Os dados usados (features, alvo e 'Close') são publicados uma única
+        vez em memória compartilhada e anexados por cada processo do pool;
+        cada split treina uma cópia independente do modelo. Com ``n_jobs=1``
+        os splits rodam no próprio processo.
+        
+        Args:
+            model: Modelo a ser validado (fit/predict, serializável)
+            data: DataFrame com dados
+            feature_columns: Lista de colunas de features
+            target_column: Coluna alvo
+            expanding: Treina apenas com dados anteriores ao teste
+            n_jobs: Número de processos (padrão: núcleos disponíveis)
+            
+        Returns:
+            DataFrame com métricas, tamanhos e tempos (fit_time,
+            predict_time) por split
+        """
+        splits = self.generate_purged_splits(data, expanding=expanding)
+        if not splits:
+            raise ValueError("Dados insuficientes para gerar splits")
+        n_jobs = min(n_jobs or os.cpu_count() or 1, len(splits))
+        columns = list(dict.fromkeys(list(feature_columns) + [target_column, 'Close']))
+        
+        begin = time.perf_counter()
+        results = [None] * len(splits)
+        if n_jobs == 1:
+            for i, split in enumerate(splits):
+                self.logger.info(f"Processando split {i+1}/{len(splits)}")
+                results[i] = _fit_split(model, feature_columns, target_column, split,
+                                        data=data[columns], validator=self)
+        else:
+            extra = {'validator': TimeSeriesValidator(n_splits=self.n_splits, test_size=self.test_size)}
+            with shared_pool({}, n_jobs, extra, data=data, columns=columns) as executor:
+                futures = {
+                    executor.submit(_fit_split, model, feature_columns,
+                                    target_column, split): i
+                    for i, split in enumerate(splits)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    results[i] = future.result()
+                    self.logger.info(f"Split {i+1}/{len(splits)} concluído "
+                                     f"em {results[i]['fit_time']:.2f}s")
+        self.elapsed = time.perf_counter() - begin
+        
+        for i, metrics in enumerate(results):
+            metrics['split'] = i
+        results_df = pd.DataFrame(results)
+        self.results = results_df
+        
+        fit_total = results_df['fit_time'].sum()
+        self.logger.info(f"Validação em {self.elapsed:.2f}s com {n_jobs} processos "
+                         f"(soma dos treinos: {fit_total:.2f}s)")
+        summary = results_df.drop(columns=['worker']).agg(['mean', 'std'])
+        self.logger.info(f"\nResumo da validação:\n{summary}")
+        
+        return results_df
+    
     def plot_validation_results(self):
         """Plota resultados da validação."""
         if self.results.empty:
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict
+from ml_strategy.feature_graph import FeaturePipeline
+from ml_strategy import indicators
 
 def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """Calculate technical indicators for the dataset.
@@ -13,25 +15,16 @@ def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
     
-    # Moving averages
-    df['SMA_20'] = df['Close'].rolling(window=20).mean()
-    df['SMA_50'] = df['Close'].rolling(window=50).mean()
-    
-    # Relative Strength Index (RSI)
-    def calculate_rsi(data: pd.Series, periods: int = 14) -> pd.Series:
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
-    
-    df['RSI'] = calculate_rsi(df['Close'])
+    # Médias móveis e RSI do registro de features (só os nós necessários)
+    features = FeaturePipeline(df).compute(['sma_20', 'sma_50', 'rsi'])
+    df['SMA_20'] = features['sma_20']
+    df['SMA_50'] = features['sma_50']
+    df['RSI'] = features['rsi']
     
     # MACD
-    exp1 = df['Close'].ewm(span=12, adjust=False).mean()
-    exp2 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = exp1 - exp2
-    df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    macd_line, signal_line, _ = indicators.macd(df['Close'].to_numpy(dtype=np.float64))
+    df['MACD'] = macd_line
+    df['Signal_Line'] = signal_line
     
     return df
 
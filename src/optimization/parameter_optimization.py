@@ -1,19 +1,225 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Callable
+from typing import Dict, List, Callable, Optional
 from sklearn.model_selection import ParameterGrid
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from src.evaluation.backtesting import BacktestEngine
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+import multiprocessing
+import os
+import queue
+import time
+from src.utils.shared_memory import SharedMarketData
+from src.optimization.search import BaseSearch, _parameter_key
+from src.optimization.results_store import ResultsStore, make_run_id
+from backtest.cache import data_fingerprint
+
+# Estado de cada processo de trabalho, preenchido pelo inicializador do pool
+_WORKER_STATE: Dict = {}
+
+# Intervalo (s) entre leituras das avaliações enviadas pelos workers
+_POLL_INTERVAL = 0.05
+
+
+def default_engine(initial_capital: float = 100000.0):
+    """Motor de backtest padrão (src.evaluation.backtesting.BacktestEngine).
+    
+    Importado apenas no primeiro uso: o módulo de otimização pode ser
+    importado (e usado com ``engine_factory``) sem ele.
+    """
+    from src.evaluation.backtesting import BacktestEngine
+    return BacktestEngine(initial_capital=initial_capital)
+
+
+def _init_worker(descriptor: Dict, initial_capital: float,
+                 cache: Optional['BacktestCache'], data_hash: Optional[str],
+                 engine_factory: Callable = default_engine,
+                 progress: Optional['multiprocessing.Queue'] = None):
+    """Anexa os dados de mercado compartilhados uma única vez por processo."""
+    data, handles = SharedMarketData.attach(descriptor)
+    _WORKER_STATE.update({
+        'data': data,
+        'handles': handles,
+        'data_hash': data_hash,
+        'progress': progress,
+        'optimizer': StrategyOptimizer(initial_capital=initial_capital, cache=cache,
+                                       engine_factory=engine_factory)
+    })
+
+
+def _evaluate_chunk(strategy_class: object, parameter_chunk: List[Dict],
+                    metric: str, n_bars: Optional[int] = None, start: int = 0,
+                    slice_hash: Optional[str] = None,
+                    pruning: Optional[Dict] = None,
+                    task_id: Optional[int] = None) -> List[Optional[Dict]]:
+    """Avalia um lote de parâmetros sobre os dados compartilhados do worker.
+    
+    Com ``start``/``n_bars`` apenas a fatia [start, start + n_bars) é usada
+    (janelas walk-forward e fatias de successive halving). Com ``pruning``,
+    cada conjunto é avaliado antes na fração inicial da fatia e descartado
+    se violar os limites de drawdown ou de número de operações; o
+    fingerprint do prefixo vem calculado em ``pruning['hash']``. Com
+    ``task_id``, cada avaliação é enviada ao processo principal assim que
+    termina (``_StreamingRecorder``), antes do fim do lote.
+    """
+    optimizer = _WORKER_STATE['optimizer']
+    progress = _WORKER_STATE.get('progress') if task_id is not None else None
+    data = _WORKER_STATE['data']
+    data_hash = _WORKER_STATE['data_hash']
+    end = len(data) if n_bars is None else min(start + n_bars, len(data))
+    if start > 0 or end < len(data):
+        data = data.iloc[start:end]
+        data_hash = slice_hash
+    
+    results = []
+    for params in parameter_chunk:
+        results.append(_evaluate_one(optimizer, data, data_hash, strategy_class,
+                                     params, metric, pruning))
+        if progress is not None:
+            progress.put((task_id, len(results) - 1, results[-1]))
+    return results
+
+
+def _evaluate_one(optimizer: 'StrategyOptimizer', data: pd.DataFrame,
+                  data_hash: Optional[str], strategy_class: object, params: Dict,
+                  metric: str, pruning: Optional[Dict]) -> Optional[Dict]:
+    """Avalia um conjunto de parâmetros (com a poda pelo prefixo, se houver)."""
+    begin = time.perf_counter()
+    if pruning is not None:
+        partial = optimizer.evaluate_parameters(data.iloc[:_prefix_bars(len(data), pruning)],
+                                                strategy_class, params, metric,
+                                                data_hash=pruning.get('hash'))
+        if partial is None or _breaches_limits(partial, pruning):
+            return None if partial is None else dict(
+                partial, pruned=True, elapsed=time.perf_counter() - begin
+            )
+    
+    evaluation = optimizer.evaluate_parameters(data, strategy_class, params,
+                                               metric, data_hash=data_hash)
+    if evaluation is not None:
+        evaluation = dict(evaluation, elapsed=time.perf_counter() - begin)
+        if pruning is not None:
+            evaluation['pruned'] = False
+    return evaluation
+
+
+class _StreamingRecorder:
+    """Grava no ResultsStore cada avaliação assim que um worker a conclui.
+    
+    Os workers enviam (tarefa, posição, avaliação) por uma fila; o processo
+    principal lê a fila enquanto espera os lotes e grava avaliação por
+    avaliação, de modo que uma interrupção perde apenas as avaliações em
+    andamento. Ao fim de cada lote, as avaliações que ainda não chegaram
+    pela fila são gravadas com o resultado do lote.
+    """
+    
+    def __init__(self, store: ResultsStore, progress: 'multiprocessing.Queue'):
+        self.store = store
+        self.progress = progress
+        self._tasks: Dict[int, tuple] = {}
+        self._next_id = 0
+    
+    def register(self, run_id: Optional[str], parameters: List[Dict],
+                 context: str = '') -> Optional[int]:
+        """Registra um lote a ser gravado e retorna o id da tarefa (None sem run_id)."""
+        if run_id is None:
+            return None
+        task_id = self._next_id
+        self._next_id += 1
+        self._tasks[task_id] = (run_id, parameters, context, set())
+        return task_id
+    
+    def drain(self):
+        """Grava as avaliações já recebidas dos workers."""
+        while True:
+            try:
+                task_id, position, evaluation = self.progress.get_nowait()
+            except queue.Empty:
+                return
+            task = self._tasks.get(task_id)
+            if task is None or position in task[3]:
+                continue
+            run_id, parameters, context, recorded = task
+            self.store.record(run_id, [parameters[position]], [evaluation], context)
+            recorded.add(position)
+    
+    def finish(self, task_id: Optional[int], evaluations: List[Optional[Dict]]):
+        """Conclui um lote, gravando as avaliações que não chegaram pela fila."""
+        if task_id is None:
+            return
+        self.drain()
+        run_id, parameters, context, recorded = self._tasks.pop(task_id)
+        missing = [i for i in range(len(parameters)) if i not in recorded]
+        if missing:
+            self.store.record(run_id, [parameters[i] for i in missing],
+                              [evaluations[i] for i in missing], context)
+
+
+def _prefix_bars(n_bars: int, pruning: Dict) -> int:
+    """Barras do prefixo avaliado antes da janela completa na poda."""
+    return int(n_bars * pruning['fraction'])
+
+
+def _breaches_limits(evaluation: Dict, pruning: Dict) -> bool:
+    """Verifica os limites de poda numa avaliação parcial.
+    
+    O drawdown de um prefixo nunca é maior que o da janela completa, então
+    uma violação já é definitiva; o mínimo de operações é escalado pela
+    fração avaliada.
+    """
+    max_drawdown = pruning.get('max_drawdown')
+    if max_drawdown is not None and abs(evaluation.get('max_drawdown', 0.0)) > max_drawdown:
+        return True
+    min_trades = pruning.get('min_trades')
+    trades = evaluation.get('total_trades')
+    if min_trades is not None and trades is not None:
+        return trades < min_trades * pruning['fraction']
+    return False
+
+
+def _strategy_name(strategy_class: object) -> str:
+    """Nome qualificado da estratégia gravado no ResultsStore."""
+    return f"{strategy_class.__module__}.{strategy_class.__qualname__}"
+
+
+def _resolve_workers(n_jobs: int) -> int:
+    """Converte n_jobs no estilo scikit-learn (-1 = todos os núcleos) em processos."""
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, cpu_count + 1 + n_jobs)
+    return n_jobs
+
 
 class StrategyOptimizer:
-    def __init__(self, initial_capital: float = 100000.0):
+    def __init__(self, initial_capital: float = 100000.0,
+                 cache: Optional['BacktestCache'] = None,
+                 store: Optional[ResultsStore] = None,
+                 engine_factory: Callable = default_engine):
+        """Inicializa otimizador de estratégias.
+        
+        Args:
+            initial_capital: Capital inicial dos backtests
+            cache: backtest.BacktestCache opcional; avaliações já feitas com os
+                mesmos parâmetros, código e dados são lidas do disco
+            store: ResultsStore opcional; cada avaliação é gravada ao terminar
+                e execuções reiniciadas pulam os parâmetros já avaliados
+            engine_factory: Função (initial_capital=...) que cria o motor de
+                backtest, com ``run_backtest(data, signals)`` e
+                ``get_statistics()``; deve ser de módulo para rodar no pool
+        """
         self.initial_capital = initial_capital
+        self.cache = cache
+        self.store = store
+        self.engine_factory = engine_factory
+        self.run_id = None
         self.results = []
         
     def evaluate_parameters(self, data: pd.DataFrame, 
                            strategy_class: object,
                            parameters: Dict,
-                           metric: str = 'sharpe_ratio') -> Dict:
+                           metric: str = 'sharpe_ratio',
+                           data_hash: Optional[str] = None) -> Dict:
         """Avalia um conjunto de parâmetros.
         
         Args:
@@ -21,10 +227,22 @@ class StrategyOptimizer:
             strategy_class: Classe da estratégia
             parameters: Dicionário com parâmetros
             metric: Métrica para otimização
+            data_hash: Fingerprint dos dados já calculado (evita re-hash no cache)
             
         Returns:
             Dict: Resultados da avaliação
         """
+        cache_key = None
+        if self.cache is not None:
+            extra = {'initial_capital': self.initial_capital}
+            if self.engine_factory is not default_engine:
+                extra['engine'] = f"{self.engine_factory.__module__}.{self.engine_factory.__qualname__}"
+            cache_key = self.cache.make_key(strategy_class, parameters, data_hash or data,
+                                            extra=extra)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached[1]
+        
         try:
             # Instancia estratégia com parâmetros
             strategy = strategy_class(**parameters)
@@ -33,7 +251,7 @@ class StrategyOptimizer:
             signals = strategy.generate_signals(data)
             
             # Executa backtest
-            backtest = BacktestEngine(initial_capital=self.initial_capital)
+            backtest = self.engine_factory(initial_capital=self.initial_capital)
             results = backtest.run_backtest(data, signals)
             stats = backtest.get_statistics()
             
@@ -45,15 +263,23 @@ class StrategyOptimizer:
             negative_returns = returns[returns < 0]
             sortino_ratio = np.sqrt(252) * (returns.mean() / negative_returns.std())
             
+            # Número de operações: mudanças de posição
+            positions = np.nan_to_num(np.asarray(signals, dtype=np.float64))
+            total_trades = int(np.count_nonzero(np.diff(positions, prepend=0.0)))
+            
             evaluation = {
                 'parameters': parameters,
                 'sharpe_ratio': sharpe_ratio,
                 'sortino_ratio': sortino_ratio,
                 'total_return': stats['return'],
                 'max_drawdown': stats['max_drawdown'],
-                'win_rate': stats['win_rate']
+                'win_rate': stats['win_rate'],
+                'total_trades': total_trades
             }
             
+            if cache_key is not None:
+                self.cache.put(cache_key, results[['capital']], evaluation)
+            
             return evaluation
             
         except Exception as e:
@@ -64,49 +290,200 @@ class StrategyOptimizer:
                  strategy_class: object,
                  parameter_grid: Dict[str, List],
                  metric: str = 'sharpe_ratio',
-                 n_jobs: int = -1) -> pd.DataFrame:
+                 n_jobs: int = -1,
+                 chunk_size: Optional[int] = None,
+                 searcher: Optional[BaseSearch] = None,
+                 run_id: Optional[str] = None) -> pd.DataFrame:
         """Otimiza parâmetros da estratégia.
         
+        Os dados de mercado são publicados uma única vez em memória
+        compartilhada; cada processo anexa os arrays sem cópia e as tarefas
+        carregam apenas lotes de dicionários de parâmetros.
+        
         Args:
             data: DataFrame com dados de mercado
             strategy_class: Classe da estratégia
-            parameter_grid: Grade de parâmetros para otimização
+            parameter_grid: Grade de parâmetros para otimização (com ``searcher``,
+                o espaço de busca: listas ou distribuições do scipy.stats)
             metric: Métrica para otimização
-            n_jobs: Número de processos paralelos
+            n_jobs: Número de processos paralelos (-1 usa todos os núcleos)
+            chunk_size: Parâmetros por tarefa (padrão: ~4 lotes por processo)
+            searcher: Estratégia de busca de src.optimization.search
+                (RandomSearch, SuccessiveHalving, SequentialModelSearch);
+                None expande a grade completa
+            run_id: Identificador da execução no ResultsStore (padrão:
+                derivado da estratégia, grade, métrica, buscador e dados)
             
         Returns:
             DataFrame com resultados da otimização
         """
-        # Gera todas as combinações de parâmetros
-        param_combinations = list(ParameterGrid(parameter_grid))
-        results = []
-        
-        # Executa otimização em paralelo
-        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
-            futures = []
-            for params in param_combinations:
-                future = executor.submit(
-                    self.evaluate_parameters,
-                    data,
-                    strategy_class,
-                    params,
-                    metric
-                )
-                futures.append(future)
+        n_workers = _resolve_workers(n_jobs)
+        if searcher is None:
+            # Gera todas as combinações de parâmetros
+            param_combinations = list(ParameterGrid(parameter_grid))
+            n_workers = min(n_workers, max(len(param_combinations), 1))
+        
+        data_hash = data_fingerprint(data) if self.cache is not None or self.store is not None else None
+        self.run_id = None
+        if self.store is not None:
+            self.run_id = self._start_run(strategy_class, parameter_grid, metric,
+                                          searcher, data_hash, run_id)
+        
+        with self._worker_pool(data, n_workers, data_hash, self.store) as (executor, recorder):
+            def evaluate(parameters: List[Dict], n_bars: Optional[int] = None):
+                return self._evaluate_batch(executor, strategy_class, parameters, metric,
+                                            n_workers, chunk_size, n_bars, recorder)
             
-            # Coleta resultados
-            for future in as_completed(futures):
-                result = future.result()
-                if result is not None:
-                    results.append(result)
+            if searcher is None:
+                results = [result for result in evaluate(param_combinations) if result is not None]
+            else:
+                results = searcher.search(evaluate, parameter_grid, len(data),
+                                          n_workers, metric)
         
-        # Organiza resultados
+        # Organiza resultados (avaliações em fatias maiores primeiro, se houver)
         results_df = pd.DataFrame(results)
-        results_df = results_df.sort_values(metric, ascending=False)
+        sort_columns = [metric]
+        if 'n_bars' in results_df.columns:
+            sort_columns = ['n_bars', metric]
+        results_df = results_df.sort_values(sort_columns, ascending=False)
         
         self.results = results_df
         return results_df
     
+    def _start_run(self, strategy_class: object, parameter_grid: Dict, metric: str,
+                   searcher: Optional[BaseSearch], data_hash: str,
+                   run_id: Optional[str] = None) -> str:
+        """Registra a execução no ResultsStore e retorna o run id."""
+        config = {
+            'strategy': _strategy_name(strategy_class),
+            'parameter_grid': parameter_grid,
+            'metric': metric,
+            'initial_capital': self.initial_capital,
+            'data': data_hash,
+            'searcher': None if searcher is None else {
+                'type': type(searcher).__name__,
+                **{k: v for k, v in vars(searcher).items()
+                   if not k.startswith('_') and k != 'n_evals'}
+            }
+        }
+        run_id = run_id or make_run_id(config)
+        self.store.start_run(run_id, config['strategy'], metric, config)
+        return run_id
+    
+    def _evaluate_batch(self, executor: ProcessPoolExecutor,
+                        strategy_class: object,
+                        parameters: List[Dict],
+                        metric: str,
+                        n_workers: int,
+                        chunk_size: Optional[int] = None,
+                        n_bars: Optional[int] = None,
+                        recorder: Optional[_StreamingRecorder] = None) -> List[Optional[Dict]]:
+        """Avalia um lote no pool, reaproveitando e gravando avaliações no ResultsStore.
+        
+        Cada avaliação é gravada assim que termina (``_StreamingRecorder``);
+        uma execução retomada reavalia apenas o que estava em andamento.
+        
+        Returns:
+            List[Optional[Dict]]: Avaliações na ordem dos parâmetros (None em falhas)
+        """
+        if self.store is None or self.run_id is None:
+            return self._map_chunks(executor, strategy_class, parameters, metric,
+                                    n_workers, chunk_size, n_bars)
+        
+        context = '' if n_bars is None else f'n_bars={n_bars}'
+        done = self.store.completed(self.run_id, context)
+        keys = [_parameter_key(params) for params in parameters]
+        pending = [params for params, key in zip(parameters, keys) if key not in done]
+        
+        if pending:
+            evaluations = self._map_chunks(
+                executor, strategy_class, pending, metric, n_workers, chunk_size, n_bars,
+                recorder=recorder, run_id=self.run_id, context=context
+            )
+            done.update(zip((_parameter_key(params) for params in pending), evaluations))
+        
+        return [done[key] for key in keys]
+    
+    @contextmanager
+    def _worker_pool(self, data: pd.DataFrame, n_workers: int,
+                     data_hash: Optional[str] = None,
+                     store: Optional[ResultsStore] = None):
+        """Publica os dados em memória compartilhada e mantém um pool de processos.
+        
+        Args:
+            data: DataFrame com dados de mercado
+            n_workers: Número de processos
+            data_hash: Fingerprint dos dados já calculado (usado pelo cache)
+            store: ResultsStore que recebe cada avaliação ao terminar
+            
+        Yields:
+            Tuple com o ProcessPoolExecutor (dados anexados em cada processo)
+            e o ``_StreamingRecorder`` do ``store`` (None sem store)
+        """
+        if self.cache is None:
+            data_hash = None
+        elif data_hash is None:
+            data_hash = data_fingerprint(data)
+        
+        progress = multiprocessing.Queue() if store is not None else None
+        try:
+            with SharedMarketData(data) as shared:
+                with ProcessPoolExecutor(max_workers=n_workers,
+                                         initializer=_init_worker,
+                                         initargs=(shared.descriptor, self.initial_capital,
+                                                   self.cache, data_hash,
+                                                   self.engine_factory, progress)) as executor:
+                    yield executor, (None if store is None else _StreamingRecorder(store, progress))
+        finally:
+            if progress is not None:
+                progress.close()
+                progress.join_thread()
+    
+    @staticmethod
+    def _map_chunks(executor: ProcessPoolExecutor,
+                    strategy_class: object,
+                    param_combinations: List[Dict],
+                    metric: str,
+                    n_workers: int,
+                    chunk_size: Optional[int] = None,
+                    n_bars: Optional[int] = None,
+                    recorder: Optional[_StreamingRecorder] = None,
+                    run_id: Optional[str] = None,
+                    context: str = '') -> List[Optional[Dict]]:
+        """Distribui os parâmetros em lotes pelo pool.
+        
+        Args:
+            recorder: Grava cada avaliação de ``run_id``/``context`` no
+                ResultsStore assim que ela termina
+        
+        Returns:
+            List[Optional[Dict]]: Avaliações na ordem dos parâmetros (None em falhas)
+        """
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(param_combinations) // (n_workers * 4)))
+        futures = {}
+        for i in range(0, len(param_combinations), chunk_size):
+            chunk = param_combinations[i:i + chunk_size]
+            task_id = None if recorder is None else recorder.register(run_id, chunk, context)
+            future = executor.submit(_evaluate_chunk, strategy_class, chunk, metric, n_bars,
+                                     task_id=task_id)
+            futures[future] = (i, task_id)
+        
+        results = [None] * len(param_combinations)
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=None if recorder is None else _POLL_INTERVAL,
+                                     return_when=FIRST_COMPLETED)
+            if recorder is not None:
+                recorder.drain()
+            for future in finished:
+                start, task_id = futures[future]
+                chunk_results = future.result()
+                results[start:start + len(chunk_results)] = chunk_results
+                if recorder is not None:
+                    recorder.finish(task_id, chunk_results)
+        return results
+    
     def get_best_parameters(self, metric: str = 'sharpe_ratio') -> Dict:
         """Retorna os melhores parâmetros encontrados.
         
@@ -147,16 +524,28 @@ class StrategyOptimizer:
         plt.show()
 
 class WalkForwardOptimizer:
-    def __init__(self, train_size: int = 252, test_size: int = 63):
+    def __init__(self, train_size: int = 252, test_size: int = 63,
+                 cache: Optional['BacktestCache'] = None,
+                 store: Optional[ResultsStore] = None,
+                 engine_factory: Callable = default_engine):
         """Inicializa otimizador walk-forward.
         
         Args:
             train_size: Tamanho da janela de treino em dias
             test_size: Tamanho da janela de teste em dias
+            cache: backtest.BacktestCache opcional compartilhado entre as janelas
+            store: ResultsStore opcional; cada janela grava suas avaliações e
+                uma execução reiniciada retoma de onde parou
+            engine_factory: Função que cria o motor de backtest (ver StrategyOptimizer)
         """
         self.train_size = train_size
         self.test_size = test_size
+        self.cache = cache
+        self.store = store
+        self.engine_factory = engine_factory
+        self.run_id = None
         self.results = []
+        self.oos_summary = {}
         
     def generate_windows(self, data: pd.DataFrame) -> List[Dict]:
         """Gera janelas de treino e teste.
@@ -190,58 +579,204 @@ class WalkForwardOptimizer:
                  strategy_class: object,
                  parameter_grid: Dict[str, List],
                  metric: str = 'sharpe_ratio',
-                 n_jobs: int = -1) -> pd.DataFrame:
+                 n_jobs: int = -1,
+                 run_id: Optional[str] = None,
+                 chunk_size: Optional[int] = None,
+                 max_drawdown: Optional[float] = None,
+                 min_trades: Optional[int] = None,
+                 prune_fraction: float = 0.5,
+                 on_window: Optional[Callable] = None) -> pd.DataFrame:
         """Executa otimização walk-forward.
         
+        Todas as tarefas (janela, lote de parâmetros) vão para um único pool
+        persistente sobre os dados publicados uma vez em memória
+        compartilhada. Quando o treino de uma janela termina, a avaliação
+        fora da amostra dessa janela entra na fila do mesmo pool e o resumo
+        fora da amostra é atualizado à medida que os testes chegam.
+        
         Args:
             data: DataFrame com dados de mercado
             strategy_class: Classe da estratégia
             parameter_grid: Grade de parâmetros para otimização
             metric: Métrica para otimização
             n_jobs: Número de processos paralelos
+            run_id: Identificador da execução no ResultsStore (padrão: derivado
+                da estratégia, grade, métrica, janelas e dados)
+            chunk_size: Parâmetros por tarefa (padrão: ~4 lotes por processo e janela)
+            max_drawdown: Drawdown máximo (fração positiva) tolerado no treino
+            min_trades: Número mínimo de operações na janela de treino
+            prune_fraction: Fração inicial do treino usada para podar parâmetros;
+                o motor de backtest não expõe o estado ao fim do prefixo, então
+                os sobreviventes custam (1 + prune_fraction) janelas
+            on_window: Chamado com (resultado da janela, resumo fora da amostra)
+                assim que cada janela termina
             
         Returns:
             DataFrame com resultados da otimização
         """
         windows = self.generate_windows(data)
-        results = []
+        param_combinations = list(ParameterGrid(parameter_grid))
+        optimizer = StrategyOptimizer(cache=self.cache, engine_factory=self.engine_factory)
+        
+        pruning = None
+        if max_drawdown is not None or min_trades is not None:
+            pruning = {'fraction': prune_fraction, 'max_drawdown': max_drawdown,
+                       'min_trades': min_trades}
+        
+        if self.store is not None and run_id is None:
+            run_id = make_run_id({
+                'walk_forward': [self.train_size, self.test_size],
+                'strategy': _strategy_name(strategy_class),
+                'parameter_grid': parameter_grid,
+                'metric': metric,
+                'pruning': pruning,
+                'data': data_fingerprint(data)
+            })
+        self.run_id = run_id
+        
+        n_workers = _resolve_workers(n_jobs)
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(param_combinations) // (n_workers * 4)))
         
-        for window in windows:
-            # Separa dados de treino e teste
-            train_data = data.iloc[window['train']['start']:window['train']['end']]
-            test_data = data.iloc[window['test']['start']:window['test']['end']]
+        # Estado por janela: avaliações de treino pendentes e concluídas
+        states = []
+        for i, window in enumerate(windows):
+            window_run_id = None if run_id is None else f"{run_id}/window_{i}"
+            done, test_done = {}, {}
+            if window_run_id is not None:
+                self.store.start_run(window_run_id, _strategy_name(strategy_class), metric,
+                                     {'walk_forward': run_id, 'window': window})
+                done = self.store.completed(window_run_id)
+                test_done = self.store.completed(window_run_id, 'test')
             
-            # Otimiza parâmetros no conjunto de treino
-            optimizer = StrategyOptimizer()
-            train_results = optimizer.optimize(
-                train_data,
-                strategy_class,
-                parameter_grid,
-                metric,
-                n_jobs
-            )
+            pending = [params for params in param_combinations
+                       if _parameter_key(params) not in done]
+            states.append({
+                'run_id': window_run_id,
+                'evaluations': [evaluation for evaluation in done.values() if evaluation is not None],
+                'test_done': test_done,
+                'pending_tasks': 0,
+                'pending': pending
+            })
+        
+        self.oos_summary = {'windows': 0, f'mean_{metric}': np.nan, 'compounded_return': 0.0}
+        window_results = {}
+        
+        with optimizer._worker_pool(data, n_workers, store=self.store) as (executor, recorder):
+            futures = {}
             
-            # Obtém melhores parâmetros
-            best_params = optimizer.get_best_parameters(metric)
+            def slice_hash(bounds: Dict, n_bars: Optional[int] = None) -> Optional[str]:
+                if self.cache is None:
+                    return None
+                end = bounds['end'] if n_bars is None else bounds['start'] + n_bars
+                return data_fingerprint(data.iloc[bounds['start']:end])
             
-            # Avalia no conjunto de teste
-            test_evaluation = optimizer.evaluate_parameters(
-                test_data,
-                strategy_class,
-                best_params,
-                metric
-            )
+            def submit_test(i: int):
+                state = states[i]
+                train_results = self._train_frame(state['evaluations'], metric)
+                state['train_results'] = train_results
+                state['n_pruned'] = len(state['evaluations']) - len(train_results)
+                best_params = train_results.iloc[0]['parameters'] if not train_results.empty else None
+                state['best_parameters'] = best_params
+                
+                key = None if best_params is None else _parameter_key(best_params)
+                if best_params is None or key in state['test_done']:
+                    finish_window(i, state['test_done'].get(key))
+                    return
+                bounds = windows[i]['test']
+                task_id = None if recorder is None else recorder.register(
+                    state['run_id'], [best_params], 'test')
+                future = executor.submit(_evaluate_chunk, strategy_class, [best_params], metric,
+                                         bounds['end'] - bounds['start'], bounds['start'],
+                                         slice_hash(bounds), task_id=task_id)
+                futures[future] = ('test', i, task_id)
             
-            results.append({
-                'window': window,
-                'train_results': train_results,
-                'test_results': test_evaluation,
-                'best_parameters': best_params
-            })
+            def finish_window(i: int, test_evaluation: Optional[Dict]):
+                state = states[i]
+                result = {
+                    'window': windows[i],
+                    'train_results': state['train_results'],
+                    'test_results': test_evaluation,
+                    'best_parameters': state['best_parameters'],
+                    'n_pruned': state['n_pruned']
+                }
+                window_results[i] = result
+                self._update_oos_summary(test_evaluation, metric)
+                if on_window is not None:
+                    on_window(result, dict(self.oos_summary))
+            
+            # Todas as tarefas de treino de todas as janelas no mesmo pool
+            for i, window in enumerate(windows):
+                bounds = window['train']
+                state = states[i]
+                if not state['pending']:
+                    submit_test(i)
+                    continue
+                n_bars = bounds['end'] - bounds['start']
+                train_hash = slice_hash(bounds)
+                window_pruning = None
+                if pruning is not None:
+                    # Fingerprint do prefixo calculado uma vez por janela
+                    window_pruning = dict(pruning, hash=slice_hash(bounds, _prefix_bars(n_bars, pruning)))
+                for start in range(0, len(state['pending']), chunk_size):
+                    chunk = state['pending'][start:start + chunk_size]
+                    task_id = None if recorder is None else recorder.register(state['run_id'], chunk)
+                    future = executor.submit(_evaluate_chunk, strategy_class, chunk, metric,
+                                             n_bars, bounds['start'], train_hash, window_pruning,
+                                             task_id=task_id)
+                    futures[future] = ('train', i, task_id)
+                    state['pending_tasks'] += 1
+            
+            # Coleta em ordem de conclusão; testes entram na fila ao fim de cada treino.
+            # Com store, cada avaliação é gravada assim que o worker a conclui
+            while futures:
+                finished, _ = wait(list(futures), timeout=None if recorder is None else _POLL_INTERVAL,
+                                   return_when=FIRST_COMPLETED)
+                if recorder is not None:
+                    recorder.drain()
+                for future in finished:
+                    kind, i, task_id = futures.pop(future)
+                    evaluations = future.result()
+                    state = states[i]
+                    if recorder is not None:
+                        recorder.finish(task_id, evaluations)
+                    
+                    if kind == 'train':
+                        state['evaluations'].extend(e for e in evaluations if e is not None)
+                        state['pending_tasks'] -= 1
+                        if state['pending_tasks'] == 0:
+                            submit_test(i)
+                    else:
+                        finish_window(i, evaluations[0])
         
+        results = [window_results[i] for i in sorted(window_results)]
         self.results = results
         return pd.DataFrame(results)
     
+    @staticmethod
+    def _train_frame(evaluations: List[Dict], metric: str) -> pd.DataFrame:
+        """Avaliações de treino não podadas, ordenadas pela métrica."""
+        train_results = pd.DataFrame(evaluations)
+        if train_results.empty:
+            return train_results
+        if 'pruned' in train_results.columns:
+            train_results = train_results[~train_results['pruned'].fillna(False).astype(bool)]
+        return train_results.sort_values(metric, ascending=False)
+    
+    def _update_oos_summary(self, evaluation: Optional[Dict], metric: str):
+        """Agrega incrementalmente os resultados fora da amostra."""
+        summary = self.oos_summary
+        if evaluation is None:
+            return
+        n = summary['windows'] + 1
+        value = float(evaluation.get(metric, np.nan))
+        previous = summary[f'mean_{metric}']
+        summary[f'mean_{metric}'] = value if n == 1 else previous + (value - previous) / n
+        summary['compounded_return'] = float(
+            (1 + summary['compounded_return']) * (1 + evaluation.get('total_return', 0.0)) - 1
+        )
+        summary['windows'] = n
+    
     def plot_walk_forward_results(self, metric: str = 'sharpe_ratio'):
         """Plota resultados da otimização walk-forward.
         
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import sqlite3
+import time
+import pandas as pd
+from typing import Dict, List, Optional
+from src.optimization.search import _parameter_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    strategy TEXT,
+    metric TEXT,
+    config TEXT,
+    created_at REAL
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    run_id TEXT NOT NULL,
+    context TEXT NOT NULL DEFAULT '',
+    param_key TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    metrics TEXT,
+    status TEXT NOT NULL,
+    elapsed REAL,
+    completed_at REAL,
+    PRIMARY KEY (run_id, context, param_key)
+);
+"""
+
+
+def _describe(value):
+    """Representação estável para JSON (distribuições do scipy.stats por nome e argumentos)."""
+    if hasattr(value, 'rvs') and hasattr(value, 'dist'):
+        return f"{value.dist.name}{tuple(value.args)}{sorted(value.kwds.items())}"
+    return str(value)
+
+
+def make_run_id(config: Dict) -> str:
+    """Run id determinístico derivado da configuração da execução.
+
+    Reiniciar com a mesma estratégia, espaço de busca, dados e opções gera o
+    mesmo id, e as avaliações já gravadas são reaproveitadas.
+    """
+    encoded = json.dumps(config, sort_keys=True, default=_describe).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class ResultsStore:
+    def __init__(self, path: str = 'optimization_results.db'):
+        """Banco SQLite local com as avaliações de otimização.
+
+        Cada avaliação é gravada assim que termina, identificada pelo run id,
+        pelo contexto (ex.: janela walk-forward ou fatia de dados) e pelos
+        parâmetros. Uma execução reiniciada com o mesmo run id lê as
+        avaliações concluídas e envia ao pool apenas as pendentes.
+
+        Args:
+            path: Caminho do arquivo SQLite
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def start_run(self, run_id: str, strategy: str, metric: str,
+                  config: Optional[Dict] = None):
+        """Registra uma execução (mantém o registro original se já existir).
+
+        Args:
+            run_id: Identificador da execução
+            strategy: Nome da classe da estratégia
+            metric: Métrica otimizada
+            config: Configuração da execução (grade, buscador, etc.)
+        """
+        self._conn.execute(
+            'INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?)',
+            (run_id, strategy, metric, json.dumps(config or {}, sort_keys=True, default=_describe),
+             time.time())
+        )
+        self._conn.commit()
+
+    def record(self, run_id: str, parameters: List[Dict],
+               evaluations: List[Optional[Dict]], context: str = ''):
+        """Grava um lote de avaliações (None registra falha).
+
+        Args:
+            run_id: Identificador da execução
+            parameters: Parâmetros avaliados
+            evaluations: Avaliações alinhadas aos parâmetros
+            context: Contexto da avaliação dentro da execução
+        """
+        now = time.time()
+        rows = []
+        for params, evaluation in zip(parameters, evaluations):
+            metrics = None
+            elapsed = None
+            if evaluation is not None:
+                metrics = {k: v for k, v in evaluation.items() if k != 'parameters'}
+                elapsed = metrics.get('elapsed')
+            rows.append((
+                run_id, context, _parameter_key(params),
+                json.dumps(params, sort_keys=True, default=str),
+                None if metrics is None else json.dumps(metrics, default=float),
+                'failed' if evaluation is None else 'completed',
+                elapsed, now
+            ))
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+        )
+        self._conn.commit()
+
+    def completed(self, run_id: str, context: str = '',
+                  include_failed: bool = False) -> Dict[str, Optional[Dict]]:
+        """Avaliações já concluídas de uma execução.
+
+        Falhas (exceção na avaliação, processo interrompido) ficam de fora
+        por padrão: uma execução reiniciada volta a avaliá-las.
+
+        Args:
+            run_id: Identificador da execução
+            context: Contexto da avaliação dentro da execução
+            include_failed: Também retorna as falhas (como None)
+
+        Returns:
+            Dict: Chave dos parâmetros -> avaliação (None para falhas)
+        """
+        query = ('SELECT param_key, parameters, metrics FROM evaluations '
+                 'WHERE run_id = ? AND context = ?')
+        if not include_failed:
+            query += " AND status = 'completed'"
+        done = {}
+        for key, parameters, metrics in self._conn.execute(query, (run_id, context)):
+            done[key] = None if metrics is None else {
+                'parameters': json.loads(parameters), **json.loads(metrics)
+            }
+        return done
+
+    def runs(self) -> pd.DataFrame:
+        """Execuções registradas com o número de avaliações de cada uma."""
+        return pd.read_sql_query(
+            'SELECT r.run_id, r.strategy, r.metric, r.config, r.created_at, '
+            'COUNT(e.param_key) AS n_evaluations, SUM(e.elapsed) AS total_elapsed '
+            'FROM runs r LEFT JOIN evaluations e ON e.run_id = r.run_id '
+            'GROUP BY r.run_id ORDER BY r.created_at', self._conn
+        )
+
+    def results(self, run_id: str, context: Optional[str] = None) -> pd.DataFrame:
+        """Avaliações de uma execução com parâmetros e métricas em colunas.
+
+        Args:
+            run_id: Identificador da execução
+            context: Filtra um contexto (None = todos)
+
+        Returns:
+            DataFrame com uma linha por avaliação
+        """
+        query = ('SELECT context, parameters, metrics, status, elapsed, completed_at '
+                 'FROM evaluations WHERE run_id = ?')
+        args = [run_id]
+        if context is not None:
+            query += ' AND context = ?'
+            args.append(context)
+
+        rows = []
+        for ctx, parameters, metrics, status, elapsed, completed_at in self._conn.execute(query, args):
+            row = {'context': ctx, 'status': status, 'completed_at': completed_at}
+            row.update(json.loads(parameters))
+            if metrics is not None:
+                row.update(json.loads(metrics))
+            row['elapsed'] = elapsed
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,329 @@
+import json
+import math
+import time
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+from sklearn.ensemble import ExtraTreesRegressor
+
+# Assinatura da função de avaliação fornecida pelo StrategyOptimizer:
+# evaluate(lista_de_parametros, n_bars) -> avaliações alinhadas (None em falhas)
+Evaluator = Callable[[List[Dict], Optional[int]], List[Optional[Dict]]]
+
+
+def _parameter_key(params: Dict) -> str:
+    """Chave estável de um conjunto de parâmetros (detecção de repetidos)."""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _sample_parameters(space: Dict, rng: np.random.Generator) -> Dict:
+    """Sorteia um conjunto de parâmetros do espaço de busca.
+
+    Listas são amostradas uniformemente; objetos com ``rvs`` (distribuições
+    do scipy.stats) são amostrados com o gerador fornecido.
+    """
+    params = {}
+    for name, values in space.items():
+        if hasattr(values, 'rvs'):
+            value = values.rvs(random_state=rng)
+            params[name] = value.item() if isinstance(value, np.generic) else value
+        else:
+            value = values[rng.integers(len(values))]
+            params[name] = value.item() if isinstance(value, np.generic) else value
+    return params
+
+
+def _space_size(space: Dict) -> float:
+    """Número de combinações distintas (infinito com distribuições contínuas)."""
+    size = 1
+    for values in space.values():
+        if hasattr(values, 'rvs'):
+            return math.inf
+        size *= len(values)
+    return size
+
+
+def _score(evaluation: Optional[Dict], metric: str) -> float:
+    """Valor da métrica a maximizar (-inf para falhas e NaN)."""
+    if evaluation is None:
+        return -math.inf
+    value = evaluation.get(metric)
+    if value is None or not np.isfinite(value):
+        return -math.inf
+    return float(value)
+
+
+class BaseSearch(ABC):
+    def __init__(self, max_evals: Optional[int] = 100,
+                 time_budget: Optional[float] = None,
+                 batch_size: Optional[int] = None,
+                 random_state: Optional[int] = None):
+        """Base das estratégias de busca de parâmetros.
+
+        As avaliações são enviadas em lotes ao pool de processos do
+        StrategyOptimizer; o orçamento é verificado entre lotes, de modo que
+        ``time_budget`` pode ser excedido em no máximo um lote.
+
+        Args:
+            max_evals: Número máximo de avaliações (None = sem limite)
+            time_budget: Tempo máximo em segundos (None = sem limite)
+            batch_size: Avaliações por lote (padrão: 4 por processo)
+            random_state: Semente para reprodutibilidade
+        """
+        self.max_evals = max_evals
+        self.time_budget = time_budget
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.n_evals = 0
+        self._start = None
+
+    @abstractmethod
+    def search(self, evaluate: Evaluator, space: Dict, n_bars: int,
+               n_workers: int, metric: str) -> List[Dict]:
+        """Executa a busca.
+
+        Args:
+            evaluate: Função de avaliação em lote do StrategyOptimizer
+            space: Espaço de busca (listas ou distribuições do scipy.stats)
+            n_bars: Número de barras dos dados completos
+            n_workers: Número de processos do pool
+            metric: Métrica a maximizar
+
+        Returns:
+            List[Dict]: Avaliações bem-sucedidas
+        """
+
+    def _check_budget(self, space: Dict):
+        """Exige orçamento quando o espaço de busca é infinito."""
+        if self.max_evals is None and self.time_budget is None and math.isinf(_space_size(space)):
+            raise ValueError("Defina max_evals ou time_budget para espaços contínuos")
+
+    def _begin(self, n_workers: int) -> int:
+        """Reinicia contadores e retorna o tamanho de lote efetivo."""
+        self.n_evals = 0
+        self._start = time.perf_counter()
+        return self.batch_size or max(1, n_workers * 4)
+
+    def _remaining(self) -> float:
+        """Avaliações restantes no orçamento."""
+        if self.time_budget is not None and time.perf_counter() - self._start >= self.time_budget:
+            return 0
+        if self.max_evals is None:
+            return math.inf
+        return max(self.max_evals - self.n_evals, 0)
+
+    def _evaluate(self, evaluate: Evaluator, params: List[Dict],
+                  n_bars: Optional[int] = None) -> List[Optional[Dict]]:
+        """Avalia um lote respeitando o orçamento de avaliações."""
+        remaining = self._remaining()
+        if remaining < len(params):
+            params = params[:int(remaining)]
+        if not params:
+            return []
+        results = evaluate(params, n_bars)
+        self.n_evals += len(params)
+        return results
+
+
+class RandomSearch(BaseSearch):
+    """Busca aleatória sem repetição de combinações."""
+
+    def search(self, evaluate: Evaluator, space: Dict, n_bars: int,
+               n_workers: int, metric: str) -> List[Dict]:
+        self._check_budget(space)
+        batch_size = self._begin(n_workers)
+        rng = np.random.default_rng(self.random_state)
+        size = _space_size(space)
+        seen = set()
+        results = []
+
+        while self._remaining() > 0 and len(seen) < size:
+            batch = []
+            attempts = 0
+            while len(batch) < batch_size and len(seen) < size and attempts < batch_size * 100:
+                params = _sample_parameters(space, rng)
+                attempts += 1
+                key = _parameter_key(params)
+                if key not in seen:
+                    seen.add(key)
+                    batch.append(params)
+            if not batch:
+                break
+            results.extend(r for r in self._evaluate(evaluate, batch) if r is not None)
+
+        return results
+
+
+class SuccessiveHalving(BaseSearch):
+    def __init__(self, n_candidates: int = 81, eta: int = 3, min_bars: int = 100,
+                 max_evals: Optional[int] = None,
+                 time_budget: Optional[float] = None,
+                 batch_size: Optional[int] = None,
+                 random_state: Optional[int] = None):
+        """Successive halving sobre fatias crescentes dos dados.
+
+        Os candidatos são avaliados primeiro nas barras iniciais; a cada
+        rodada somente o melhor 1/eta segue e a fatia cresce eta vezes, até
+        os dados completos.
+
+        Args:
+            n_candidates: Candidatos sorteados na primeira rodada
+            eta: Fator de redução de candidatos e de crescimento dos dados
+            min_bars: Tamanho mínimo da fatia (aquecimento dos indicadores)
+            max_evals: Número máximo de avaliações (None = sem limite)
+            time_budget: Tempo máximo em segundos (None = sem limite)
+            batch_size: Avaliações por lote (padrão: 4 por processo)
+            random_state: Semente para reprodutibilidade
+        """
+        super().__init__(max_evals, time_budget, batch_size, random_state)
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_bars = min_bars
+
+    def search(self, evaluate: Evaluator, space: Dict, n_bars: int,
+               n_workers: int, metric: str) -> List[Dict]:
+        batch_size = self._begin(n_workers)
+        rng = np.random.default_rng(self.random_state)
+
+        # Candidatos distintos (limitados ao tamanho do espaço discreto)
+        target = min(self.n_candidates, _space_size(space))
+        candidates, seen = [], set()
+        attempts = 0
+        while len(candidates) < target and attempts < max(target, 1) * 100:
+            params = _sample_parameters(space, rng)
+            attempts += 1
+            key = _parameter_key(params)
+            if key not in seen:
+                seen.add(key)
+                candidates.append(params)
+
+        n_rungs = int(math.floor(math.log(max(len(candidates), 1), self.eta))) + 1
+        results = []
+        for rung in range(n_rungs):
+            rung_bars = n_bars if rung == n_rungs - 1 else min(
+                n_bars, max(self.min_bars, int(n_bars * self.eta ** (rung - n_rungs + 1)))
+            )
+
+            scored = []
+            for start in range(0, len(candidates), batch_size):
+                batch = candidates[start:start + batch_size]
+                evaluations = self._evaluate(evaluate, batch, rung_bars)
+                for params, evaluation in zip(batch, evaluations):
+                    if evaluation is not None:
+                        evaluation = dict(evaluation, n_bars=rung_bars, rung=rung)
+                        results.append(evaluation)
+                    scored.append((_score(evaluation, metric), params))
+                if self._remaining() <= 0:
+                    return results
+
+            # Promove o melhor 1/eta (ordenação estável preserva o sorteio em empates)
+            scored.sort(key=lambda item: item[0], reverse=True)
+            n_keep = max(1, int(math.ceil(len(scored) / self.eta)))
+            candidates = [params for _, params in scored[:n_keep]]
+
+        return results
+
+
+class SequentialModelSearch(BaseSearch):
+    def __init__(self, max_evals: Optional[int] = 100,
+                 time_budget: Optional[float] = None,
+                 n_initial: int = 20,
+                 n_samples: int = 1000,
+                 kappa: float = 1.0,
+                 batch_size: Optional[int] = None,
+                 random_state: Optional[int] = None):
+        """Busca sequencial guiada por modelo substituto.
+
+        Após ``n_initial`` pontos aleatórios, um ExtraTreesRegressor é
+        ajustado às avaliações; a cada lote ``n_samples`` candidatos são
+        sorteados e os de maior média + kappa * desvio entre as árvores são
+        avaliados.
+
+        Args:
+            max_evals: Número máximo de avaliações (None = sem limite)
+            time_budget: Tempo máximo em segundos (None = sem limite)
+            n_initial: Avaliações aleatórias antes do modelo substituto
+            n_samples: Candidatos sorteados por lote para o modelo pontuar
+            kappa: Peso da incerteza na aquisição (exploração)
+            batch_size: Avaliações por lote (padrão: 1 por processo)
+            random_state: Semente para reprodutibilidade
+        """
+        super().__init__(max_evals, time_budget, batch_size, random_state)
+        self.n_initial = n_initial
+        self.n_samples = n_samples
+        self.kappa = kappa
+
+    def search(self, evaluate: Evaluator, space: Dict, n_bars: int,
+               n_workers: int, metric: str) -> List[Dict]:
+        self._check_budget(space)
+        initial_batch_size = self._begin(n_workers)
+        # Lotes pequenos na fase guiada: cada lote aproveita o modelo atualizado
+        batch_size = self.batch_size or max(1, n_workers)
+        rng = np.random.default_rng(self.random_state)
+        size = _space_size(space)
+
+        seen = set()
+        X, y = [], []
+        results = []
+
+        def run(batch):
+            for params, evaluation in zip(batch, self._evaluate(evaluate, batch)):
+                score = _score(evaluation, metric)
+                if evaluation is not None:
+                    results.append(evaluation)
+                if np.isfinite(score):
+                    X.append(self._encode(space, params))
+                    y.append(score)
+
+        # Fase inicial aleatória
+        initial = []
+        attempts = 0
+        while len(initial) < self.n_initial and len(seen) < size and attempts < self.n_initial * 100:
+            params = _sample_parameters(space, rng)
+            attempts += 1
+            key = _parameter_key(params)
+            if key not in seen:
+                seen.add(key)
+                initial.append(params)
+        for start in range(0, len(initial), initial_batch_size):
+            run(initial[start:start + initial_batch_size])
+
+        while self._remaining() > 0 and len(seen) < size:
+            pool = {}
+            for _ in range(self.n_samples):
+                params = _sample_parameters(space, rng)
+                key = _parameter_key(params)
+                if key not in seen:
+                    pool[key] = params
+            if not pool:
+                break
+            keys = list(pool)
+
+            if len(y) >= 2:
+                model = ExtraTreesRegressor(n_estimators=50, min_samples_leaf=2,
+                                            random_state=self.random_state)
+                model.fit(np.array(X), np.array(y))
+                candidates = np.array([self._encode(space, pool[key]) for key in keys])
+                per_tree = np.stack([tree.predict(candidates) for tree in model.estimators_])
+                acquisition = per_tree.mean(axis=0) + self.kappa * per_tree.std(axis=0)
+                order = np.argsort(-acquisition, kind='stable')
+            else:
+                order = np.arange(len(keys))
+
+            batch = [pool[keys[i]] for i in order[:batch_size]]
+            seen.update(keys[i] for i in order[:batch_size])
+            run(batch)
+
+        return results
+
+    @staticmethod
+    def _encode(space: Dict, params: Dict) -> List[float]:
+        """Codifica parâmetros como vetor numérico (categorias pela posição na lista)."""
+        row = []
+        for name, values in space.items():
+            value = params[name]
+            if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, np.number)):
+                row.append(float(list(values).index(value)))
+            else:
+                row.append(float(value))
+        return row
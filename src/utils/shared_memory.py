@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Tipos que podem ser publicados: bool, inteiros, floats, complexos e datas/durações
+_SHAREABLE_KINDS = 'biufcmM'
+
+# Arrays e objetos anexados em cada processo de trabalho de ``shared_pool``
+_WORKER_STATE: Dict = {}
+_WORKER_HANDLES: List[shared_memory.SharedMemory] = []
+
+
+class SharedArrays:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """Publica arrays NumPy nomeados em memória compartilhada.
+
+        Cada array é copiado uma única vez para um bloco próprio; processos de
+        trabalho anexam os blocos pelo descritor, sem cópia.
+
+        Args:
+            arrays: Arrays a publicar, por nome
+        """
+        self._handles: List[shared_memory.SharedMemory] = []
+        self.descriptor: Dict[str, Tuple[str, tuple, str]] = {}
+        try:
+            for name, array in arrays.items():
+                array = np.asarray(array)
+                if array.dtype.kind not in _SHAREABLE_KINDS:
+                    raise ValueError(f"Array '{name}' de tipo {array.dtype} não pode ser compartilhado")
+                shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._handles.append(shm)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+                self.descriptor[name] = (shm.name, array.shape, array.dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+    @staticmethod
+    def attach(descriptor: Dict[str, Tuple[str, tuple, str]],
+               readonly: bool = True) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+        """Anexa os blocos publicados.
+
+        Args:
+            descriptor: Descritor gerado por ``SharedArrays``
+            readonly: Marca os arrays como somente leitura
+
+        Returns:
+            Tuple com os arrays por nome e os handles, que devem permanecer
+            vivos enquanto os arrays forem usados
+        """
+        arrays, handles = {}, []
+        for name, (shm_name, shape, dtype) in descriptor.items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            handles.append(shm)
+            array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            if readonly:
+                array.flags.writeable = False
+            arrays[name] = array
+        return arrays, handles
+
+    def close(self):
+        """Libera os blocos compartilhados (chamado pelo processo que publicou)."""
+        for shm in self._handles:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._handles = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SharedMarketData:
+    def __init__(self, data: pd.DataFrame, columns: Optional[List[str]] = None):
+        """Publica dados de mercado em memória compartilhada.
+
+        As colunas são agrupadas por tipo e cada grupo é copiado uma única vez
+        para um bloco (colunas x barras), preservando o dtype de cada coluna;
+        o índice vai para um bloco próprio. Processos de trabalho anexam os
+        blocos pelo descritor e reconstroem o DataFrame sem cópia, com os
+        mesmos valores e tipos de uma execução serial.
+
+        Args:
+            data: DataFrame com dados de mercado (OHLCV)
+            columns: Colunas a publicar (padrão: todas)
+
+        Raises:
+            ValueError: Coluna de tipo não numérico (texto, categoria, datas
+                com fuso) ou índice que não pode ser compartilhado
+        """
+        if columns is None:
+            columns = list(data.columns)
+
+        unsupported = [col for col in columns
+                       if not isinstance(data[col].dtype, np.dtype)
+                       or data[col].dtype.kind not in _SHAREABLE_KINDS]
+        if unsupported:
+            raise ValueError(f"Colunas não numéricas não podem ser compartilhadas: {unsupported} "
+                             f"(selecione as colunas com o parâmetro columns)")
+
+        index = data.index
+        is_datetime = isinstance(index, pd.DatetimeIndex)
+        if is_datetime:
+            index_values = index.values  # UTC, na resolução original
+        else:
+            index_values = np.asarray(index)
+            if index_values.dtype.kind not in 'iuf':
+                raise ValueError("Índice não numérico não pode ser compartilhado")
+
+        # Um bloco por dtype; na ordem de ``columns`` dentro de cada bloco
+        groups: Dict[str, List[str]] = {}
+        for col in columns:
+            groups.setdefault(data[col].dtype.str, []).append(col)
+        arrays = {'index': index_values}
+        blocks = []
+        for i, (dtype, group) in enumerate(groups.items()):
+            arrays[f'block_{i}'] = data[group].to_numpy(dtype=dtype).T
+            blocks.append([str(col) for col in group])
+
+        self._arrays = SharedArrays(arrays)
+        self.descriptor = {
+            'arrays': self._arrays.descriptor,
+            'columns': [str(col) for col in columns],
+            'blocks': blocks,
+            'index_name': index.name,
+            'index_tz': str(index.tz) if is_datetime and index.tz else None,
+        }
+
+    @staticmethod
+    def attach(descriptor: Dict) -> Tuple[pd.DataFrame, List[shared_memory.SharedMemory]]:
+        """Anexa os blocos publicados e reconstrói o DataFrame sem cópia.
+
+        Args:
+            descriptor: Descritor gerado por ``SharedMarketData``
+
+        Returns:
+            Tuple com o DataFrame (somente leitura) e os handles, que devem
+            permanecer vivos enquanto o DataFrame for usado
+        """
+        arrays, handles = SharedArrays.attach(descriptor['arrays'])
+
+        index_values = arrays['index']
+        if index_values.dtype.kind == 'M':
+            index = pd.DatetimeIndex(index_values, name=descriptor['index_name'])
+            if descriptor['index_tz']:
+                index = index.tz_localize('UTC').tz_convert(descriptor['index_tz'])
+        else:
+            index = pd.Index(index_values, name=descriptor['index_name'])
+
+        blocks = descriptor['blocks']
+        if len(blocks) == 1:
+            # values.T é F-contíguo: o DataFrame usa um único bloco apontando para a memória compartilhada
+            data = pd.DataFrame(arrays['block_0'].T, index=index, columns=blocks[0], copy=False)
+        else:
+            rows = {col: arrays[f'block_{i}'][j]
+                    for i, group in enumerate(blocks) for j, col in enumerate(group)}
+            data = pd.DataFrame({col: rows[col] for col in descriptor['columns']},
+                                index=index, copy=False)
+        return data, handles
+
+    def close(self):
+        """Libera os blocos compartilhados (chamado pelo processo que publicou)."""
+        self._arrays.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _init_worker(descriptor: Dict[str, Tuple[str, tuple, str]], extra: Optional[Dict],
+                 market_descriptor: Optional[Dict] = None):
+    """Inicializador dos workers: anexa os arrays (e o DataFrame) publicados sem cópia"""
+    arrays, handles = SharedArrays.attach(descriptor)
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(arrays)
+    if market_descriptor is not None:
+        data, market_handles = SharedMarketData.attach(market_descriptor)
+        _WORKER_STATE['data'] = data
+        handles = handles + market_handles
+    _WORKER_STATE.update(extra or {})
+    _WORKER_HANDLES[:] = handles
+
+
+def worker_state() -> Dict:
+    """Arrays (somente leitura) e objetos publicados por ``shared_pool`` no processo atual"""
+    return _WORKER_STATE
+
+
+@contextmanager
+def shared_pool(arrays: Dict[str, np.ndarray], max_workers: int,
+                extra: Optional[Dict] = None, data: Optional[pd.DataFrame] = None,
+                columns: Optional[List[str]] = None) -> Iterator[ProcessPoolExecutor]:
+    """Pool de processos com arrays publicados em memória compartilhada.
+
+    Os arrays são copiados uma única vez; cada worker os anexa sem cópia e
+    os acessa, junto com os objetos de ``extra``, por ``worker_state()``.
+    Um DataFrame em ``data`` é publicado por ``SharedMarketData`` e fica em
+    ``worker_state()['data']``.
+
+    Args:
+        arrays: Arrays a publicar, por nome
+        max_workers: Número de processos
+        extra: Objetos (serializáveis) enviados uma vez a cada worker
+        data: DataFrame de dados de mercado a publicar
+        columns: Colunas de ``data`` a publicar (padrão: todas)
+
+    Yields:
+        ProcessPoolExecutor pronto para uso
+    """
+    market = SharedMarketData(data, columns) if data is not None else None
+    try:
+        with SharedArrays(arrays) as shared, \
+                ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                    initargs=(shared.descriptor, extra,
+                                              market.descriptor if market else None)) as executor:
+            yield executor
+    finally:
+        if market is not None:
+            market.close()
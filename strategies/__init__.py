@@ -2,10 +2,12 @@
 from .base_strategy import BaseStrategy
 from .mean_reversion import MeanReversionStrategy, MeanReversionEnhanced
 from .ml_strategy import MLTradingStrategy
+from .indicator_cache import IndicatorCache
 
 __all__ = [
     'BaseStrategy',
     'MeanReversionStrategy',
     'MeanReversionEnhanced',
-    'MLTradingStrategy'
+    'MLTradingStrategy',
+    'IndicatorCache'
 ]
\ No newline at end of file
@@ -0,0 +1,80 @@
+# strategies/indicator_cache.py
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Hashable
+from ml_strategy import indicators as kernels
+
+
+class IndicatorCache:
+    """
+    Memoização de indicadores por (indicador, janela, id da série de origem).
+
+    Buscas em grade recalculam os mesmos indicadores para cada combinação de
+    parâmetros; com o cache cada série (ex.: média de 20 períodos do
+    fechamento) é calculada uma única vez. A série de origem fica referenciada
+    na entrada do cache, de modo que seu ``id`` não pode ser reutilizado por
+    outro objeto enquanto a entrada existir. O número de entradas é limitado
+    com despejo LRU.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, source: pd.Series, window: Hashable,
+            compute: Callable[[], pd.Series]) -> pd.Series:
+        """Retorna o indicador em cache ou calcula com ``compute`` e armazena"""
+        key = (name, window, id(source))
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is source:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (source, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def source(self, data: pd.DataFrame, column: str) -> pd.Series:
+        """Coluna do DataFrame como objeto estável (mesmo id em chamadas repetidas)"""
+        return self.get('column', data, column, lambda: data[column].squeeze())
+
+    def pct_change(self, source: pd.Series) -> pd.Series:
+        return self.get('pct_change', source, 1, source.pct_change)
+
+    def rolling_mean(self, source: pd.Series, window: int) -> pd.Series:
+        return self.get('rolling_mean', source, window,
+                        lambda: self._series(kernels.sma(source.to_numpy(), window), source))
+
+    def rolling_std(self, source: pd.Series, window: int) -> pd.Series:
+        return self.get('rolling_std', source, window,
+                        lambda: self._series(kernels.stddev(source.to_numpy(), window), source))
+
+    def rsi(self, source: pd.Series, window: int) -> pd.Series:
+        """RSI com médias móveis simples de ganhos e perdas"""
+        def compute():
+            values = kernels.rsi(source.to_numpy(), window, smoothing='simple')
+            # Janelas sem ganhos nem perdas valem 0 (perda zero tratada como 1e-9)
+            tail = values[window - 1:]
+            tail[np.isnan(tail)] = 0.0
+            return self._series(values, source)
+
+        return self.get('rsi', source, window, compute)
+
+    @staticmethod
+    def _series(values: np.ndarray, source: pd.Series) -> pd.Series:
+        return pd.Series(values, index=source.index, name=source.name, copy=False)
+
+    def clear(self):
+        """Remove todas as entradas"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,6 +4,9 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 from .risk_manager import RiskManager
+from .indicator_cache import IndicatorCache
+from backtest.cache import BacktestCache, data_fingerprint
+from ml_strategy import indicators as kernels
 
 class MeanReversionStrategy(BaseStrategy):
     def generate_signals(self) -> pd.Series:
@@ -14,12 +17,7 @@ class MeanReversionStrategy(BaseStrategy):
         close = self.data['Close'].squeeze()
         
         # Calcular indicadores
-        sma_20 = close.rolling(window=20).mean()
-        std_20 = close.rolling(window=20).std()
-        
-        # Calcular bandas
-        upper_band = sma_20 + (2 * std_20)
-        lower_band = sma_20 - (2 * std_20)
+        upper_band, _, lower_band = kernels.bollinger(close.to_numpy(), window=20, num_std=2)
         
         # Criar máscaras para os sinais
         buy_mask = close < lower_band
@@ -32,9 +30,14 @@ class MeanReversionStrategy(BaseStrategy):
         return signals
 
 class MeanReversionEnhanced(BaseStrategy):
-    def __init__(self, data: pd.DataFrame):
+    # Cache de avaliações e de indicadores não alteram os sinais (ver backtest.cache.strategy_parameters)
+    cache_ignore = ('cache', 'indicators')
+    
+    def __init__(self, data: pd.DataFrame, cache: Optional[BacktestCache] = None):
         super().__init__(data)
         self.risk_manager = RiskManager(data)
+        self.cache = cache  # backtest.BacktestCache opcional para reaproveitar avaliações
+        self.indicators = IndicatorCache()  # Indicadores compartilhados entre avaliações
         self.optimize_parameters()
     
     def optimize_parameters(self):
@@ -43,24 +46,32 @@ class MeanReversionEnhanced(BaseStrategy):
         train_size = int(len(self.data) * 0.7)
         train_data = self.data[:train_size]
         
-        best_sharpe = float('-inf')
-        best_params = {}
+        sma_windows = [10, 15, 20, 25]
+        bb_stds = [1.5, 2.0, 2.5]
+        rsi_windows = [7, 14, 21]
         
-        # Grid search para parâmetros
-        for sma_window in [10, 15, 20, 25]:
-            for bb_std in [1.5, 2.0, 2.5]:
-                for rsi_window in [7, 14, 21]:
-                    params = {
-                        'sma_window': sma_window,
-                        'bb_std': bb_std,
-                        'rsi_window': rsi_window
-                    }
-                    
-                    sharpe = self._evaluate_parameters(train_data, params)
-                    
-                    if sharpe > best_sharpe:
-                        best_sharpe = sharpe
-                        best_params = params
+        # Fingerprint calculado uma vez para todas as chaves de cache da busca
+        data_hash = data_fingerprint(train_data) if self.cache is not None else None
+        
+        # Grid search: janelas em laço, multiplicadores das bandas em broadcasting
+        sharpes = np.empty((len(sma_windows), len(bb_stds), len(rsi_windows)))
+        for i, sma_window in enumerate(sma_windows):
+            for k, rsi_window in enumerate(rsi_windows):
+                sharpes[i, :, k] = self._cached_threshold_grid(
+                    train_data, sma_window, rsi_window, bb_stds, data_hash
+                )
+        
+        # Primeiro máximo na ordem (sma_window, bb_std, rsi_window) da busca original
+        flat = sharpes.ravel()
+        flat = np.where(np.isnan(flat), float('-inf'), flat)
+        best_params = {}
+        if flat.max() > float('-inf'):
+            i, j, k = np.unravel_index(np.argmax(flat), sharpes.shape)
+            best_params = {
+                'sma_window': sma_windows[i],
+                'bb_std': bb_stds[j],
+                'rsi_window': rsi_windows[k]
+            }
         
         self.params = best_params
     
@@ -68,16 +79,12 @@ class MeanReversionEnhanced(BaseStrategy):
         signals = pd.Series(0, index=self.data.index)
         
         # Usar parâmetros otimizados
-        close = self.data['Close'].squeeze()
-        sma = close.rolling(window=self.params['sma_window']).mean()
-        std = close.rolling(window=self.params['sma_window']).std()
+        close = self.indicators.source(self.data, 'Close')
+        sma = self.indicators.rolling_mean(close, self.params['sma_window'])
+        std = self.indicators.rolling_std(close, self.params['sma_window'])
         
         # RSI otimizado
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.params['rsi_window']).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.params['rsi_window']).mean()
-        rs = gain / loss.replace(0, 1e-9)
-        rsi = 100 - (100 / (1 + rs))
+        rsi = self.indicators.rsi(close, self.params['rsi_window'])
         
         # Bandas de Bollinger dinâmicas
         upper = sma + (self.params['bb_std'] * std)
@@ -85,7 +92,7 @@ class MeanReversionEnhanced(BaseStrategy):
         
         # Adicionar filtros de tendência
         trend = close > sma
-        vol_increasing = std > std.rolling(window=20).mean()
+        vol_increasing = std > self.indicators.rolling_mean(std, 20)
         
         # Sinais com múltiplas confirmações
         buy_mask = (
@@ -110,6 +117,92 @@ class MeanReversionEnhanced(BaseStrategy):
         
         return risk_adjusted_signals
 
+    def _cached_threshold_grid(self, data: pd.DataFrame, sma_window: int, rsi_window: int,
+                               bb_stds: List[float], data_hash: Optional[str]) -> np.ndarray:
+        """Sharpe de cada bb_std consultando o cache de backtest, se configurado"""
+        if self.cache is None:
+            return self.evaluate_threshold_grid(data, sma_window, rsi_window, bb_stds)
+        
+        keys = [
+            self.cache.make_key(type(self),
+                                {'sma_window': sma_window, 'bb_std': bb_std, 'rsi_window': rsi_window},
+                                data_hash, extra={'evaluation': 'sharpe'})
+            for bb_std in bb_stds
+        ]
+        cached = [self.cache.get(key) for key in keys]
+        if all(entry is not None for entry in cached):
+            return np.array([entry[1]['sharpe'] for entry in cached], dtype=np.float64)
+        
+        sharpes = self.evaluate_threshold_grid(data, sma_window, rsi_window, bb_stds)
+        for key, sharpe in zip(keys, sharpes):
+            self.cache.put(key, None, {'sharpe': float(sharpe)})
+        return sharpes
+
+    def evaluate_threshold_grid(self, data: pd.DataFrame, sma_window: int, rsi_window: int,
+                                bb_std=2.0, rsi_oversold=30, rsi_overbought=70) -> np.ndarray:
+        """
+        Avalia vários limiares de uma vez com uma matriz de sinais 2-D
+        
+        Os indicadores dependem apenas das janelas; os limiares só mudam as
+        comparações. Cada limiar pode ser escalar ou vetor, e os vetores são
+        combinados por broadcasting em K colunas (barras x K), todas pontuadas
+        com a mesma semântica de ``_evaluate_parameters``.
+        
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            Dados para avaliação
+        sma_window : int
+            Janela da média e do desvio padrão das bandas
+        rsi_window : int
+            Janela do RSI
+        bb_std : float or array-like
+            Multiplicador(es) do desvio padrão das bandas
+        rsi_oversold, rsi_overbought : float or array-like
+            Limite(s) de sobrevenda e sobrecompra do RSI
+            
+        Returns:
+        --------
+        np.ndarray
+            Sharpe ratio de cada coluna (-inf quando o desvio dos retornos é zero)
+        """
+        bb_std, rsi_oversold, rsi_overbought = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(bb_std, dtype=np.float64)),
+            np.atleast_1d(np.asarray(rsi_oversold, dtype=np.float64)),
+            np.atleast_1d(np.asarray(rsi_overbought, dtype=np.float64))
+        )
+        
+        close_series = self.indicators.source(data, 'Close')
+        close = close_series.to_numpy(dtype=np.float64)[:, None]
+        sma = self.indicators.rolling_mean(close_series, sma_window).to_numpy()[:, None]
+        std_series = self.indicators.rolling_std(close_series, sma_window)
+        std = std_series.to_numpy()[:, None]
+        rsi = self.indicators.rsi(close_series, rsi_window).to_numpy()[:, None]
+        
+        trend = close > sma
+        vol_increasing = std > self.indicators.rolling_mean(std_series, 20).to_numpy()[:, None]
+        
+        # (T, 1) contra (K,) -> (T, K)
+        buy_mask = (close < sma - bb_std * std) & (rsi < rsi_oversold) & ~trend & vol_increasing
+        sell_mask = (close > sma + bb_std * std) & (rsi > rsi_overbought) & trend & vol_increasing
+        signals = buy_mask.astype(np.float64) - sell_mask
+        
+        # Retornos com posição da barra anterior; NaN ignorados como no pandas
+        returns = self.indicators.pct_change(close_series).to_numpy()[:, None]
+        strategy_returns = np.full(signals.shape, np.nan)
+        strategy_returns[1:] = signals[:-1] * returns[1:]
+        
+        valid = np.isfinite(strategy_returns)
+        n_valid = valid.sum(axis=0)
+        filled = np.where(valid, strategy_returns, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = filled.sum(axis=0) / n_valid
+            deviations = np.where(valid, strategy_returns - mean, 0.0)
+            std_returns = np.sqrt((deviations ** 2).sum(axis=0) / (n_valid - 1))
+            sharpe = np.sqrt(252) * mean / std_returns
+        
+        return np.where((len(data) > 1) & (std_returns != 0), sharpe, float('-inf'))
+
     def _evaluate_parameters(self, data: pd.DataFrame, params: Dict) -> float:
         """
         Avalia um conjunto de parâmetros usando um mini-backtest
@@ -127,55 +220,10 @@ class MeanReversionEnhanced(BaseStrategy):
             Sharpe ratio dos retornos gerados
         """
         try:
-            # Calcular indicadores com os parâmetros fornecidos
-            close = data['Close'].squeeze()
-            sma = close.rolling(window=params['sma_window']).mean()
-            std = close.rolling(window=params['sma_window']).std()
-            
-            # RSI
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=params['rsi_window']).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=params['rsi_window']).mean()
-            rs = gain / loss.replace(0, 1e-9)
-            rsi = 100 - (100 / (1 + rs))
-            
-            # Bandas
-            upper = sma + (params['bb_std'] * std)
-            lower = sma - (params['bb_std'] * std)
-            
-            # Gerar sinais
-            signals = pd.Series(0, index=data.index)
-            trend = close > sma
-            vol_increasing = std > std.rolling(window=20).mean()
-            
-            buy_mask = (
-                (close < lower) &
-                (rsi < 30) &
-                ~trend &
-                vol_increasing
-            )
-            
-            sell_mask = (
-                (close > upper) &
-                (rsi > 70) &
-                trend &
-                vol_increasing
+            sharpes = self.evaluate_threshold_grid(
+                data, params['sma_window'], params['rsi_window'], bb_std=params['bb_std']
             )
-            
-            signals[buy_mask] = 1
-            signals[sell_mask] = -1
-            
-            # Calcular retornos
-            returns = data['Close'].pct_change()
-            strategy_returns = signals.shift(1) * returns
-            
-            # Calcular Sharpe ratio
-            if len(strategy_returns) > 1 and strategy_returns.std() != 0:
-                sharpe = np.sqrt(252) * strategy_returns.mean() / strategy_returns.std()
-            else:
-                sharpe = float('-inf')
-            
-            return sharpe
+            return float(sharpes[0])
             
         except Exception as e:
             print(f"Erro na avaliação de parâmetros: {str(e)}")
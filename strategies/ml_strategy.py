@@ -1,18 +1,22 @@
 from .base_strategy import BaseStrategy
 from ml_strategy.data_processor import DataProcessor
 from ml_strategy.model import MLModel
-from strategies.risk_manager import RiskManager
+from ml_strategy.risk_manager import RiskManager
+from ml_strategy.labeling import horizon_labels
 import pandas as pd
 
 class MLTradingStrategy(BaseStrategy):
     """Estratégia de trading baseada em machine learning"""
     
+    # Derivados só dos dados ou saídas de generate_signals; o modelo treinado entra na chave de cache
+    cache_ignore = ('data_processor', 'trade_params')
+    
     def __init__(self, data: pd.DataFrame):
         super().__init__(data)
         self.data_processor = DataProcessor(data)
         self.model = MLModel()
         self.trained = False
-        self.trade_params = {}
+        self.trade_params = pd.DataFrame()  # Parâmetros das opções por barra com sinal
         self.risk_manager = RiskManager(data)
         
     def _create_labels(self, horizon: int = 5) -> pd.Series:
@@ -29,23 +33,8 @@ class MLTradingStrategy(BaseStrategy):
         pd.Series
             Labels para treinamento (0 para PUT, 1 para neutro, 2 para CALL)
         """
-        # Calcular retornos futuros
-        future_returns = self.data['Close'].pct_change(horizon).shift(-horizon)
-        
-        # Definir thresholds para opções
-        call_threshold = 0.0003  # 0.03% para CALL
-        put_threshold = -0.0003  # -0.03% para PUT
-        
-        # Criar labels (começando de 0 para LightGBM)
-        labels = pd.Series(1, index=self.data.index)  # 1 é neutro
-        
-        # 2 para CALL (Alta esperada)
-        labels[future_returns > call_threshold] = 2
-        
-        # 0 para PUT (Baixa esperada)
-        labels[future_returns < put_threshold] = 0
-        
-        return labels.fillna(1)  # Preencher NaN com 1 (neutro)
+        labels = horizon_labels(self.data['Close'], [horizon], threshold=0.0003)  # ±0.03%
+        return labels[f'label_{horizon}'].astype(int)
     
     def train(self, start_date: str, end_date: str):
         """Treina a estratégia"""
@@ -89,27 +78,16 @@ class MLTradingStrategy(BaseStrategy):
         features = self.data_processor.prepare_features()
         predictions = self.model.predict(features)
         
+        # Filtro de risco vetorizado sobre todas as barras (horário da própria barra)
+        validation = self.risk_manager.validate_trades(predictions, features['volatility_60'])
+        accepted = predictions.where(validation['valid'], 0)
+        
         signals = pd.Series(0, index=self.data.index)
-        current_price = self.data['Close'].iloc[-1]
+        signals.loc[accepted.index] = accepted.to_numpy()
         
-        for i in range(len(predictions)):
-            if predictions[i] != 0:
-                # Validar trade
-                is_valid, reason = self.risk_manager.validate_trade(
-                    predictions[i],
-                    current_price,
-                    features['volatility_60'].iloc[i]
-                )
-                
-                if is_valid:
-                    # Calcular parâmetros da opção
-                    option_params = self.risk_manager.calculate_option_parameters(
-                        predictions[i],
-                        current_price
-                    )
-                    
-                    # Armazenar sinal e parâmetros
-                    signals.iloc[i] = predictions[i]
-                    self.trade_params[signals.index[i]] = option_params
+        # Parâmetros das opções com o preço de fechamento de cada barra
+        self.trade_params = self.risk_manager.option_parameters(
+            accepted[accepted != 0], self.data['Close']
+        )
         
-        return signals
\ No newline at end of file
+        return signals
@@ -2,6 +2,7 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
+from ml_strategy import indicators as kernels
 
 class RiskManager:
     def __init__(self, data: pd.DataFrame):
@@ -14,16 +15,9 @@ class RiskManager:
         
     def calculate_atr(self, window: int = 14) -> pd.Series:
         """Calcula o Average True Range"""
-        high = self.data['High']
-        low = self.data['Low']
-        close = self.data['Close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        return tr.rolling(window=window).mean()
+        values = kernels.atr(self.data['High'].to_numpy(), self.data['Low'].to_numpy(),
+                             self.data['Close'].to_numpy(), window, smoothing='simple')
+        return pd.Series(values, index=self.data.index, copy=False)
     
     def apply_risk_management(self, signals: pd.Series) -> pd.Series:
         """Aplica regras de gestão de risco aos sinais"""
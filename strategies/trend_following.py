@@ -1,5 +1,6 @@
 from .base_strategy import BaseStrategy
 import pandas as pd
+from ml_strategy import indicators as kernels
 
 class TrendFollowingStrategy(BaseStrategy):
     def __init__(self, data: pd.DataFrame, risk_manager, fast_ma: int = 20, slow_ma: int = 50):
@@ -8,8 +9,9 @@ class TrendFollowingStrategy(BaseStrategy):
         self.slow_ma = slow_ma
     
     def generate_signals(self) -> pd.Series:
-        fast = self.data['close'].rolling(window=self.fast_ma).mean()
-        slow = self.data['close'].rolling(window=self.slow_ma).mean()
+        close = self.data['close'].to_numpy()
+        fast = kernels.sma(close, self.fast_ma)
+        slow = kernels.sma(close, self.slow_ma)
         signals = pd.Series(index=self.data.index, data=0)
         signals[fast > slow] = 1
         signals[fast < slow] = -1
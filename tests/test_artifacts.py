@@ -0,0 +1,106 @@
+import time
+import numpy as np
+import pandas as pd
+import pytest
+import lightgbm as lgb
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+from backtest.cache import data_fingerprint
+from ml_strategy.artifacts import ArtifactStore
+from ml_strategy.model import MLModel
+
+
+@pytest.fixture
+def training_data():
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(rng.normal(size=(1500, 4)), columns=['a', 'b', 'c', 'd'])
+    X.iloc[::11, 2] = np.nan
+    y = pd.Series(np.where(X['a'] + X['b'] * 0.5 + rng.normal(0, 0.3, 1500) > 0, 1, -1))
+    return X, y
+
+
+def test_random_forest_round_trip(training_data, tmp_path):
+    X, y = training_data
+    scaler = StandardScaler().fit(X)
+    forest = RandomForestClassifier(n_estimators=30, random_state=0).fit(scaler.transform(X), y)
+    store = ArtifactStore(str(tmp_path))
+
+    first = store.save('rf', forest, list(X.columns), scaler=scaler, data=X, metadata={'period': '2024'})
+    second = store.save('rf', forest, list(X.columns), scaler=scaler, data=X)
+    assert (first, second) == ('v0001', 'v0002')
+    assert store.versions('rf') == ['v0001', 'v0002']
+
+    start = time.perf_counter()
+    artifact = store.load('rf')
+    artifact.predict(X.iloc[-1:])
+    assert time.perf_counter() - start < 1.0
+
+    assert artifact.version == 'v0002'
+    assert isinstance(artifact.predictor.threshold, np.memmap)
+    assert artifact.data_fingerprint == data_fingerprint(X)
+    assert store.load('rf', 'v0001').manifest['metadata'] == {'period': '2024'}
+
+    # Colunas fora de ordem são reordenadas pela lista salva
+    shuffled = X[['d', 'c', 'b', 'a']]
+    np.testing.assert_allclose(artifact.predict_proba(shuffled),
+                               forest.predict_proba(scaler.transform(X)))
+    np.testing.assert_array_equal(artifact.predict(X), forest.predict(scaler.transform(X)))
+
+
+def test_lightgbm_round_trip(training_data, tmp_path):
+    X, y = training_data
+    labels = y + 1
+    boosters = [
+        lgb.train({'objective': 'multiclass', 'num_class': 3, 'num_leaves': 8, 'seed': seed,
+                   'feature_fraction': 0.9, 'verbosity': -1},
+                  lgb.Dataset(X, labels), 20)
+        for seed in range(2)
+    ]
+    model = MLModel()
+    model.model = boosters
+    model.feature_names_ = list(X.columns)
+    store = ArtifactStore(str(tmp_path))
+    store.save('ml', model, list(X.columns), data='abc')
+
+    artifact = store.load('ml')
+    expected = np.mean([booster.predict(X) for booster in boosters], axis=0)
+    np.testing.assert_allclose(artifact.predict_proba(X), expected, atol=1e-12)
+    np.testing.assert_array_equal(artifact.predict(X), expected.argmax(axis=1) - 1)
+
+    restored = artifact.load_model()
+    pd.testing.assert_series_equal(restored.predict(X), model.predict(X))
+
+
+def test_missing_model_and_feature_mismatch(training_data, tmp_path):
+    X, y = training_data
+    store = ArtifactStore(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        store.load('nothing')
+
+    forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X.fillna(0), y)
+    with pytest.raises(ValueError):
+        store.save('rf', forest, ['a', 'b'])
+    assert store.versions('rf') == []
+
+
+def test_enhanced_strategy_saves_training_slice_fingerprint(tmp_path):
+    from enhanced_strategy import EnhancedWDOStrategy
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2024-01-02 09:00', periods=3000, freq='5min')
+    close = 5000 + rng.normal(0, 2, len(index)).cumsum()
+    data = pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+                         'volume': rng.integers(1, 100, len(index)).astype(float)}, index=index)
+
+    strategy = EnhancedWDOStrategy(data)
+    store = ArtifactStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        strategy.save_model(store)
+
+    strategy.fit('2024-01-05', '2024-01-10')
+    artifact = store.load('enhanced_wdo', strategy.save_model(store))
+
+    start, end = artifact.manifest['metadata']['train_start'], artifact.manifest['metadata']['train_end']
+    assert pd.Timestamp(start) >= pd.Timestamp('2024-01-05')
+    assert pd.Timestamp(end) <= pd.Timestamp('2024-01-10 23:59')
+    assert artifact.data_fingerprint == data_fingerprint(data.loc[start:end])
+    assert artifact.data_fingerprint != data_fingerprint(data)
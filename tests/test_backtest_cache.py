@@ -0,0 +1,109 @@
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from backtest import Backtester, BacktestCache
+from backtest.cache import data_fingerprint, strategy_parameters
+from strategies import MeanReversionStrategy
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start='2024-01-02 09:00', periods=300, freq='min')
+    close = 5000 + rng.normal(0, 2, 300).cumsum()
+    return pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1,
+        'Close': close, 'Volume': rng.integers(1, 100, 300)
+    }, index=dates)
+
+
+def test_fingerprint_changes_with_data(sample_data):
+    changed = sample_data.copy()
+    changed.iloc[-1, changed.columns.get_loc('Close')] += 0.5
+
+    assert data_fingerprint(sample_data) == data_fingerprint(sample_data.copy())
+    assert data_fingerprint(sample_data) != data_fingerprint(changed)
+
+
+def test_backtester_uses_cache(sample_data, tmp_path):
+    cache = BacktestCache(str(tmp_path))
+
+    first = Backtester(MeanReversionStrategy(sample_data), cache=cache)
+    results = first.run()
+    assert cache.misses == 1
+
+    second = Backtester(MeanReversionStrategy(sample_data), cache=cache)
+    cached = second.run()
+    assert cache.hits == 1
+
+    pd.testing.assert_frame_equal(results, cached, check_freq=False)
+    assert second.stats == first.stats
+
+
+def test_key_depends_on_parameters(sample_data, tmp_path):
+    cache = BacktestCache(str(tmp_path))
+    key_a = cache.make_key(MeanReversionStrategy, {'window': 20}, sample_data)
+    key_b = cache.make_key(MeanReversionStrategy, {'window': 30}, sample_data)
+    key_c = cache.make_key(MeanReversionStrategy, {'window': 20}, data_fingerprint(sample_data))
+
+    assert key_a != key_b
+    assert key_a == key_c
+
+
+def test_lru_eviction(tmp_path):
+    frame = pd.DataFrame({'equity': np.arange(2000, dtype=float)})
+    cache = BacktestCache(str(tmp_path), max_size_mb=0.11)  # Cabem três entradas
+
+    for i in range(3):
+        cache.put(f'key{i}', frame, {'i': i})
+        os.utime(cache._path(f'key{i}'), (i + 1, i + 1))
+
+    # Leitura torna key0 a entrada mais recente; key1 passa a ser a mais antiga
+    assert cache.get('key0') is not None
+    cache.put('key3', frame, {'i': 3})
+
+    assert cache.get('key1') is None
+    for key in ['key0', 'key2', 'key3']:
+        assert cache.get(key) is not None
+
+
+class FittedThresholdStrategy(MeanReversionStrategy):
+    """Estratégia com estado treinado (array de limites) além dos parâmetros simples"""
+
+    def __init__(self, data, window=20):
+        super().__init__(data)
+        self.window = window
+        self.thresholds = np.zeros(2)
+
+    def fit(self, low, high):
+        self.thresholds = np.array([low, high])
+
+
+def test_trained_state_changes_key(sample_data, tmp_path):
+    strategy = FittedThresholdStrategy(sample_data)
+    before = strategy_parameters(strategy)
+    strategy.fit(-1.0, 1.0)
+    after = strategy_parameters(strategy)
+
+    assert before['window'] == after['window'] == 20
+    assert before['__state__']['thresholds'] != after['__state__']['thresholds']
+
+    cache = BacktestCache(str(tmp_path))
+    assert cache.make_key(FittedThresholdStrategy, before, sample_data) != \
+        cache.make_key(FittedThresholdStrategy, after, sample_data)
+
+    # Retreinar com o mesmo estado reproduz a chave
+    strategy.fit(-1.0, 1.0)
+    assert strategy_parameters(strategy) == after
+
+
+def test_unhashable_state_skips_cache(sample_data, tmp_path):
+    strategy = MeanReversionStrategy(sample_data)
+    strategy.callback = lambda signals: signals  # não serializável
+    assert strategy_parameters(strategy) is None
+
+    cache = BacktestCache(str(tmp_path))
+    Backtester(strategy, cache=cache).run()
+    assert cache.hits == cache.misses == 0
+    assert not os.listdir(tmp_path)
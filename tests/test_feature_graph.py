@@ -0,0 +1,145 @@
+import pytest
+import numpy as np
+import pandas as pd
+from ml_strategy.feature_graph import (FeaturePipeline, FeatureRegistry, add_window_block,
+                                       build_default_registry)
+from ml_strategy.feature_engineering import FeatureEngineer
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(1)
+    index = pd.date_range('2024-01-02 09:00', periods=300, freq='5min')
+    close = 5000 + np.cumsum(rng.normal(0, 2, len(index)))
+    return pd.DataFrame({
+        'High': close + rng.random(len(index)),
+        'Low': close - rng.random(len(index)),
+        'Close': close,
+        'Volume': rng.integers(100, 1000, len(index)).astype(float)
+    }, index=index)
+
+
+def test_computes_only_needed_nodes(ohlcv):
+    pipeline = FeaturePipeline(ohlcv)
+    features = pipeline.compute(['sma_dist_20', 'volume_ratio'])
+
+    assert list(features.columns) == ['sma_dist_20', 'volume_ratio']
+    assert set(pipeline._results) == {'close', 'sma_20', 'sma_dist_20',
+                                     'volume', 'volume_ma', 'volume_ratio'}
+    expected = ohlcv['Close'] / ohlcv['Close'].rolling(20).mean() - 1
+    np.testing.assert_allclose(features['sma_dist_20'], expected, rtol=1e-9, equal_nan=True)
+
+
+def test_shares_intermediates_and_memoizes_per_version(ohlcv):
+    pipeline = FeaturePipeline(ohlcv)
+    pipeline.compute(['volatility_5', 'volatility_15'])
+    assert pipeline.computations == 4  # close, returns e as duas volatilidades
+
+    pipeline.compute(['volatility_5', 'returns'])
+    assert pipeline.computations == 4
+
+    # Nova versão dos dados invalida os resultados memorizados
+    pipeline.data = ohlcv.iloc[:-1]
+    pipeline.compute(['volatility_5'])
+    assert pipeline.computations == 7
+
+
+def test_matches_pandas_indicators(ohlcv):
+    features = FeaturePipeline(ohlcv).compute(['rsi', 'atr', 'range_ma'])
+    close, high, low = ohlcv['Close'], ohlcv['High'], ohlcv['Low']
+
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    rsi = 100 - 100 / (1 + gain / loss)
+    tr = pd.concat([high - low, (high - close.shift()).abs(),
+                    (low - close.shift()).abs()], axis=1).max(axis=1)
+
+    np.testing.assert_allclose(features['rsi'], rsi, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(features['atr'], tr.rolling(14).mean(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(features['range_ma'], (high - low).rolling(20).mean(),
+                               rtol=1e-9, equal_nan=True)
+
+
+def test_lookback_and_errors():
+    registry = build_default_registry(windows=(5,))
+    assert registry.lookback(['volatility_5']) == 5  # retorno (1) + janela (4)
+    assert registry.lookback(['sma_dist_5', 'atr']) == 14
+
+    with pytest.raises(KeyError):
+        registry.resolve(['unknown'])
+
+    cyclic = FeatureRegistry()
+    cyclic.add('a', lambda b: b, ['b'])
+    cyclic.add('b', lambda a: a, ['a'])
+    with pytest.raises(ValueError):
+        cyclic.resolve(['a'])
+
+
+def test_feature_engineer_create_features(ohlcv):
+    engineer = FeatureEngineer(ohlcv)
+    features = engineer.create_features(['hour', 'momentum_5'])
+
+    np.testing.assert_array_equal(features['hour'], ohlcv.index.hour)
+    np.testing.assert_allclose(features['momentum_5'], ohlcv['Close'].pct_change(5),
+                               rtol=1e-12, equal_nan=True)
+
+
+def test_compute_hashes_data_once(ohlcv, monkeypatch):
+    import ml_strategy.feature_graph as graph_module
+    calls = []
+    fingerprint = graph_module.data_fingerprint
+    monkeypatch.setattr(graph_module, 'data_fingerprint',
+                        lambda data: calls.append(1) or fingerprint(data))
+
+    pipeline = FeaturePipeline(ohlcv)
+    pipeline.compute(['sma_5', 'sma_20', 'volatility_5', 'rsi', 'atr'])
+    assert len(calls) == 1
+
+    # Versão já calculada pelo chamador: nenhum hash adicional
+    pipeline.compute(['sma_50'], version=pipeline.version)
+    assert len(calls) == 1
+
+
+def test_feature_engineer_families_use_registry(ohlcv):
+    engineer = FeatureEngineer(ohlcv)
+    technical = engineer.create_technical_features(windows=(5, 7))
+
+    assert list(technical.columns) == ['returns', 'log_returns', 'sma_5', 'momentum_5', 'volatility_5',
+                                       'sma_7', 'momentum_7', 'volatility_7']
+    close = ohlcv['Close']
+    np.testing.assert_allclose(technical['sma_7'], close.rolling(7).mean(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(technical['volatility_7'], close.pct_change().rolling(7).std(),
+                               rtol=1e-9, equal_nan=True)
+    assert 'sma_7' not in build_default_registry().nodes
+
+    volume = engineer.create_volume_features()
+    np.testing.assert_allclose(volume['volume_ma'], ohlcv['Volume'].rolling(20).mean(),
+                               rtol=1e-9, equal_nan=True)
+
+
+def test_window_block_computes_all_windows_once(ohlcv):
+    registry = build_default_registry(windows=())
+    name = add_window_block(registry, (5, 15))
+    assert registry.lookback([name]) == 15
+
+    pipeline = FeaturePipeline(ohlcv, registry)
+    block = pipeline.block(name)
+    assert pipeline.computations == 4  # close, returns, log_returns e o bloco
+
+    # Colunas de cada janela são views do bloco, reaproveitadas por nome
+    assert np.shares_memory(block.to_numpy(), pipeline._results[name])
+    assert np.shares_memory(pipeline.values('volatility_15'), pipeline._results[name])
+    pipeline.compute(['sma_5', 'momentum_15'])
+    assert pipeline.computations == 4
+
+    # Alterar o DataFrame devolvido não altera o bloco memorizado
+    changed = pipeline.block(name)
+    changed.iloc[20, 2] = -1.0
+    assert pipeline.block(name).iloc[20, 2] == block.iloc[20, 2] != -1.0
+
+    close = ohlcv['Close']
+    np.testing.assert_allclose(block['sma_15'], close.rolling(15).mean(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(block['momentum_5'], close.pct_change(5), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(block['volatility_5'], close.pct_change().rolling(5).std(),
+                               rtol=1e-9, equal_nan=True)
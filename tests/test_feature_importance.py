@@ -0,0 +1,63 @@
+import pytest
+import pandas as pd
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+from analysis.feature_importance import FeatureImportanceAnalyzer, _block_positions
+
+
+@pytest.fixture
+def split_data():
+    rng = np.random.default_rng(7)
+    dates = pd.date_range(start='2024-01-02 09:00', periods=800, freq='5min')
+    X = pd.DataFrame({
+        'signal': rng.normal(size=800),
+        'noise': rng.normal(size=800),
+        'constant': np.ones(800)
+    }, index=dates)
+    y = pd.Series((X['signal'] > 0).astype(int), index=dates)
+    model = DecisionTreeClassifier(max_depth=3, random_state=0).fit(X.iloc[:500], y.iloc[:500])
+    return model, X.iloc[:500], y.iloc[:500], X.iloc[500:], y.iloc[500:]
+
+
+def test_block_positions_are_block_permutations():
+    positions = _block_positions(23, 5, 4, np.random.default_rng(0))
+
+    assert positions.shape == (4, 23)
+    for row in positions:
+        assert sorted(row) == list(range(23))
+        # Cada bloco aparece inteiro e em ordem: saltos só entre fim e início de blocos
+        breaks = np.flatnonzero(np.diff(row) != 1)
+        assert (row[breaks + 1] % 5 == 0).all()
+        assert ((row[breaks] % 5 == 4) | (row[breaks] == 22)).all()
+
+
+def test_ranking_and_costs(split_data):
+    model, X_train, y_train, X_test, y_test = split_data
+    costs = {'signal': 0.01, 'noise': 2.0, 'constant': 0.5}
+    analyzer = FeatureImportanceAnalyzer(model, X_test, y_test, X_train, y_train,
+                                         costs=costs, n_jobs=1, seed=3, batch_size=4)
+    ranking = analyzer.run(n_repeats=10, drop_column=True)
+
+    assert ranking.index[0] == 'signal'
+    assert ranking.loc['signal', 'importance'] > 0.3
+    assert ranking.loc['constant', 'importance'] == 0
+    assert ranking.loc['signal', 'drop_importance'] > 0.3
+    assert ranking['cost_share'].sum() == pytest.approx(1.0)
+    assert len(analyzer.permutation_scores['noise']) == 10
+
+    # Sem contribuição, das mais caras para as mais baratas
+    assert list(analyzer.prunable(threshold=0.01).index) == ['noise', 'constant']
+
+
+def test_parallel_matches_serial(split_data):
+    model, X_train, y_train, X_test, y_test = split_data
+    serial = FeatureImportanceAnalyzer(model, X_test, y_test, n_jobs=1, seed=5, batch_size=3)
+    parallel = FeatureImportanceAnalyzer(model, X_test, y_test, n_jobs=2, seed=5, batch_size=3)
+
+    pd.testing.assert_frame_equal(serial.run(n_repeats=7), parallel.run(n_repeats=7))
+
+
+def test_requires_time_order(split_data):
+    model, X_train, y_train, X_test, y_test = split_data
+    with pytest.raises(ValueError):
+        FeatureImportanceAnalyzer(model, X_train, y_train, X_test, y_test)
@@ -0,0 +1,98 @@
+import pytest
+import numpy as np
+import pandas as pd
+from backtest.cache import BacktestCache
+from ml_strategy.data_processor import DataProcessor
+from ml_strategy.feature_engineering import FeatureEngineer
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2024-01-02 09:00', periods=400, freq='5min')
+    close = 5000 + np.cumsum(rng.normal(0, 2, len(index)))
+    return pd.DataFrame({'Close': close, 'Volume': rng.integers(100, 1000, len(index)).astype(float)},
+                        index=index)
+
+
+def _reference(data):
+    engineer = FeatureEngineer(data)
+    features = pd.concat([engineer.create_technical_features(),
+                          engineer.create_volume_features(),
+                          engineer.create_time_features()], axis=1)
+    return features.replace([np.inf, -np.inf], np.nan).dropna()
+
+
+def test_features_computed_once(ohlcv):
+    processor = DataProcessor(ohlcv)
+    first = processor.prepare_features()
+    second = processor.prepare_features()
+
+    pd.testing.assert_frame_equal(first, _reference(ohlcv))
+    pd.testing.assert_frame_equal(first, second)
+    assert processor.feature_store.computations == 3
+
+
+def test_subsets_by_columns_and_range(ohlcv):
+    processor = DataProcessor(ohlcv)
+    start, end = ohlcv.index[100], ohlcv.index[200]
+    subset = processor.prepare_features(['sma_5', 'hour'], start, end)
+
+    expected = _reference(ohlcv).loc[start:end, ['sma_5', 'hour']]
+    pd.testing.assert_frame_equal(subset, expected)
+
+    # Alterar o subconjunto não afeta o armazenamento
+    subset.iloc[:, 0] = 0.0
+    assert (processor.prepare_features(['sma_5']).loc[start:end, 'sma_5'] != 0).all()
+
+
+def test_new_data_version_recomputes(ohlcv):
+    processor = DataProcessor(ohlcv)
+    processor.prepare_features()
+
+    ohlcv.iloc[-1, ohlcv.columns.get_loc('Close')] += 10
+    features = processor.prepare_features()
+
+    assert processor.feature_store.computations == 6
+    pd.testing.assert_frame_equal(features, _reference(ohlcv))
+
+
+def test_disk_cache_shared_between_processors(ohlcv, tmp_path):
+    cache = BacktestCache(str(tmp_path))
+    DataProcessor(ohlcv, disk_cache=cache).prepare_features()
+
+    processor = DataProcessor(ohlcv.copy(), disk_cache=cache)
+    features = processor.prepare_features()
+
+    assert processor.feature_store.computations == 0
+    pd.testing.assert_frame_equal(features, _reference(ohlcv), check_freq=False)
+
+
+def test_column_costs(ohlcv, tmp_path):
+    processor = DataProcessor(ohlcv, disk_cache=BacktestCache(str(tmp_path)))
+    costs = processor.feature_store.column_costs()
+
+    assert set(costs.index) == set(processor.prepare_features().columns)
+    assert (costs > 0).all()
+
+    # Tempos de cálculo vêm junto com o cache em disco
+    other = DataProcessor(ohlcv, disk_cache=BacktestCache(str(tmp_path)))
+    pd.testing.assert_series_equal(other.feature_store.column_costs(), costs)
+    assert other.feature_store.computations == 0
+
+
+def test_data_hashed_once_per_call(ohlcv, monkeypatch):
+    import ml_strategy.feature_store as store_module
+    import ml_strategy.feature_graph as graph_module
+    calls = []
+    fingerprint = store_module.data_fingerprint
+    counted = lambda data: calls.append(1) or fingerprint(data)
+    monkeypatch.setattr(store_module, 'data_fingerprint', counted)
+    monkeypatch.setattr(graph_module, 'data_fingerprint', counted)
+
+    processor = DataProcessor(ohlcv)
+    processor.prepare_features()
+    assert len(calls) == 1
+
+    processor.feature_store.column_costs()
+    assert len(calls) == 2
@@ -0,0 +1,104 @@
+import pytest
+import pandas as pd
+import numpy as np
+from backtest import FillSimulator
+from backtest.fill_simulator import ORDER_MARKET, ORDER_STOP, ORDER_LIMIT
+from backtest.trade_log import EXIT_STOP, EXIT_TAKE_PROFIT, EXIT_SIGNAL, EXIT_END_OF_DATA
+
+
+@pytest.fixture
+def bars():
+    dates = pd.date_range(start='2024-01-02 09:00', periods=6, freq='5min')
+    return pd.DataFrame({
+        'open':  [5000.0, 5001.0, 5003.0, 4995.0, 5000.0, 5002.0],
+        'high':  [5002.0, 5004.0, 5006.0, 5001.0, 5010.0, 5004.0],
+        'low':   [4999.0, 5000.0, 5001.0, 4990.0, 4998.0, 5000.0],
+        'close': [5001.0, 5003.0, 5002.0, 5000.0, 5002.0, 5003.0],
+    }, index=dates)
+
+
+def test_fill_orders(bars):
+    simulator = FillSimulator.from_frame(bars, slippage_ticks=1)
+    fills = simulator.fill_orders(
+        bar=[0, 0, 0, 2, 0],
+        side=[1, 1, -1, 1, 1],
+        order_type=[ORDER_MARKET, ORDER_STOP, ORDER_LIMIT, ORDER_LIMIT, ORDER_STOP],
+        price=[np.nan, 5005.0, 5003.0, 4998.0, 5020.0],
+        valid_bars=2
+    )
+
+    np.testing.assert_array_equal(fills['filled'], [True, True, True, True, False])
+    np.testing.assert_array_equal(fills['fill_idx'], [1, 2, 1, 3, -1])
+    # Mercado: abertura + 1 tick; stop: nível + 1 tick; limites no preço
+    np.testing.assert_allclose(fills['fill_price'][:4], [5001.5, 5005.5, 5003.0, 4995.0])
+
+
+def test_intrabar_path_decides_same_bar(bars):
+    kwargs = dict(entry_idx=[1], side=[1], entry_price=[5001.0],
+                  stop_price=[4999.0], target_price=[5009.0])
+
+    # Barra 3 atinge o stop; barra 4 atingiria o alvo
+    trades = FillSimulator.from_frame(bars).simulate_exits(**kwargs)
+    assert trades.records['exit_reason'][0] == EXIT_STOP
+    assert trades.records['exit_idx'][0] == 3
+    # Abertura da barra 3 (4995) já abaixo do stop: executa no gap
+    assert trades.records['exit_price'][0] == 4995.0
+
+    # Stop e alvo na barra 4
+    kwargs = dict(entry_idx=[4], side=[1], entry_price=[5000.0],
+                  stop_price=[4998.5], target_price=[5009.0])
+    pessimistic = FillSimulator.from_frame(bars, intrabar_path='pessimistic').simulate_exits(**kwargs)
+    optimistic = FillSimulator.from_frame(bars, intrabar_path='optimistic').simulate_exits(**kwargs)
+    nearest = FillSimulator.from_frame(bars, intrabar_path='nearest').simulate_exits(**kwargs)
+
+    assert pessimistic.records['exit_reason'][0] == EXIT_STOP
+    assert optimistic.records['exit_reason'][0] == EXIT_TAKE_PROFIT
+    assert optimistic.records['exit_price'][0] == 5009.0
+    # Mínima (4998) mais próxima da abertura que a máxima (5010)
+    assert nearest.records['exit_reason'][0] == EXIT_STOP
+
+
+def test_simulate_signals_honors_stop(bars):
+    simulator = FillSimulator.from_frame(bars)
+    signals = pd.Series([1, 1, 1, 1, 0, 0], index=bars.index)
+
+    trades = simulator.simulate_signals(signals, stop_distance=3.0)
+    record = trades.records[0]
+
+    # Entrada na abertura da barra 1 (5001), stop 4998 atingido no gap da barra 3
+    assert record['entry_idx'] == 1
+    assert record['exit_idx'] == 3
+    assert record['exit_reason'] == EXIT_STOP
+    assert record['pnl'] == pytest.approx(4995.0 - 5001.0)
+
+    # Sem stop a saída ocorre na abertura após a mudança de sinal
+    trades = simulator.simulate_signals(signals)
+    assert trades.records['exit_idx'][0] == 5
+    assert trades.records['exit_reason'][0] == EXIT_SIGNAL
+    assert trades.records['exit_price'][0] == 5002.0
+
+
+def test_open_position_at_end(bars):
+    signals = np.array([0, -1, -1, -1, -1, -1], dtype=float)
+    trades = FillSimulator.from_frame(bars).simulate_signals(signals, stop_distance=100.0)
+
+    assert trades.records['exit_reason'][0] == EXIT_END_OF_DATA
+    assert trades.records['exit_price'][0] == 5003.0
+
+
+def test_many_orders_across_blocks():
+    rng = np.random.default_rng(1)
+    close = 5000 + rng.normal(0, 2, 5000).cumsum()
+    data = pd.DataFrame({'open': close, 'high': close + 3, 'low': close - 3, 'close': close})
+    simulator = FillSimulator.from_frame(data, block_size=16)
+
+    entries = np.arange(0, 4900, 7)
+    trades = simulator.simulate_exits(entries, np.ones(len(entries)), close[entries],
+                                      stop_price=close[entries] - 20)
+    stopped = trades.records['exit_reason'] == EXIT_STOP
+
+    # Cada stop executado é o primeiro cruzamento da mínima após a entrada
+    for record in trades.records[stopped][:50]:
+        window = data['low'].values[record['entry_idx']:record['exit_idx'] + 1]
+        stop = simulator.round_to_tick(record['entry_price'] - 20)
+        assert np.argmax(window <= stop) == record['exit_idx'] - record['entry_idx']
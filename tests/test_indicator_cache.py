@@ -0,0 +1,53 @@
+import pytest
+import pandas as pd
+import numpy as np
+from strategies import IndicatorCache, MeanReversionEnhanced
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start='2024-01-02 09:00', periods=600, freq='min')
+    close = 5000 + rng.normal(0, 2, 600).cumsum()
+    return pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1,
+        'Close': close, 'Volume': rng.integers(1, 100, 600)
+    }, index=dates)
+
+
+def test_indicators_computed_once(sample_data):
+    cache = IndicatorCache()
+    close = cache.source(sample_data, 'Close')
+
+    first = cache.rolling_mean(close, 20)
+    second = cache.rolling_mean(cache.source(sample_data, 'Close'), 20)
+
+    assert first is second
+    pd.testing.assert_series_equal(first, sample_data['Close'].rolling(20).mean())
+    assert cache.misses == 2  # coluna + média
+    assert cache.hits == 2
+
+
+def test_distinct_sources_not_shared(sample_data):
+    cache = IndicatorCache()
+    a = cache.rolling_std(sample_data['Close'], 10)
+    b = cache.rolling_std(sample_data['Close'] * 2, 10)
+
+    np.testing.assert_allclose(b.dropna(), 2 * a.dropna())
+
+
+def test_lru_limit(sample_data):
+    cache = IndicatorCache(maxsize=3)
+    close = sample_data['Close']
+    for window in range(2, 8):
+        cache.rolling_mean(close, window)
+
+    assert len(cache) == 3
+
+
+def test_enhanced_strategy_reuses_indicators(sample_data):
+    strategy = MeanReversionEnhanced(sample_data)
+
+    # 36 combinações, mas apenas janelas distintas são calculadas
+    assert strategy.indicators.hits > strategy.indicators.misses
+    assert set(strategy.params) == {'sma_window', 'bb_std', 'rsi_window'}
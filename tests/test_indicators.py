@@ -0,0 +1,189 @@
+import pytest
+import numpy as np
+import pandas as pd
+from ml_strategy import indicators
+from ml_strategy.indicators import (sma, stddev, ema, wilder, rsi, true_range, atr,
+                                    bollinger, macd, adx, directional_movement,
+                                    benchmark_indicators)
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(4)
+    close = 5000 + np.round(rng.normal(0, 2, 1500).cumsum() * 2) / 2
+    close[600:640] = close[600]  # trecho lateral
+    return {'close': close, 'high': close + rng.random(1500), 'low': close - rng.random(1500)}
+
+
+def _wilder_reference(values, window):
+    out = np.full(len(values), np.nan)
+    first = np.flatnonzero(np.isfinite(values))[0]
+    out[first + window - 1] = values[first:first + window].mean()
+    for i in range(first + window, len(values)):
+        out[i] = (out[i - 1] * (window - 1) + values[i]) / window
+    return out
+
+
+def _std_reference(values, window, ddof):
+    # Referência exata (o rolling std do pandas acumula resíduo em trechos laterais)
+    out = np.full(len(values), np.nan)
+    out[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).std(axis=1, ddof=ddof)
+    return out
+
+
+def test_moving_averages_match_pandas(prices):
+    close = pd.Series(prices['close'])
+
+    np.testing.assert_allclose(sma(prices['close'], 20), close.rolling(20).mean(), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(stddev(prices['close'], 20), _std_reference(prices['close'], 20, 1),
+                               atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(ema(prices['close'], 20, seed='first'),
+                               close.ewm(span=20, adjust=False).mean(), rtol=1e-12)
+
+    # Semente talib: média das primeiras barras
+    seeded = ema(prices['close'], 10)
+    assert np.isnan(seeded[:9]).all()
+    assert seeded[9] == pytest.approx(prices['close'][:10].mean())
+
+
+def test_ema_and_macd_carry_over_missing_values(prices):
+    close = pd.Series(prices['close'])
+    close[[0, 200, 201, 900]] = np.nan
+    close[1000:1050] = np.nan
+
+    for alpha in (0.1, 0.3):
+        expected = close.ewm(alpha=alpha, adjust=False).mean()
+        np.testing.assert_allclose(ema(close.to_numpy(), alpha=alpha, seed='first'), expected, rtol=1e-12,
+                                   equal_nan=True)
+    line, signal_line, histogram = macd(close.to_numpy())
+    expected = indicators._pandas_macd(close)
+    for result, reference in zip((line, signal_line, histogram), expected):
+        np.testing.assert_allclose(result, reference, rtol=1e-9, atol=1e-9, equal_nan=True)
+    assert np.isfinite(line[1:]).all()
+
+    # Semente 'sma' depende do período: alpha sozinho não basta
+    with pytest.raises(ValueError):
+        ema(close.to_numpy(), alpha=0.1)
+    assert np.isfinite(ema(close.to_numpy(), 10, alpha=0.1)[10:]).all()
+
+
+def test_wilder_rsi_and_atr(prices):
+    close, high, low = prices['close'], prices['high'], prices['low']
+    delta = np.r_[np.nan, np.diff(close)]
+    gains = _wilder_reference(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0)), 14)
+    losses = _wilder_reference(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0)), 14)
+    np.testing.assert_allclose(rsi(close, 14), 100 - 100 / (1 + gains / losses), rtol=1e-9, equal_nan=True)
+
+    tr = true_range(high, low, close)
+    np.testing.assert_allclose(atr(high, low, close, 14), _wilder_reference(np.r_[np.nan, tr[1:]], 14),
+                               rtol=1e-9, equal_nan=True)
+    assert np.isnan(atr(high, low, close, 14)[:14]).all()
+
+
+def test_simple_rsi_matches_pandas_version(prices):
+    close = pd.Series(prices['close'])
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    expected = 100 - 100 / (1 + gain / loss)
+
+    result = rsi(prices['close'], 14, smoothing='simple')
+    np.testing.assert_allclose(result, expected, rtol=1e-9, equal_nan=True)
+    # Trecho lateral: sem ganhos nem perdas
+    assert np.isnan(result[630])
+
+    # Janela longa (contagem de altas acima de 2⁸) e preço ausente
+    gapped = close.copy()
+    gapped[700] = np.nan
+    delta = gapped.diff()
+    gain = delta.where(delta > 0, 0).rolling(300).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(300).mean()
+    np.testing.assert_allclose(rsi(gapped.to_numpy(), 300, smoothing='simple'),
+                               100 - 100 / (1 + gain / loss), rtol=1e-9, equal_nan=True)
+
+
+def test_bands_macd_and_adx(prices):
+    close = pd.Series(prices['close'])
+    upper, middle, lower = bollinger(prices['close'], 20, 2.0, ddof=0)
+    np.testing.assert_allclose(upper - middle, 2 * _std_reference(prices['close'], 20, 0), atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(middle - lower, upper - middle, atol=1e-9, equal_nan=True)
+
+    line, signal, histogram = macd(prices['close'])
+    expected = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    np.testing.assert_allclose(line, expected, atol=1e-9)
+    np.testing.assert_allclose(histogram, line - signal)
+
+    result, plus_di, minus_di = adx(prices['high'], prices['low'], prices['close'], 14)
+    assert np.isnan(result[:27]).all()
+    valid = result[27:]
+    assert ((valid >= 0) & (valid <= 100)).all()
+    assert (plus_di[14:] >= 0).all() and (minus_di[14:] >= 0).all()
+
+
+def test_directional_movement(prices):
+    high, low, close = prices['high'], prices['low'], prices['close']
+    result, plus_di, minus_di, average_tr, tr = directional_movement(high, low, close, 14)
+
+    np.testing.assert_array_equal(tr, true_range(high, low, close))
+    np.testing.assert_allclose(average_tr, atr(high, low, close, 14, smoothing='wilder'), equal_nan=True)
+
+    # Referência: +DM/-DM com Wilder, DX e ADX como no talib
+    up = np.r_[np.nan, np.diff(high)]
+    down = np.r_[np.nan, -np.diff(low)]
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    plus_dm[0] = minus_dm[0] = np.nan
+    expected_plus = 100 * _wilder_reference(plus_dm, 14) / average_tr
+    expected_minus = 100 * _wilder_reference(minus_dm, 14) / average_tr
+    np.testing.assert_allclose(plus_di, expected_plus, atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(minus_di, expected_minus, atol=1e-9, equal_nan=True)
+    dx = 100 * np.abs(expected_plus - expected_minus) / (expected_plus + expected_minus)
+    np.testing.assert_allclose(result, _wilder_reference(dx, 14), atol=1e-9, equal_nan=True)
+
+    # adx() e o buffer (5, barras) usam o mesmo núcleo
+    out = np.empty((5, len(close)))
+    directional_movement(high, low, close, 14, out=out)
+    for line, expected in zip(adx(high, low, close, 14), out[:3]):
+        np.testing.assert_array_equal(line, expected)
+
+
+def test_wilder_rows(prices):
+    close = prices['close']
+    shifted = np.r_[np.nan, close[1:]]
+    smoothed = wilder(np.vstack([close, shifted, close]), 14)
+    np.testing.assert_allclose(smoothed[0], _wilder_reference(close, 14), equal_nan=True)
+    np.testing.assert_allclose(smoothed[1], _wilder_reference(shifted, 14), equal_nan=True)
+    np.testing.assert_array_equal(smoothed[0], smoothed[2])
+
+    # Sem variação: DI e ADX zerados em vez de NaN
+    flat = np.full(100, 5000.0)
+    result, plus_di, minus_di, _, _ = directional_movement(flat, flat, flat, 14)
+    assert (plus_di[14:] == 0).all() and (result[27:] == 0).all()
+
+
+def test_out_buffers_and_float32(prices):
+    close32 = prices['close'].astype(np.float32)
+    assert sma(close32, 20).dtype == np.float32
+    assert rsi(close32, 14).dtype == np.float32
+
+    buffer = np.empty(len(close32), dtype=np.float32)
+    assert ema(close32, 20, out=buffer) is buffer
+    np.testing.assert_allclose(buffer, ema(prices['close'], 20), rtol=1e-6, equal_nan=True)
+
+    bands = np.empty((3, len(close32)))
+    upper, middle, lower = bollinger(prices['close'], out=bands)
+    assert np.shares_memory(upper, bands)
+
+    with pytest.raises(ValueError):
+        sma(prices['close'], 20, out=np.empty(10))
+    with pytest.raises(ValueError):
+        rsi(prices['close'], 14, smoothing='exponential')
+
+
+def test_benchmark(prices):
+    report = benchmark_indicators(n_bars=5000, repeats=1)
+
+    assert set(report.index) == {'sma', 'ema', 'rsi', 'atr', 'bollinger', 'macd', 'adx'}
+    assert (report['max_abs_diff'].dropna() < 1e-4).all()
+    assert np.isnan(report.loc['adx', 'max_abs_diff'])
+    assert (report[['numpy_peak_mb', 'pandas_peak_mb']] >= 0).all().all()
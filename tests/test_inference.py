@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+import lightgbm as lgb
+from ml_strategy.inference import CompiledEnsemble, _FlatTrees, benchmark_latency
+
+
+@pytest.fixture(scope='module')
+def boosters():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(3000, 8))
+    y = np.digitize(X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.5, 3000), [-0.5, 0.5])
+    X[rng.random(X.shape) < 0.02] = np.nan
+    models = []
+    for seed in range(3):
+        train = lgb.Dataset(X[:2400], y[:2400])
+        valid = lgb.Dataset(X[2400:], y[2400:], reference=train)
+        models.append(lgb.train(
+            {'objective': 'multiclass', 'num_class': 3, 'num_leaves': 16,
+             'feature_fraction': 0.9, 'seed': seed, 'verbosity': -1},
+            train, 200, valid_sets=[valid],
+            callbacks=[lgb.early_stopping(10, verbose=False)]
+        ))
+    return models, X
+
+
+def _reference(models, X):
+    return np.mean([model.predict(X, num_iteration=model.best_iteration) for model in models], axis=0)
+
+
+def test_batch_matches_booster_average(boosters):
+    models, X = boosters
+    ensemble = CompiledEnsemble(models, n_threads=2)
+
+    np.testing.assert_allclose(ensemble.predict_batch(X[:500], block_size=128),
+                               _reference(models, X[:500]), atol=1e-12)
+
+
+def test_row_prediction_with_float32_buffer(boosters):
+    models, X = boosters
+    ensemble = CompiledEnsemble(models)
+    rows = X[:50].astype(np.float32)
+    expected = _reference(models, rows)
+
+    row = np.empty(X.shape[1], dtype=np.float32)
+    out = np.empty(3)
+    for i in range(len(rows)):
+        row[:] = rows[i]
+        np.testing.assert_allclose(ensemble.predict_row(row, out), expected[i], atol=1e-12)
+        assert ensemble.predict_signal(row) == int(np.argmax(expected[i])) - 1
+
+
+def test_row_path_matches_vectorized_traversal(boosters):
+    models, X = boosters
+    ensemble = CompiledEnsemble(models)
+    rows = X[~np.isnan(X).any(axis=1)][:100]
+
+    for row in rows:
+        np.testing.assert_array_equal(ensemble._traverse_row(row), ensemble._traverse(row[None, :])[0])
+
+
+class _BoosterLoop:
+    """Referência da inferência ao vivo: ``Booster.predict`` de cada fold sobre uma barra"""
+
+    def __init__(self, models):
+        self.models = models
+        self.n_classes = 3
+
+    def predict_row(self, row, out):
+        row = row.reshape(1, -1)
+        out[:] = np.mean([model.predict(row) for model in self.models], axis=0)
+        return out
+
+
+def test_row_path_beats_booster_loop():
+    # Ensemble do tamanho usado em produção: 5 folds, ~1000 árvores
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(3000, 15))
+    y = np.digitize(X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.5, 3000), [-0.5, 0.5])
+    models = [lgb.train({'objective': 'multiclass', 'num_class': 3, 'num_leaves': 64,
+                         'max_depth': 8, 'bagging_fraction': 0.9, 'bagging_freq': 1,
+                         'seed': seed, 'verbosity': -1},
+                        lgb.Dataset(X, y), 70) for seed in range(5)]
+    ensemble = CompiledEnsemble(models)
+    assert ensemble.n_trees == 1050
+
+    compiled = benchmark_latency(ensemble, X, n_runs=300)
+    loop = benchmark_latency(_BoosterLoop(models), X, n_runs=300)
+    assert compiled['p50_us'] < loop['p50_us']
+
+
+def test_benchmark_latency_keys(boosters):
+    models, X = boosters
+    stats = benchmark_latency(CompiledEnsemble(models), X, n_runs=20, warmup=2)
+
+    assert set(stats) == {'p50_us', 'p99_us', 'mean_us', 'max_us'}
+    assert 0 < stats['p50_us'] <= stats['p99_us'] <= stats['max_us']
+
+
+def test_rejects_wrong_feature_count(boosters):
+    models, X = boosters
+    with pytest.raises(ValueError):
+        CompiledEnsemble(models).predict_batch(X[:, :3])
+
+
+def test_flat_trees_is_abstract():
+    with pytest.raises(TypeError):
+        _FlatTrees()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ml_strategy.labeling import (forward_returns, horizon_labels, triple_barrier_labels,
+                                  volatility_thresholds)
+
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(5)
+    index = pd.date_range('2024-01-02 09:00', periods=1500, freq='min')
+    return pd.Series(5000 + np.cumsum(rng.normal(0, 2, len(index))), index=index)
+
+
+def test_horizon_labels_match_fixed_threshold_rule(close):
+    labels = horizon_labels(close, [1, 5, 30], threshold=0.0003)
+
+    for horizon in (1, 5, 30):
+        future = close.pct_change(horizon).shift(-horizon)
+        expected = pd.Series(1, index=close.index)
+        expected[future > 0.0003] = 2
+        expected[future < -0.0003] = 0
+        assert (labels[f'label_{horizon}'] == expected).all()
+
+
+def test_volatility_scaled_labels(close):
+    labels = horizon_labels(close, [5], threshold=None, volatility_window=30)
+    limits = volatility_thresholds(close, [5], window=30)[:, 0]
+    returns = forward_returns(close, [5])[:, 0]
+
+    calls = labels['label_5'].to_numpy() == 2
+    assert calls.any()
+    np.testing.assert_array_equal(calls, np.nan_to_num(returns > limits))
+    np.testing.assert_allclose(limits[30:], close.pct_change().rolling(30).std()[30:] * np.sqrt(5))
+
+
+def _first_touch(values, t, horizon, upper, lower):
+    for k in range(1, horizon + 1):
+        if t + k >= len(values):
+            break
+        ret = values[t + k] / values[t] - 1
+        up, down = ret >= upper, ret <= -lower
+        if up or down:
+            return (1 if up and down else 2 if up else 0), k
+    return 1, horizon
+
+
+def test_triple_barrier_matches_loop(close):
+    values = close.to_numpy()
+    upper = np.linspace(0.0005, 0.002, len(close))
+    labels = triple_barrier_labels(close, [3, 20], upper=upper, lower=0.001, chunk_size=97)
+
+    for horizon in (3, 20):
+        for t in range(0, len(close), 7):
+            label, touch = _first_touch(values, t, horizon, upper[t], 0.001)
+            assert labels[f'label_{horizon}'].iloc[t] == label
+            assert labels[f'touch_{horizon}'].iloc[t] == touch
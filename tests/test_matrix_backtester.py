@@ -0,0 +1,71 @@
+import pytest
+import pandas as pd
+import numpy as np
+from backtest import Backtester, MatrixBacktester
+
+
+class FixedSignalStrategy:
+    def __init__(self, data, signals):
+        self.data = data
+        self.signals = signals
+
+    def generate_signals(self):
+        return self.signals
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(42)
+    dates = pd.date_range(start='2024-01-02 09:00', periods=500, freq='min')
+    close = 5000 + rng.normal(0, 1, 500).cumsum()
+    return pd.DataFrame({'Close': close}, index=dates)
+
+
+@pytest.fixture
+def signal_matrix(sample_data):
+    rng = np.random.default_rng(7)
+    return rng.integers(-1, 2, size=(20, len(sample_data))).astype(float)
+
+
+def test_matches_single_backtester(sample_data, signal_matrix):
+    matrix = MatrixBacktester(sample_data['Close'])
+    results = matrix.run(signal_matrix)
+
+    for row in [0, 5, 19]:
+        signals = pd.Series(signal_matrix[row], index=sample_data.index)
+        portfolio = Backtester(FixedSignalStrategy(sample_data, signals)).run()
+
+        np.testing.assert_allclose(results['equity'][row], portfolio['equity'].values)
+        np.testing.assert_allclose(results['costs'][row], portfolio['costs'].values)
+
+
+def test_stats_shape_and_drawdown(sample_data, signal_matrix):
+    results = MatrixBacktester(sample_data['Close']).run(signal_matrix, chunk_size=3)
+    stats = results['stats']
+
+    assert len(stats) == 20
+    assert (stats['max_drawdown'] <= 0).all()
+
+    equity = results['equity'][4]
+    peak = np.maximum.accumulate(equity)
+    assert stats['max_drawdown'].iloc[4] == pytest.approx(((equity - peak) / peak).min())
+    assert stats['total_trades'].iloc[4] == np.count_nonzero(np.diff(signal_matrix[4]))
+
+
+def test_dataframe_input_and_stats_only(sample_data, signal_matrix):
+    frame = pd.DataFrame(signal_matrix.T, index=sample_data.index,
+                         columns=[f'var_{i}' for i in range(20)])
+    matrix = MatrixBacktester(sample_data['Close'])
+
+    full = matrix.run(frame)
+    light = matrix.run(frame, return_curves=False)
+
+    assert 'equity' not in light
+    assert list(light['stats'].index) == list(frame.columns)
+    pd.testing.assert_frame_equal(full['stats'], light['stats'])
+    assert matrix.equity_frame(full).shape == (len(sample_data), 20)
+
+
+def test_rejects_misaligned_signals(sample_data):
+    with pytest.raises(ValueError):
+        MatrixBacktester(sample_data['Close']).run(np.zeros((2, 10)))
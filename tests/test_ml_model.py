@@ -0,0 +1,177 @@
+import pytest
+import numpy as np
+import pandas as pd
+from ml_strategy.model import (HyperparameterOptimizer, MLModel, balanced_sample_weights,
+                               build_dataset, time_decay_weights)
+
+SMALL_GRID = {
+    'learning_rate': [0.1, 0.2],
+    'max_depth': [4],
+    'num_leaves': [8, 16],
+    'min_child_samples': [20]
+}
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(1500, 6)), columns=[f'f{i}' for i in range(6)])
+    score = X['f0'] + 0.5 * X['f1'] + rng.normal(0, 0.5, 1500)
+    y = pd.Series(np.digitize(score, [-0.5, 0.5]), index=X.index)
+    return X, y
+
+
+def test_balanced_weights(sample_data):
+    _, y = sample_data
+    weights = balanced_sample_weights(y)
+
+    totals = weights.groupby(y).sum()
+    np.testing.assert_allclose(totals, len(y) / 3)
+
+
+def test_halving_search_keeps_fold_boosters(sample_data):
+    X, y = sample_data
+    optimizer = HyperparameterOptimizer(X.values, y, method='halving', n_splits=3,
+                                        param_grid=SMALL_GRID, eta=2, min_rows=200,
+                                        num_boost_round=200, early_stopping_rounds=10)
+    best = optimizer.optimize()
+
+    assert best in optimizer.results_[list(SMALL_GRID)].to_dict('records')
+    assert len(optimizer.best_models_) == 3
+    assert all(0 < model.best_iteration <= 200 for model in optimizer.best_models_)
+    # 4 candidatos -> 2 -> 1 com eta=2; folds e paciência crescem com o orçamento
+    rungs = optimizer.results_.groupby('rung')
+    assert rungs.size().tolist() == [4, 2, 1]
+    assert rungs['n_folds'].first().tolist() == [1, 2, 3]
+    assert rungs['num_boost_round'].first().tolist() == [50, 100, 200]
+    assert rungs['early_stopping_rounds'].first().tolist() == [3, 5, 10]
+
+
+def test_halving_rung_count_is_exact():
+    assert HyperparameterOptimizer._n_rungs(81, 3) == 5
+    assert HyperparameterOptimizer._n_rungs(80, 3) == 4
+    assert HyperparameterOptimizer._n_rungs(243, 3) == 6
+    assert HyperparameterOptimizer._n_rungs(1000, 10) == 4
+    assert HyperparameterOptimizer._n_rungs(1, 3) == 1
+
+
+def test_unknown_method(sample_data):
+    X, y = sample_data
+    with pytest.raises(ValueError):
+        HyperparameterOptimizer(X.values, y, method='bayes').optimize()
+
+
+def test_grid_search_on_shared_dataset(sample_data):
+    X, y = sample_data
+    optimizer = HyperparameterOptimizer(X.values, y, method='grid', n_splits=3,
+                                        param_grid=SMALL_GRID)
+    best = optimizer.optimize()
+
+    results = optimizer.results_
+    best_row = results[(results[list(best)] == pd.Series(best)).all(axis=1)]
+    assert len(results) == 4
+    assert best_row['accuracy'].iloc[0] == results['accuracy'].max()
+
+
+def test_grid_search_ignores_dataset_weights(sample_data):
+    X, y = sample_data
+    weighted = build_dataset(X.values, y, balanced_sample_weights(y) * np.linspace(0.2, 2, len(y)))
+
+    # Como o GridSearchCV original: sem pesos, candidatos em paralelo
+    parallel = HyperparameterOptimizer(X.values, y, method='grid', n_splits=3,
+                                       param_grid=SMALL_GRID, dataset=weighted, n_jobs=2)
+    serial = HyperparameterOptimizer(X.values, y, method='grid', n_splits=3,
+                                     param_grid=SMALL_GRID, n_jobs=1)
+
+    assert parallel.optimize() == serial.optimize()
+    np.testing.assert_allclose(parallel.results_['accuracy'], serial.results_['accuracy'])
+
+
+@pytest.mark.parametrize('search', ['halving', 'grid'])
+def test_mlmodel_train_predict_without_scaler(sample_data, monkeypatch, search):
+    import ml_strategy.model as model_module
+    monkeypatch.setattr(model_module, 'PARAM_GRID', SMALL_GRID)
+    X, y = sample_data
+
+    model = MLModel(search=search)
+    model.train(X, y)
+    signals = model.predict(X.iloc[-200:])
+
+    assert model.scaler is None
+    assert len(model.model) == 5
+    assert set(signals.unique()) <= {-1, 0, 1}
+    assert (signals == y.iloc[-200:] - 1).mean() > 0.5
+
+
+def test_mlmodel_compile_matches_fold_average(sample_data, monkeypatch):
+    import ml_strategy.model as model_module
+    monkeypatch.setattr(model_module, 'PARAM_GRID', SMALL_GRID)
+    X, y = sample_data
+
+    model = MLModel()
+    model.train(X, y)
+    ensemble = model.compile()
+
+    expected = np.mean([booster.predict(X.to_numpy()) for booster in model.model], axis=0)
+    np.testing.assert_allclose(ensemble.predict_batch(X.to_numpy()), expected, atol=1e-12)
+
+
+def test_update_drop_oldest_slides_training_window(sample_data, monkeypatch):
+    import ml_strategy.model as model_module
+    monkeypatch.setattr(model_module, 'PARAM_GRID', SMALL_GRID)
+    X, y = sample_data
+    X_old, y_old = X.iloc[:750], y.iloc[:750]
+    model = MLModel()
+    model.train(X_old, y_old)
+
+    # Regime novo com a relação invertida, com tantas barras quanto a janela
+    X_new = X.iloc[750:].set_axis(range(1500, 2250))
+    y_new = pd.Series(2 - y.iloc[750:].to_numpy(), index=X_new.index)
+    model.update(X_new, y_new, drop_oldest=True)
+
+    assert len(model.model) == 5
+    assert model.window_[0].index.equals(X_new.index)
+    # Todos os boosters, inclusive o do primeiro fold, aprenderam só o regime novo
+    for booster in model.model:
+        new_accuracy = (booster.predict(X_new.to_numpy()).argmax(axis=1) == y_new).mean()
+        old_accuracy = (booster.predict(X_old.to_numpy()).argmax(axis=1) == y_old).mean()
+        assert new_accuracy > 0.6 > old_accuracy
+
+
+def test_time_decay_weights():
+    index = pd.date_range('2024-01-01', periods=5, freq='D')
+
+    np.testing.assert_allclose(time_decay_weights(index, 2), [0.25, 2 ** -1.5, 0.5, 2 ** -0.5, 1.0])
+    np.testing.assert_allclose(time_decay_weights(index, '2D'), time_decay_weights(index, 2))
+
+
+def test_update_save_and_load(sample_data, monkeypatch, tmp_path):
+    import ml_strategy.model as model_module
+    monkeypatch.setattr(model_module, 'PARAM_GRID', SMALL_GRID)
+    X, y = sample_data
+    X_old, y_old = X.iloc[:1200], y.iloc[:1200]
+    X_new, y_new = X.iloc[1200:], y.iloc[1200:]
+
+    model = MLModel(half_life=500)
+    model.train(X_old, y_old)
+    n_trees = [booster.num_trees() for booster in model.model]
+
+    model.update(X_new, y_new, num_boost_round=10)
+
+    assert len(model.model) == 5
+    assert model.n_updates_ == 1
+    assert model.window_[0].index.equals(X.index)
+    # Árvores de paciência descartadas antes de continuar o boosting
+    assert all(booster.num_trees() <= trees + 30 for booster, trees in zip(model.model, n_trees))
+    assert (model.predict(X_new) == y_new - 1).mean() > 0.5
+
+    model.save(str(tmp_path))
+    loaded = MLModel.load(str(tmp_path))
+
+    assert loaded.best_params_ == model.best_params_
+    assert loaded.half_life == 500
+    pd.testing.assert_frame_equal(loaded.window_[0], model.window_[0])
+    pd.testing.assert_series_equal(loaded.predict(X), model.predict(X))
+
+    with pytest.raises(ValueError):
+        model.update(X_new.iloc[:, ::-1], y_new)
@@ -83,4 +83,40 @@ def test_validation_report(sample_data, tmp_path):
     with open(report_path) as f:
         content = f.read()
         assert "<h1>" in content
-        assert "Estatísticas Gerais" in content
\ No newline at end of file
+        assert "Estatísticas Gerais" in content
+
+class MeanModel:
+    def fit(self, X, y):
+        self.mean_ = float(np.mean(y))
+        
+    def predict(self, X):
+        return np.full(len(X), self.mean_)
+
+def test_generate_purged_splits(sample_data):
+    validator = TimeSeriesValidator(n_splits=3, test_size=21, purge=5, embargo=3)
+    splits = validator.generate_purged_splits(sample_data, expanding=False)
+    
+    assert len(splits) == 3
+    for split in splits:
+        test_start, test_end = split['test']['start'], split['test']['end']
+        positions = np.concatenate([np.arange(s['start'], s['end']) for s in split['train']])
+        assert not ((positions >= test_start - 5) & (positions < test_end + 3)).any()
+        assert split['purged'] == 5
+    # O último split termina no fim dos dados: nada a embargar
+    assert splits[0]['embargoed'] == 0
+    assert splits[1]['embargoed'] == 3
+
+def test_validate_model_parallel_matches_sequential(sample_data):
+    validator = TimeSeriesValidator(n_splits=3, test_size=21, purge=5)
+    kwargs = dict(model=MeanModel(), data=sample_data,
+                  feature_columns=['Feature1', 'Feature2'], target_column='Target')
+    
+    sequential = validator.validate_model_parallel(n_jobs=1, **kwargs)
+    parallel = validator.validate_model_parallel(n_jobs=2, **kwargs)
+    
+    assert len(parallel) == 3
+    for column in ['rmse', 'sharpe_ratio', 'train_size', 'purged']:
+        np.testing.assert_allclose(parallel[column], sequential[column])
+    assert (parallel['train_size'] == [226, 205, 184]).all()
+    assert (parallel['fit_time'] >= 0).all()
+    assert validator.elapsed > 0
@@ -0,0 +1,234 @@
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+import numpy as np
+import pandas as pd
+from backtest import BacktestCache
+from src.optimization.parameter_optimization import StrategyOptimizer, WalkForwardOptimizer
+from src.optimization.search import RandomSearch, SuccessiveHalving
+from src.optimization.results_store import ResultsStore
+
+
+class LedgerEngine:
+    """Motor de backtest mínimo: posição do sinal aplicada ao retorno da barra seguinte"""
+
+    def __init__(self, initial_capital=100000.0):
+        self.initial_capital = initial_capital
+
+    def run_backtest(self, data, signals):
+        positions = pd.Series(np.asarray(signals, dtype=float), index=data.index).shift().fillna(0)
+        returns = positions * data['Close'].pct_change().fillna(0)
+        self.results = pd.DataFrame({'capital': self.initial_capital * (1 + returns).cumprod()})
+        return self.results
+
+    def get_statistics(self):
+        capital = self.results['capital']
+        returns = capital.pct_change().dropna()
+        return {
+            'return': capital.iloc[-1] / self.initial_capital - 1,
+            'max_drawdown': float((capital / capital.cummax() - 1).min()),
+            'win_rate': float((returns > 0).mean())
+        }
+
+
+class VolumeBreakout:
+    """Compra quando o volume (inteiro) supera a média móvel e o preço sobe"""
+
+    def __init__(self, window=10, threshold=1.0):
+        self.window = window
+        self.threshold = threshold
+
+    def generate_signals(self, data):
+        volume = data['Volume']
+        if volume.dtype.kind != 'i':
+            raise TypeError('Volume deve chegar como inteiro')
+        momentum = data['Close'].diff(self.window)
+        active = volume > volume.rolling(self.window).mean() * self.threshold
+        return np.where(active, np.sign(momentum), 0.0)
+
+
+# Janelas que falham na avaliação (lido pelos workers criados por fork)
+FAILING_WINDOWS = set()
+
+
+class FlakyBreakout(VolumeBreakout):
+    def generate_signals(self, data):
+        if self.window in FAILING_WINDOWS:
+            raise RuntimeError('falha simulada')
+        return super().generate_signals(data)
+
+
+class CrashingBreakout(VolumeBreakout):
+    """Derruba o worker no meio do lote (simula uma execução interrompida)"""
+
+    def generate_signals(self, data):
+        if self.threshold == 1.5:
+            time.sleep(0.5)  # dá tempo de as avaliações anteriores saírem pela fila
+            os._exit(1)
+        return super().generate_signals(data)
+
+
+@pytest.fixture
+def market_data():
+    rng = np.random.default_rng(5)
+    dates = pd.date_range(start='2024-01-02 09:00', periods=400, freq='15min')
+    close = 5000 + rng.normal(0, 3, 400).cumsum()
+    return pd.DataFrame({
+        'Open': close, 'High': close + 2, 'Low': close - 2, 'Close': close,
+        'Volume': rng.integers(1, 200, 400)
+    }, index=dates)
+
+
+GRID = {'window': [5, 10, 20], 'threshold': [0.8, 1.0, 1.5]}
+
+
+def test_parallel_matches_serial(market_data):
+    optimizer = StrategyOptimizer(engine_factory=LedgerEngine)
+    serial = {
+        (params['window'], params['threshold']): optimizer.evaluate_parameters(
+            market_data, VolumeBreakout, params)
+        for params in ({'window': w, 'threshold': t} for w in GRID['window'] for t in GRID['threshold'])
+    }
+
+    results = optimizer.optimize(market_data, VolumeBreakout, GRID, n_jobs=2, chunk_size=2)
+
+    assert len(results) == len(serial)
+    for _, row in results.iterrows():
+        expected = serial[(row['parameters']['window'], row['parameters']['threshold'])]
+        assert expected is not None
+        for metric in ('sharpe_ratio', 'total_return', 'max_drawdown', 'total_trades'):
+            assert row[metric] == pytest.approx(expected[metric], nan_ok=True)
+    assert results['sharpe_ratio'].is_monotonic_decreasing
+
+
+def test_optimize_with_searchers(market_data):
+    optimizer = StrategyOptimizer(engine_factory=LedgerEngine)
+    space = {'window': [5, 10, 15, 20, 30], 'threshold': [0.8, 1.0, 1.2, 1.5]}
+
+    random = optimizer.optimize(market_data, VolumeBreakout, space, n_jobs=2,
+                                searcher=RandomSearch(max_evals=6, random_state=0))
+    assert len(random) == 6
+    assert random['sharpe_ratio'].is_monotonic_decreasing
+
+    halving = optimizer.optimize(market_data, VolumeBreakout, space, n_jobs=2,
+                                 searcher=SuccessiveHalving(n_candidates=9, eta=3, min_bars=50,
+                                                            random_state=0))
+    # Fatias crescentes; a avaliação final usa todas as barras e vem primeiro
+    assert sorted(halving['n_bars'].unique()) == [50, 133, len(market_data)]
+    assert halving.iloc[0]['n_bars'] == len(market_data)
+    assert (halving.groupby('rung').size() == [9, 3, 1]).all()
+
+    # A fatia parcial avalia as barras iniciais: igual a avaliar o prefixo diretamente
+    partial = halving[halving['rung'] == 0].iloc[0]
+    direct = optimizer.evaluate_parameters(market_data.iloc[:50], VolumeBreakout, partial['parameters'])
+    assert partial['total_return'] == pytest.approx(direct['total_return'])
+
+
+def test_resume_retries_failures(market_data, tmp_path):
+    with ResultsStore(str(tmp_path / 'results.db')) as store:
+        optimizer = StrategyOptimizer(engine_factory=LedgerEngine, store=store)
+        FAILING_WINDOWS.add(10)
+        try:
+            first = optimizer.optimize(market_data, FlakyBreakout, GRID, n_jobs=2)
+        finally:
+            FAILING_WINDOWS.clear()
+        run_id = optimizer.run_id
+
+        stored = store.results(run_id)
+        assert len(first) == 6
+        assert (stored['status'] == 'failed').sum() == 3
+        completed_at = stored.set_index(['window', 'threshold'])['completed_at']
+
+        # Retomada: apenas as falhas voltam ao pool
+        second = optimizer.optimize(market_data, FlakyBreakout, GRID, n_jobs=2)
+        assert optimizer.run_id == run_id
+        assert len(second) == 9
+
+        stored = store.results(run_id).set_index(['window', 'threshold'])
+        assert (stored['status'] == 'completed').all()
+        reevaluated = stored['completed_at'] != completed_at.reindex(stored.index)
+        assert set(stored.index[reevaluated].get_level_values('window')) == {10}
+
+
+def test_records_each_evaluation_before_chunk_finishes(market_data, tmp_path):
+    with ResultsStore(str(tmp_path / 'results.db')) as store:
+        optimizer = StrategyOptimizer(engine_factory=LedgerEngine, store=store)
+        # Um único lote com as 9 combinações; o worker morre nas três últimas
+        with pytest.raises(BrokenProcessPool):
+            optimizer.optimize(market_data, CrashingBreakout, GRID, n_jobs=1, chunk_size=9)
+
+        stored = store.results(optimizer.run_id)
+        assert len(stored) == 6
+        assert set(stored['threshold']) == {0.8, 1.0}
+        assert (stored['status'] == 'completed').all()
+
+
+def test_walk_forward_schedules_windows(market_data):
+    updates = []
+    walk_forward = WalkForwardOptimizer(train_size=150, test_size=50, engine_factory=LedgerEngine)
+    results = walk_forward.optimize(market_data, VolumeBreakout, GRID, n_jobs=2, chunk_size=4,
+                                    on_window=lambda result, summary: updates.append(summary))
+
+    assert len(results) == 5
+    assert [w['train']['start'] for w in results['window']] == [0, 50, 100, 150, 200]
+
+    direct = StrategyOptimizer(engine_factory=LedgerEngine)
+    test_returns = []
+    for _, row in results.iterrows():
+        train = row['train_results']
+        assert len(train) == 9 and row['n_pruned'] == 0
+        assert row['best_parameters'] == train.iloc[0]['parameters']
+
+        # Avaliação fora da amostra na fatia de teste da janela
+        bounds = row['window']['test']
+        expected = direct.evaluate_parameters(market_data.iloc[bounds['start']:bounds['end']],
+                                              VolumeBreakout, row['best_parameters'])
+        assert row['test_results']['total_return'] == pytest.approx(expected['total_return'])
+        test_returns.append(expected)
+
+    # Resumo fora da amostra atualizado a cada janela concluída
+    assert [summary['windows'] for summary in updates] == [1, 2, 3, 4, 5]
+    summary = walk_forward.oos_summary
+    assert summary['mean_sharpe_ratio'] == pytest.approx(
+        np.mean([r['sharpe_ratio'] for r in test_returns]))
+    assert summary['compounded_return'] == pytest.approx(
+        np.prod([1 + r['total_return'] for r in test_returns]) - 1)
+
+
+def test_walk_forward_pruning(market_data, tmp_path):
+    cache = BacktestCache(str(tmp_path / 'cache'))
+    walk_forward = WalkForwardOptimizer(train_size=150, test_size=50, cache=cache,
+                                        engine_factory=LedgerEngine)
+    results = walk_forward.optimize(market_data, VolumeBreakout, GRID, n_jobs=2,
+                                    min_trades=50, prune_fraction=0.5)
+
+    direct = StrategyOptimizer(cache=cache, engine_factory=LedgerEngine)
+    total_pruned = 0
+    for _, row in results.iterrows():
+        bounds = row['window']['train']
+        prefix = market_data.iloc[bounds['start']:bounds['start'] + 75]
+        train = row['train_results']
+        for params in ({'window': w, 'threshold': t} for w in GRID['window'] for t in GRID['threshold']):
+            partial = direct.evaluate_parameters(prefix, VolumeBreakout, params)
+            kept = any(p == params for p in train['parameters'])
+            assert kept == (partial['total_trades'] >= 25)
+        total_pruned += row['n_pruned']
+        assert row['n_pruned'] == 9 - len(train)
+        if row['best_parameters'] is not None:
+            assert not train.iloc[0]['pruned']
+
+    assert total_pruned > 0
+    # Os prefixos foram gravados no cache com o fingerprint da fatia: todas as leituras acertam
+    assert cache.hits == 9 * len(results) and cache.misses == 0
+
+
+def test_walk_forward_runs_share_strategy_name(market_data, tmp_path):
+    with ResultsStore(str(tmp_path / 'results.db')) as store:
+        walk_forward = WalkForwardOptimizer(train_size=150, test_size=50, store=store,
+                                            engine_factory=LedgerEngine)
+        walk_forward.optimize(market_data, VolumeBreakout, GRID, n_jobs=1)
+
+        runs = store.runs()
+        assert len(runs) == 5  # uma execução por janela
+        assert set(runs['strategy']) == {f"{VolumeBreakout.__module__}.VolumeBreakout"}
@@ -0,0 +1,45 @@
+import pytest
+from scipy.stats import uniform
+from src.optimization.results_store import ResultsStore, make_run_id
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(str(tmp_path / 'results.db')) as store:
+        yield store
+
+
+def test_record_and_resume(store):
+    store.start_run('run', 'SMACross', 'sharpe_ratio', {'grid': {'fast': [3, 5]}})
+    params = [{'fast': 3}, {'fast': 5}]
+    store.record('run', params, [{'parameters': params[0], 'sharpe_ratio': 1.5, 'elapsed': 0.1},
+                                 None])
+
+    done = store.completed('run')
+    assert len(done) == 1
+    assert done['{"fast": 3}']['sharpe_ratio'] == 1.5
+    assert '{"fast": 5}' not in done  # falha registrada é reexecutada ao retomar
+    assert store.completed('run', include_failed=True)['{"fast": 5}'] is None
+    assert store.completed('run', 'n_bars=100') == {}
+
+
+def test_persists_across_connections(tmp_path):
+    path = str(tmp_path / 'results.db')
+    with ResultsStore(path) as store:
+        store.start_run('run', 'SMACross', 'sharpe_ratio')
+        store.record('run', [{'fast': 3}], [{'parameters': {'fast': 3}, 'sharpe_ratio': 0.5}])
+
+    with ResultsStore(path) as store:
+        runs = store.runs()
+        results = store.results('run')
+
+    assert runs.loc[0, 'n_evaluations'] == 1
+    assert results.loc[0, 'fast'] == 3
+    assert results.loc[0, 'status'] == 'completed'
+
+
+def test_run_id_is_deterministic():
+    config = {'grid': {'fast': [3, 5], 'slow': uniform(20, 40)}, 'metric': 'sharpe_ratio'}
+
+    assert make_run_id(config) == make_run_id(dict(config))
+    assert make_run_id(config) != make_run_id(dict(config, metric='sortino_ratio'))
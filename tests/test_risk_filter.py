@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+import pandas as pd
+from ml_strategy.risk_manager import RiskManager
+from strategies.ml_strategy import MLTradingStrategy
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(3)
+    index = pd.date_range('2024-03-04 07:00', periods=3000, freq='5min')
+    close = 5000 + np.cumsum(rng.normal(0, 2, len(index)))
+    return pd.DataFrame({'Close': close, 'Volume': rng.integers(1, 500, len(index)).astype(float)},
+                        index=index)
+
+
+def test_validate_trades_matches_sequential_rules(bars):
+    rng = np.random.default_rng(4)
+    manager = RiskManager(bars)
+    signals = pd.Series(rng.choice([-1, 0, 1], len(bars)), index=bars.index)
+    volatility = pd.Series(rng.uniform(0, 2.5 * manager.volatility_limit, len(bars)), index=bars.index)
+
+    result = manager.validate_trades(signals, volatility)
+
+    # validate_trade barra a barra (nova instância) dá as mesmas respostas
+    sequential = RiskManager(bars)
+    for timestamp, signal in signals.items():
+        valid, reason = False, "Sem sinal"
+        if signal != 0:
+            valid, reason = sequential.validate_trade(signal, 0.0, volatility[timestamp], timestamp)
+        assert result.at[timestamp, 'valid'] == valid
+        assert result.at[timestamp, 'reason'] == reason
+
+    assert result['valid'].groupby(result.index.date).sum().max() == manager.max_trades_per_day
+
+
+def test_option_parameters_match_scalar_version(bars):
+    manager = RiskManager(bars)
+    signals = pd.Series([1, -1, 0, 1], index=bars.index[:4])
+
+    params = manager.option_parameters(signals, bars['Close'])
+
+    assert list(params.index) == [bars.index[0], bars.index[1], bars.index[3]]
+    for timestamp, row in params.iterrows():
+        expected = manager.calculate_option_parameters(signals[timestamp], bars.at[timestamp, 'Close'])
+        assert row['option_type'] == expected['option_type']
+        for key in ('strike_price', 'stop_loss', 'take_profit', 'position_size'):
+            assert row[key] == pytest.approx(expected[key])
+
+
+class _WideStrikeManager(RiskManager):
+    def _calculate_call_strike(self, current_price):
+        return np.ceil(current_price / 10) * 10
+
+
+def test_option_parameters_reuse_scalar_helpers(bars):
+    # Um auxiliar sobrescrito vale para os dois caminhos
+    manager = _WideStrikeManager(bars)
+    signals = pd.Series(1, index=bars.index[:5])
+    params = manager.option_parameters(signals, bars['Close'])
+
+    expected = np.ceil(bars['Close'].iloc[:5].to_numpy() / 10) * 10
+    np.testing.assert_array_equal(params['strike_price'], expected)
+    assert isinstance(manager.calculate_option_parameters(1, 5000.0)['position_size'], int)
+
+
+class _ConstantModel:
+    """Modelo treinado de teste que compra em todas as barras"""
+    def predict(self, X):
+        return pd.Series(1, index=X.index)
+
+
+def test_generate_signals_uses_bar_time_and_daily_cap(bars):
+    strategy = MLTradingStrategy(bars)
+    strategy.model = _ConstantModel()
+    strategy.trained = True
+
+    signals = strategy.generate_signals()
+
+    traded = signals[signals != 0]
+    assert len(traded) > 0
+    assert traded.index.hour.min() >= 9 and traded.index.hour.max() <= 17
+    assert traded.groupby(traded.index.date).size().max() <= strategy.risk_manager.max_trades_per_day
+    assert list(strategy.trade_params.index) == list(traded.index)
+    assert (strategy.trade_params['option_type'] == 'CALL').all()
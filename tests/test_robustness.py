@@ -0,0 +1,54 @@
+import pytest
+import pandas as pd
+import numpy as np
+from backtest import MatrixBacktester, TradeLog
+from analysis.robustness import RobustnessAnalyzer
+
+
+@pytest.fixture
+def backtest_inputs():
+    rng = np.random.default_rng(3)
+    dates = pd.date_range(start='2024-01-02 09:00', periods=600, freq='15min')
+    close = pd.Series(5000 + rng.normal(0, 2, 600).cumsum(), index=dates)
+    positions = np.repeat(rng.integers(-1, 2, 60), 10).astype(float)
+    returns = MatrixBacktester(close).run(positions)['strategy_returns'][0]
+    trades = TradeLog.from_positions(positions, close.values, index=close.index)
+    return {'returns': returns, 'trades': trades, 'positions': positions, 'close': close}
+
+
+def test_confidence_intervals(backtest_inputs):
+    analyzer = RobustnessAnalyzer(**backtest_inputs, n_jobs=1, seed=11, batch_size=64)
+    ci = analyzer.run(n_resamples=300, max_delay=2)
+
+    assert set(ci.index.get_level_values('method')) == {
+        'trade_shuffle', 'block_bootstrap', 'entry_delay'
+    }
+    assert (ci['n_resamples'] == 300).all()
+    assert (ci['lower'] <= ci['upper']).all()
+
+    # Embaralhar a ordem dos trades não altera o retorno total
+    shuffle = ci.loc[('trade_shuffle', 'total_return')]
+    assert shuffle['lower'] == pytest.approx(shuffle['observed'])
+    assert shuffle['upper'] == pytest.approx(shuffle['observed'])
+
+
+def test_zero_delay_reproduces_backtest(backtest_inputs):
+    analyzer = RobustnessAnalyzer(positions=backtest_inputs['positions'],
+                                  close=backtest_inputs['close'], n_jobs=1, seed=0)
+    analyzer.run(n_resamples=10, max_delay=0)
+
+    samples = analyzer.samples['entry_delay']['sharpe_ratio']
+    np.testing.assert_allclose(samples, analyzer.observed['entry_delay']['sharpe_ratio'])
+
+
+def test_parallel_matches_serial(backtest_inputs):
+    serial = RobustnessAnalyzer(**backtest_inputs, n_jobs=1, seed=5, batch_size=50)
+    parallel = RobustnessAnalyzer(**backtest_inputs, n_jobs=2, seed=5, batch_size=50)
+
+    pd.testing.assert_frame_equal(serial.run(n_resamples=200), parallel.run(n_resamples=200))
+
+
+def test_missing_inputs():
+    analyzer = RobustnessAnalyzer(returns=np.random.randn(100) * 0.01, n_jobs=1)
+    with pytest.raises(ValueError):
+        analyzer.run(n_resamples=10, methods=['entry_delay'])
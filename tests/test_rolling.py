@@ -0,0 +1,96 @@
+import pytest
+import numpy as np
+import pandas as pd
+from ml_strategy import rolling
+from ml_strategy.rolling import moving_average, rolling_mean, rolling_mean_std, rolling_std, pct_change_windows
+
+WINDOWS = [1, 5, 15, 60]
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    values = 5000 + np.cumsum(rng.normal(0, 2, 5000))
+    values[100:103] = np.nan
+    values[3000:3200] = values[2999]
+    return values
+
+
+def test_mean_and_change_match_pandas(prices):
+    series = pd.Series(prices)
+    means = rolling_mean(prices, WINDOWS)
+    changes = pct_change_windows(prices, WINDOWS)
+
+    for j, window in enumerate(WINDOWS):
+        np.testing.assert_allclose(means[:, j], series.rolling(window).mean(), rtol=1e-12)
+        np.testing.assert_allclose(changes[:, j], series.pct_change(window), rtol=1e-12)
+
+
+def test_moving_average_single_window(prices):
+    # Série sem NaN (caminho direto) e com NaN (caminho geral), com bloco final incompleto
+    clean = prices[200:]
+    for values in (clean, prices):
+        for window in (1, 20, 256, 300):
+            np.testing.assert_allclose(moving_average(values, window),
+                                       pd.Series(values).rolling(window).mean(), rtol=1e-12)
+
+    buffer = np.empty(len(clean), dtype=np.float32)
+    assert moving_average(clean, 20, out=buffer) is buffer
+    np.testing.assert_allclose(buffer, rolling_mean(clean, [20])[:, 0], rtol=1e-6)
+
+
+def test_std_matches_exact_windows(prices):
+    # Referência direta por janela: o rolling().std() do pandas acumula erro
+    # em trechos de preço constante após um nível alto
+    stds = rolling_std(prices, WINDOWS)
+
+    for j, window in enumerate(WINDOWS):
+        expected = np.full(len(prices), np.nan)
+        if window > 1:
+            windows = np.lib.stride_tricks.sliding_window_view(prices, window)
+            expected[window - 1:] = windows.std(axis=1, ddof=1)
+        np.testing.assert_allclose(stds[:, j], expected, rtol=1e-7, atol=1e-9)
+
+
+def test_chunked_finish_matches_single_pass(prices, monkeypatch):
+    # Trechos de 2 blocos: janelas cruzam as fronteiras dos trechos, inclusive
+    # no NaN e no trecho constante
+    means, stds = rolling_mean_std(prices, WINDOWS)
+    monkeypatch.setattr(rolling, 'CHUNK_BARS', 2 * rolling.MIN_BLOCK)
+    chunked_means, chunked_stds = rolling_mean_std(prices, WINDOWS)
+
+    np.testing.assert_allclose(chunked_means, means, rtol=1e-12)
+    np.testing.assert_allclose(chunked_stds, stds, rtol=1e-9, atol=1e-12)
+    for j, window in enumerate(WINDOWS):
+        np.testing.assert_allclose(chunked_means[:, j], pd.Series(prices).rolling(window).mean(),
+                                   rtol=1e-12)
+
+
+def test_outputs_written_in_place(prices):
+    block = np.empty((2 * len(WINDOWS), len(prices))).T
+    assert np.shares_memory(rolling_mean(prices, WINDOWS, out=block[:, ::2]), block)
+    rolling_std(prices, WINDOWS, out=block[:, 1::2])
+
+    np.testing.assert_array_equal(block[:, ::2], rolling_mean(prices, WINDOWS))
+    np.testing.assert_array_equal(block[:, 1::2], rolling_std(prices, WINDOWS))
+
+
+def test_stable_variance_on_high_level_series():
+    rng = np.random.default_rng(1)
+    values = 1e9 + rng.normal(0, 1, 200_000)
+    stds = rolling_std(values, [10])
+
+    expected = pd.Series(values - 1e9).rolling(10).std()
+    np.testing.assert_allclose(stds[:, 0], expected, rtol=1e-6)
+
+
+def test_window_longer_than_series():
+    values = np.arange(5, dtype=float)
+    assert np.isnan(rolling_mean(values, [10])).all()
+    assert np.isnan(rolling_std(values, [10])).all()
+    assert np.isnan(moving_average(values, 10)).all()
+
+
+def test_invalid_windows():
+    with pytest.raises(ValueError):
+        rolling_mean(np.arange(10.0), [0])
@@ -0,0 +1,86 @@
+import pytest
+from scipy.stats import uniform
+from src.optimization.search import BaseSearch, RandomSearch, SuccessiveHalving, SequentialModelSearch
+
+SPACE = {'x': list(range(-10, 11)), 'y': list(range(-10, 11)), 'mode': ['a', 'b']}
+
+
+def make_evaluator(calls):
+    """Objetivo sintético: máximo em x=3, y=-2, mode='b'; mais barras reduzem o ruído"""
+    def evaluate(parameters, n_bars=None):
+        calls.append((len(parameters), n_bars))
+        results = []
+        for params in parameters:
+            score = -(params['x'] - 3) ** 2 - (params['y'] + 2) ** 2 + (params['mode'] == 'b')
+            results.append({'parameters': params, 'sharpe_ratio': float(score)})
+        return results
+    return evaluate
+
+
+def test_random_search_respects_eval_budget():
+    calls = []
+    searcher = RandomSearch(max_evals=50, batch_size=8, random_state=0)
+    results = searcher.search(make_evaluator(calls), SPACE, 1000, 2, 'sharpe_ratio')
+
+    keys = {tuple(sorted(r['parameters'].items())) for r in results}
+    assert len(results) == 50
+    assert len(keys) == 50
+    assert max(size for size, _ in calls) <= 8
+
+
+def test_random_search_stops_when_space_exhausted():
+    searcher = RandomSearch(max_evals=None, random_state=0)
+    space = {'x': [1, 2, 3], 'y': [0], 'mode': ['a']}
+    results = searcher.search(make_evaluator([]), space, 1000, 1, 'sharpe_ratio')
+
+    assert sorted(r['parameters']['x'] for r in results) == [1, 2, 3]
+
+
+def test_continuous_space_requires_budget():
+    searcher = RandomSearch(max_evals=None)
+    with pytest.raises(ValueError):
+        searcher.search(make_evaluator([]), {'x': uniform(0, 1)}, 1000, 1, 'sharpe_ratio')
+
+
+def test_successive_halving_grows_slices():
+    calls = []
+    searcher = SuccessiveHalving(n_candidates=27, eta=3, min_bars=10, random_state=0)
+    results = searcher.search(make_evaluator(calls), SPACE, 900, 1, 'sharpe_ratio')
+
+    rung_sizes = [sum(r['rung'] == rung for r in results) for rung in range(4)]
+    assert rung_sizes == [27, 9, 3, 1]
+    assert sorted({n_bars for _, n_bars in calls}) == [33, 100, 300, 900]
+
+    # O sobrevivente final é o melhor candidato da primeira rodada
+    first = [r for r in results if r['rung'] == 0]
+    final = [r for r in results if r['rung'] == 3][0]
+    assert final['sharpe_ratio'] == max(r['sharpe_ratio'] for r in first)
+
+
+def test_sequential_model_search_finds_optimum():
+    searcher = SequentialModelSearch(max_evals=80, n_initial=20, random_state=0)
+    results = searcher.search(make_evaluator([]), SPACE, 1000, 4, 'sharpe_ratio')
+
+    best = max(results, key=lambda r: r['sharpe_ratio'])
+    random_best = max(RandomSearch(max_evals=80, random_state=0).search(
+        make_evaluator([]), SPACE, 1000, 4, 'sharpe_ratio'), key=lambda r: r['sharpe_ratio'])
+    assert len(results) == 80
+    assert best['sharpe_ratio'] >= random_best['sharpe_ratio']
+
+
+def test_time_budget_stops_search():
+    import time
+
+    def slow(parameters, n_bars=None):
+        time.sleep(0.05)
+        return [{'parameters': p, 'sharpe_ratio': 0.0} for p in parameters]
+
+    searcher = RandomSearch(max_evals=None, time_budget=0.2, batch_size=1, random_state=0)
+    results = searcher.search(slow, SPACE, 1000, 1, 'sharpe_ratio')
+
+    assert 1 <= len(results) <= 6
+
+
+def test_base_search_is_abstract():
+    with pytest.raises(TypeError):
+        BaseSearch()
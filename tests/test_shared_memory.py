@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.utils.shared_memory import SharedArrays, SharedMarketData, shared_pool, worker_state
+
+
+@pytest.fixture
+def market_data():
+    rng = np.random.default_rng(2)
+    dates = pd.date_range(start='2024-01-02 09:00', periods=200, freq='min', tz='America/Sao_Paulo')
+    close = 5000 + rng.normal(0, 2, 200).cumsum()
+    return pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+        'Volume': rng.integers(1, 100, 200), 'Rollover': np.arange(200) % 50 == 0
+    }, index=dates)
+
+
+def test_round_trip_preserves_values_and_dtypes(market_data):
+    with SharedMarketData(market_data) as shared:
+        attached, handles = SharedMarketData.attach(shared.descriptor)
+
+        pd.testing.assert_frame_equal(attached, market_data, check_freq=False)
+        assert attached['Volume'].dtype == np.int64
+        assert attached['Rollover'].dtype == bool
+        with pytest.raises(ValueError):
+            attached['Close'].to_numpy()[0] = 0.0  # somente leitura
+
+        del attached
+        for shm in handles:
+            shm.close()
+
+
+def test_column_selection_and_numeric_index(market_data):
+    data = market_data.reset_index(drop=True)
+    with SharedMarketData(data, ['Close', 'Volume']) as shared:
+        attached, handles = SharedMarketData.attach(shared.descriptor)
+        pd.testing.assert_frame_equal(attached, data[['Close', 'Volume']])
+        del attached
+        for shm in handles:
+            shm.close()
+
+
+def test_rejects_non_numeric_columns(market_data):
+    data = market_data.assign(Symbol='WDOF24')
+    with pytest.raises(ValueError, match='Symbol'):
+        SharedMarketData(data)
+
+    # Selecionando apenas colunas numéricas a publicação funciona
+    with SharedMarketData(data, ['Close']) as shared:
+        assert shared.descriptor['columns'] == ['Close']
+
+
+def test_shared_arrays():
+    arrays = {'returns': np.linspace(-1, 1, 10), 'positions': np.arange(10, dtype=np.int8)}
+    with SharedArrays(arrays) as shared:
+        attached, handles = SharedArrays.attach(shared.descriptor, readonly=False)
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(attached[name], array)
+            assert attached[name].dtype == array.dtype
+        del attached
+        for shm in handles:
+            shm.close()
+
+    with pytest.raises(ValueError):
+        SharedArrays({'labels': np.array(['a', 'b'], dtype=object)})
+
+
+def _weighted_sum(column):
+    state = worker_state()
+    return float(state['matrix'][:, column].sum() * state['scale'])
+
+
+def test_shared_pool():
+    matrix = np.arange(12, dtype=float).reshape(4, 3)
+    with shared_pool({'matrix': matrix}, 2, extra={'scale': 2.0}) as executor:
+        sums = list(executor.map(_weighted_sum, range(3)))
+    assert sums == (matrix.sum(axis=0) * 2).tolist()
+
+
+def _close_sum(_):
+    state = worker_state()
+    return float(state['data']['Close'].sum() * state['scale'])
+
+
+def test_shared_pool_publishes_market_data(market_data):
+    with shared_pool({}, 2, extra={'scale': 2.0}, data=market_data, columns=['Close', 'Volume']) as executor:
+        sums = list(executor.map(_close_sum, range(2)))
+    assert sums == pytest.approx([market_data['Close'].sum() * 2] * 2)
@@ -0,0 +1,133 @@
+import pytest
+import pandas as pd
+import numpy as np
+from strategies import MeanReversionEnhanced
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(3)
+    dates = pd.date_range(start='2024-01-02 09:00', periods=1500, freq='min')
+    close = 5000 + rng.normal(0, 3, 1500).cumsum()
+    return pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1,
+        'Close': close, 'Volume': rng.integers(1, 100, 1500)
+    }, index=dates)
+
+
+def _reference_sharpe(data, sma_window, rsi_window, bb_std, oversold=30, overbought=70):
+    """Pipeline pandas original, um conjunto de parâmetros por vez"""
+    close = data['Close']
+    sma = close.rolling(sma_window).mean()
+    std = close.rolling(sma_window).std()
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(rsi_window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(rsi_window).mean()
+    rsi = 100 - 100 / (1 + gain / loss.replace(0, 1e-9))
+    trend = close > sma
+    vol_increasing = std > std.rolling(20).mean()
+
+    signals = pd.Series(0, index=data.index)
+    signals[(close < sma - bb_std * std) & (rsi < oversold) & ~trend & vol_increasing] = 1
+    signals[(close > sma + bb_std * std) & (rsi > overbought) & trend & vol_increasing] = -1
+    strategy_returns = signals.shift(1) * close.pct_change()
+    if strategy_returns.std() == 0:
+        return float('-inf')
+    return np.sqrt(252) * strategy_returns.mean() / strategy_returns.std()
+
+
+def test_grid_matches_single_evaluations(sample_data):
+    strategy = MeanReversionEnhanced(sample_data)
+    bb_stds = np.array([1.0, 1.5, 2.0, 2.5])
+    oversold = np.array([30, 35, 40, 45])
+
+    sharpes = strategy.evaluate_threshold_grid(sample_data, 10, 7, bb_std=bb_stds,
+                                               rsi_oversold=oversold)
+
+    expected = [_reference_sharpe(sample_data, 10, 7, b, o) for b, o in zip(bb_stds, oversold)]
+    np.testing.assert_allclose(sharpes, expected, rtol=1e-10)
+
+
+def test_grid_broadcasts_scalars(sample_data):
+    strategy = MeanReversionEnhanced(sample_data)
+
+    sharpes = strategy.evaluate_threshold_grid(sample_data, 15, 14, bb_std=[1.5, 2.0, 2.5])
+    single = strategy._evaluate_parameters(sample_data, {'sma_window': 15, 'bb_std': 2.0,
+                                                         'rsi_window': 14})
+
+    assert sharpes.shape == (3,)
+    assert sharpes[1] == pytest.approx(single)
+
+
+def test_grid_without_trades_is_minus_inf(sample_data):
+    strategy = MeanReversionEnhanced(sample_data)
+
+    sharpes = strategy.evaluate_threshold_grid(sample_data, 10, 7, bb_std=1.5,
+                                               rsi_oversold=-1, rsi_overbought=101)
+
+    assert np.isneginf(sharpes).all()
+
+
+@pytest.fixture
+def wdo_frame():
+    rng = np.random.default_rng(8)
+    index = pd.date_range('2024-01-02 08:00', periods=2000, freq='5min')
+    close = 5000 + rng.normal(0, 2, len(index)).cumsum()
+    frame = pd.DataFrame({
+        'close': close,
+        'trend_strength': rng.normal(0, 2, len(index)),
+        'atr': rng.uniform(0.5, 2, len(index)),
+        'volume_ratio': rng.uniform(0.5, 3, len(index)),
+        'rsi': rng.uniform(20, 80, len(index)),
+        'rsi_divergence': rng.choice([-1, 0, 0, 0, 1], len(index)),
+        'vol_profile_delta': rng.normal(0, 2, len(index)),
+        'hour': index.hour
+    }, index=index)
+    # Indicadores ainda sem histórico no início, como após prepare_all_data
+    frame.iloc[:20, frame.columns.get_indexer(['trend_strength', 'atr', 'rsi'])] = np.nan
+    frame.iloc[:30, frame.columns.get_loc('volume_ratio')] = np.nan
+    return frame
+
+
+def _reference_wdo_signals(df):
+    """Pipeline original de três regras com filtro de horário"""
+    trend_signal = np.where(
+        (df['trend_strength'] > df['atr']) & (df['volume_ratio'] > 1.2) &
+        (df['rsi'] > 40) & (df['rsi'] < 60),
+        np.sign(df['trend_strength']), 0)
+    reversal_signal = np.where((df['rsi_divergence'] != 0) & (df['volume_ratio'] > 1.5),
+                               df['rsi_divergence'], 0)
+    breakout_signal = np.where((abs(df['vol_profile_delta']) > df['atr']) & (df['volume_ratio'] > 2),
+                               np.sign(df['vol_profile_delta']), 0)
+    signals = pd.Series(trend_signal + reversal_signal + breakout_signal, index=df.index)
+    return signals.where(df['hour'].between(9, 16) & ~df['hour'].isin([12, 13]), 0)
+
+
+def test_signal_grid_first_column_matches_rule_pipeline(wdo_frame):
+    from enhanced_strategy import EnhancedWDOStrategy
+    strategy = EnhancedWDOStrategy(wdo_frame)
+    expected = _reference_wdo_signals(wdo_frame)
+
+    pd.testing.assert_series_equal(strategy.generate_signals(wdo_frame), expected,
+                                   check_dtype=False)
+    grid = strategy.generate_signal_grid(wdo_frame, trend_volume_ratio=[1.2, 1.0, 1.5],
+                                         rsi_lower=[40, 30, 45])
+    assert grid.shape == (len(wdo_frame), 3)
+    np.testing.assert_array_equal(grid.iloc[:, 0], expected)
+    assert (grid.loc[~wdo_frame['hour'].between(9, 16) | wdo_frame['hour'].isin([12, 13])] == 0).all().all()
+
+
+def test_evaluate_signal_grid_matches_column_backtests(wdo_frame):
+    from enhanced_strategy import EnhancedWDOStrategy
+    from backtest.matrix_backtester import MatrixBacktester
+    strategy = EnhancedWDOStrategy(wdo_frame)
+    thresholds = {'breakout_volume_ratio': [2.0, 1.5, 2.5], 'rsi_upper': [60, 70, 55]}
+
+    stats = strategy.evaluate_signal_grid(wdo_frame, **thresholds)
+    grid = strategy.generate_signal_grid(wdo_frame, **thresholds)
+    assert list(stats.index) == list(grid.columns)
+    for k in range(grid.shape[1]):
+        single = MatrixBacktester(wdo_frame['close']).run(
+            grid.iloc[:, k].to_numpy(), return_curves=False)['stats'].iloc[0]
+        for metric in ('total_return', 'sharpe_ratio', 'max_drawdown'):
+            assert stats.iloc[k][metric] == pytest.approx(single[metric])
@@ -0,0 +1,73 @@
+import pytest
+import pandas as pd
+import numpy as np
+from backtest import TradeLog
+from backtest.trade_log import EXIT_SIGNAL, EXIT_REVERSAL, EXIT_END_OF_DATA
+
+
+@pytest.fixture
+def bars():
+    dates = pd.date_range(start='2024-01-02 09:00', periods=10, freq='min')
+    close = np.array([100, 101, 103, 102, 104, 103, 101, 100, 102, 105], dtype=float)
+    return pd.DataFrame({
+        'Close': close,
+        'High': close + 1,
+        'Low': close - 1
+    }, index=dates)
+
+
+def test_from_positions(bars):
+    position = pd.Series([0, 1, 1, 1, 0, -2, -2, 1, 1, 1], index=bars.index, dtype=float)
+    log = TradeLog.from_positions(position, bars['Close'], bars['High'], bars['Low'])
+    records = log.records
+
+    assert len(log) == 3
+    np.testing.assert_array_equal(records['entry_idx'], [1, 5, 7])
+    np.testing.assert_array_equal(records['exit_idx'], [4, 7, 9])
+    np.testing.assert_array_equal(records['side'], [1, -1, 1])
+    np.testing.assert_array_equal(records['size'], [1, 2, 1])
+    np.testing.assert_array_equal(records['exit_reason'],
+                                  [EXIT_SIGNAL, EXIT_REVERSAL, EXIT_END_OF_DATA])
+
+    # Long 101 -> 104, short 2x 103 -> 100, long 100 -> 105
+    np.testing.assert_allclose(records['pnl'], [3, 6, 5])
+    assert records['entry_time'][0] == bars.index[1]
+
+    # Long: máxima 105 (barra 4), mínima 101 (barra 3) a partir de 101
+    assert records['mfe'][0] == pytest.approx(4)
+    assert records['mae'][0] == pytest.approx(0)
+    # Short: mínima 99 (barra 7), máxima 102 (barra 6) a partir de 103
+    assert records['mfe'][1] == pytest.approx(4)
+    assert records['mae'][1] == pytest.approx(0)
+    # Long final: máxima 106 (barra 9) a partir de 100
+    assert records['mfe'][2] == pytest.approx(6)
+
+
+def test_statistics(bars):
+    position = np.array([0, 1, 1, 0, 0, -1, -1, -1, -1, 0], dtype=float)
+    stats = TradeLog.from_positions(position, bars['Close']).statistics()
+
+    # Long 101 -> 102 (+1), short 103 -> 105 (-2)
+    assert stats['total_trades'] == 2
+    assert stats['long_trades'] == 1 and stats['short_trades'] == 1
+    assert stats['win_rate'] == pytest.approx(0.5)
+    assert stats['profit_factor'] == pytest.approx(0.5)
+    assert stats['total_pnl'] == pytest.approx(-1)
+
+
+def test_no_trades(bars):
+    log = TradeLog.from_positions(np.zeros(10), bars['Close'])
+    assert len(log) == 0
+    assert log.statistics()['total_trades'] == 0
+
+
+def test_save_and_load(bars, tmp_path):
+    position = pd.Series([0, 1, 1, -1, -1, 0, 1, 0, 0, 0], index=bars.index, dtype=float)
+    log = TradeLog.from_positions(position, bars['Close'])
+
+    path = tmp_path / 'trades.npy'
+    log.save(str(path))
+    loaded = TradeLog.load(str(path), mmap=True)
+
+    np.testing.assert_array_equal(loaded.records, log.records)
+    assert loaded.to_frame()['exit_reason'].tolist() == ['reversal', 'signal', 'signal']